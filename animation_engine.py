@@ -0,0 +1,216 @@
+# animation_engine.py
+"""
+Struct-of-arrays animation engine for many animated shapes.
+
+Positions, velocities, colour fades and step counters for every animated shape live
+in NumPy arrays, so one frame is a handful of vectorised operations. The only
+per-shape Python work left is issuing the canvas calls that are actually needed.
+
+Colour fades are precomputed: when a fade starts, its whole fill and outline
+ramps are built in one go as packed 0xRRGGBB ints, so each frame only looks up
+the next entry. A shape's ramps are replaced when its fade completes, so at most
+one pair is kept per shape.
+
+With SUPPRESS_REDUNDANT_UPDATES the engine also remembers, per shape, the colours
+it last sent and the whole-pixel offset it has moved the item by. Slow fades repeat
+the same quantised colour for several frames and sub-pixel speeds move less than
+Tk can show, so each frame compares those arrays with the new values and only
+calls Tk for the rows that changed: itemconfig with just the options that differ,
+and moves as whole-pixel steps once the rounded offset changes.
+
+Step counters are in (possibly fractional) nominal frames, so a frame that runs
+late can advance movement and fades by the time that actually passed.
+"""
+import tkinter as tk
+import numpy as np
+import config
+import colour_utils
+
+class AnimationEngine:
+    """
+    Animates a set of canvas items (rectangles, ovals, polygons) by moving them towards random
+    targets inside the INNER bounds while fading their fill and outline between random colours.
+    """
+
+    def __init__(self, shapes, current_config=None, seed=None, suppress=None):
+        """
+        shapes: dicts with 'id', 'bounds' and (R, G, B) 'fill' and 'outline' (as stored in placed_shapes_data).
+        seed: optional seed for the engine's own random targets and colours.
+        suppress: skip canvas calls that would not change what is shown (default: SUPPRESS_REDUNDANT_UPDATES).
+        """
+        current_config = current_config or {}
+        count = len(shapes)
+        self.gen = np.random.default_rng(seed)
+        self.ids = [shape['id'] for shape in shapes]
+        self.bounds = np.array([shape['bounds'] for shape in shapes], dtype=np.float64).reshape(count, 4)
+        self.velocity = np.zeros((count, 2), dtype=np.float64)
+        self.steps_remaining = np.zeros(count, dtype=np.float64)
+        self.fill_from = np.array([shape['fill'] for shape in shapes], dtype=np.float64).reshape(count, 3)
+        self.fill_to = self._random_colours(count)
+        self.outline_from = np.array([shape['outline'] for shape in shapes], dtype=np.float64).reshape(count, 3)
+        self.outline_to = self._random_colours(count)
+        self.colour_step = np.zeros(count, dtype=np.float64)
+        self.fill_ramps = np.zeros((count, config.COLOR_FADE_STEPS), dtype=np.int64)
+        self.outline_ramps = np.zeros((count, config.COLOR_FADE_STEPS), dtype=np.int64)
+        # What the canvas currently shows: the colours last sent and the whole pixels moved since the start
+        self.suppress = config.SUPPRESS_REDUNDANT_UPDATES if suppress is None else suppress
+        self.fill_sent = colour_utils.rgb_array_to_ints(self.fill_from)
+        self.outline_sent = colour_utils.rgb_array_to_ints(self.outline_from)
+        self.origin = self.bounds[:, :2].copy()
+        self.moved = np.zeros((count, 2), dtype=np.float64)
+        self.configs_sent = 0
+        self.configs_suppressed = 0
+        self.moves_sent = 0
+        self.moves_suppressed = 0
+        self.start_fades(np.arange(count))
+        self.retarget(np.arange(count), current_config)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _random_colours(self, count):
+        return self.gen.integers(0, 255, size=(count, 3), endpoint=True).astype(np.float64)
+
+    def start_fades(self, indices):
+        """Builds the fill and outline ramps for the fades starting at the given shapes (replacing any old ones)."""
+        if not len(indices):
+            return
+        self.fill_ramps[indices] = colour_utils.fade_ramp_ints(self.fill_from[indices], self.fill_to[indices], config.COLOR_FADE_STEPS)
+        self.outline_ramps[indices] = colour_utils.fade_ramp_ints(self.outline_from[indices], self.outline_to[indices], config.COLOR_FADE_STEPS)
+
+    def retarget(self, indices, current_config):
+        """Picks new random target positions for the given shapes and sets their per-frame velocity."""
+        if not len(indices):
+            return
+        bounds = self.bounds[indices]
+        widths = bounds[:, 2] - bounds[:, 0]
+        heights = bounds[:, 3] - bounds[:, 1]
+        max_x = config.INNER_X_MAX - widths
+        max_y = config.INNER_Y_MAX - heights
+        max_x = np.where(max_x <= config.INNER_X_MIN, config.INNER_X_MIN + 1, max_x)
+        max_y = np.where(max_y <= config.INNER_Y_MIN, config.INNER_Y_MIN + 1, max_y)
+        target_x = self.gen.integers(config.INNER_X_MIN, max_x.astype(np.int64), endpoint=True)
+        target_y = self.gen.integers(config.INNER_Y_MIN, max_y.astype(np.int64), endpoint=True)
+
+        delta_x = target_x - bounds[:, 0]
+        delta_y = target_y - bounds[:, 1]
+        distance = np.hypot(delta_x, delta_y)
+
+        anim_speed = current_config.get("MOVEMENT_SPEED", config.MOVEMENT_SPEED)
+        if anim_speed <= 0: anim_speed = 0.1 # Prevent division by zero or no movement
+
+        steps_needed = np.maximum(1, (distance / anim_speed).astype(np.int64))
+        arrived = distance < anim_speed
+        steps_needed[arrived] = 0
+        self.steps_remaining[indices] = steps_needed
+        divisor = np.maximum(steps_needed, 1)
+        self.velocity[indices, 0] = np.where(arrived, 0.0, delta_x / divisor)
+        self.velocity[indices, 1] = np.where(arrived, 0.0, delta_y / divisor)
+
+    def step(self, canvas_obj, current_config, frames=1.0):
+        """
+        Advances every shape by `frames` nominal frames (1.0 = one UPDATE_INTERVAL_MS) and pushes the changes
+        to canvas_obj. Shapes whose canvas calls fail are dropped, as in the dict loop: a TclError (item deleted)
+        silently, any other error with a message. Returns how many were removed.
+        """
+        count = len(self)
+        if not count:
+            return 0
+        failed = np.zeros(count, dtype=bool)
+
+        # --- Update Colour ---
+        fading = self.colour_step < config.COLOR_FADE_STEPS
+        self.colour_step[fading] = np.minimum(self.colour_step[fading] + frames, config.COLOR_FADE_STEPS)
+        fade_indices = np.flatnonzero(fading)
+        steps = np.ceil(self.colour_step[fade_indices]).astype(np.int64) - 1
+        fills = self.fill_ramps[fade_indices, steps]
+        outlines = self.outline_ramps[fade_indices, steps]
+        if self.suppress:
+            fill_changed = fills != self.fill_sent[fade_indices]
+            outline_changed = outlines != self.outline_sent[fade_indices]
+        else:
+            fill_changed = outline_changed = np.ones(len(fade_indices), dtype=bool)
+        send = fill_changed | outline_changed
+        sent = int(np.count_nonzero(send))
+        self.configs_sent += sent
+        self.configs_suppressed += len(send) - sent
+        for i, fill, outline, new_fill, new_outline in zip(
+                fade_indices[send].tolist(), fills[send].tolist(), outlines[send].tolist(),
+                fill_changed[send].tolist(), outline_changed[send].tolist()):
+            options = {}
+            if new_fill:
+                options['fill'] = f'#{fill:06x}'
+            if new_outline:
+                options['outline'] = f'#{outline:06x}'
+            try:
+                canvas_obj.itemconfig(self.ids[i], **options)
+            except tk.TclError:
+                failed[i] = True
+            except Exception as e:
+                print(f"Unexpected error updating item {self.ids[i]}: {e}. Marking for removal.")
+                failed[i] = True
+        self.fill_sent[fade_indices] = fills
+        self.outline_sent[fade_indices] = outlines
+        finished = ~fading
+        if finished.any():
+            # Fade complete: the target becomes the start of a new fade to a fresh random colour
+            self.fill_from[finished] = self.fill_to[finished]
+            self.outline_from[finished] = self.outline_to[finished]
+            self.fill_to[finished] = self._random_colours(int(finished.sum()))
+            self.outline_to[finished] = self._random_colours(int(finished.sum()))
+            self.colour_step[finished] = 0
+            self.start_fades(np.flatnonzero(finished))
+
+        # --- Update Position ---
+        # Never overshoot the target: move by at most the steps left
+        advance = np.minimum(frames, self.steps_remaining)
+        offset = self.velocity * advance[:, np.newaxis]
+        next_bounds = self.bounds + np.tile(offset, 2)
+        outside = ((next_bounds[:, 0] < config.INNER_X_MIN) | (next_bounds[:, 2] > config.INNER_X_MAX) |
+                   (next_bounds[:, 1] < config.INNER_Y_MIN) | (next_bounds[:, 3] > config.INNER_Y_MAX))
+        movers = (self.steps_remaining > 0) & ~outside
+        if self.suppress:
+            # Whole-pixel steps from where the item is drawn to where it now rounds to
+            pixel_steps = np.rint(next_bounds[:, :2] - self.origin) - self.moved
+            send = movers & (pixel_steps != 0).any(axis=1)
+            send_indices = np.flatnonzero(send)
+            self.moved[send] += pixel_steps[send]
+            moves = pixel_steps[send].astype(np.int64).tolist()
+        else:
+            send_indices = np.flatnonzero(movers)
+            moves = offset[movers].tolist()
+        self.moves_sent += len(send_indices)
+        self.moves_suppressed += int(np.count_nonzero(movers)) - len(send_indices)
+        for i, (dx, dy) in zip(send_indices.tolist(), moves):
+            try:
+                canvas_obj.move(self.ids[i], dx, dy)
+            except tk.TclError:
+                failed[i] = True
+            except Exception as e:
+                print(f"Unexpected error updating item {self.ids[i]}: {e}. Marking for removal.")
+                failed[i] = True
+        self.bounds[movers] = next_bounds[movers]
+        self.steps_remaining[movers] -= advance[movers]
+        # Shapes that arrived or would cross the inner border get a new target
+        self.steps_remaining[~movers] = 0
+        self.retarget(np.flatnonzero(~movers), current_config)
+
+        if failed.any():
+            self._keep(~failed)
+        return int(failed.sum())
+
+    def _keep(self, mask):
+        """Drops every shape where mask is False."""
+        self.ids = [item_id for item_id, keep in zip(self.ids, mask.tolist()) if keep]
+        for name in ('bounds', 'velocity', 'steps_remaining', 'fill_from', 'fill_to', 'outline_from', 'outline_to',
+                     'colour_step', 'fill_ramps', 'outline_ramps', 'fill_sent', 'outline_sent', 'origin', 'moved'):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def stats(self):
+        """Counts of the itemconfig and move calls sent to the canvas and suppressed as unchanged."""
+        return {'configs_sent': self.configs_sent, 'configs_suppressed': self.configs_suppressed,
+                'moves_sent': self.moves_sent, 'moves_suppressed': self.moves_suppressed}
+
+    def format(self):
+        return (f"itemconfig {self.configs_sent} sent / {self.configs_suppressed} suppressed, "
+                f"move {self.moves_sent} sent / {self.moves_suppressed} suppressed")
@@ -0,0 +1,150 @@
+# batch_generate.py
+"""
+Command-line batch mode: generates many images headlessly across a process pool.
+
+Example:
+    python batch_generate.py --count 10000 --seed-start 0 --output-dir out/ --workers 8
+
+Image N is generated from seed (seed-start + N), so any single image can be
+regenerated later from its seed alone, whichever worker originally drew it.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import config
+import scene
+import raster_renderer
+import png_writer
+import svg_writer
+
+
+def write_ppm(file_path, pixels):
+    """Writes an (height, width, 3) uint8 array as a binary PPM (P6) file."""
+    height, width, _ = pixels.shape
+    with open(file_path, "wb") as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+        f.write(pixels.tobytes())
+
+def render_one(seed, output_dir, current_config=None, image_format="png", compress_level=config.PNG_COMPRESS_LEVEL):
+    """
+    Worker task: builds one scene from its own seeded RNG, rasterises it (or streams it as SVG) and writes it to disk.
+    Returns the path of the written file.
+    """
+    art_scene = scene.build_scene(current_config, verbose=False, rng=seed)
+    file_path = os.path.join(output_dir, f"art_{seed:08d}.{image_format}")
+    if image_format == "svg":
+        svg_writer.save_svg(file_path, art_scene)
+        return file_path
+    pixels = raster_renderer.render_scene(art_scene)
+    if image_format == "png":
+        png_writer.write_png(file_path, pixels, compress_level)
+    else:
+        write_ppm(file_path, pixels)
+    return file_path
+
+def _render_chunk(seeds, output_dir, current_config, image_format, compress_level):
+    """Renders a run of seeds in one task to keep inter-process overhead low."""
+    return [render_one(seed, output_dir, current_config, image_format, compress_level) for seed in seeds]
+
+_TRUE_WORDS = ("1", "true", "yes", "on")
+_FALSE_WORDS = ("0", "false", "no", "off")
+
+def _parse_value(key, value):
+    """Parses one override value by the type of its config.py default."""
+    default = getattr(config, key)
+    if isinstance(default, bool):
+        if value.lower() in _TRUE_WORDS:
+            return True
+        if value.lower() in _FALSE_WORDS:
+            return False
+        raise argparse.ArgumentTypeError(f"{key} expects true or false, not '{value}'.")
+    if isinstance(default, int):
+        try:
+            parsed = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{key} expects a whole number, not '{value}'.") from None
+        if key in scene.COUNT_KEYS and parsed < 0:
+            raise argparse.ArgumentTypeError(f"{key} cannot be negative.")
+        return parsed
+    if isinstance(default, float):
+        try:
+            return float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{key} expects a number, not '{value}'.") from None
+    if key == "PLACEMENT_MODE" and value not in scene.PLACEMENT_MODES:
+        raise argparse.ArgumentTypeError(f"PLACEMENT_MODE must be one of {', '.join(scene.PLACEMENT_MODES)}, not '{value}'.")
+    return value
+
+def _parse_overrides(pairs):
+    """
+    Turns KEY=VALUE strings into a config dict, e.g. NUM_RANDOM_DOTS=200 or PLACEMENT_MODE=poisson.
+    Only the settings build_scene reads (scene.CONFIG_KEYS) can be overridden; values are parsed by the
+    type of the config.py default. Raises argparse.ArgumentTypeError for anything else.
+    """
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Invalid config override '{pair}' (expected KEY=VALUE).")
+        if key not in scene.CONFIG_KEYS:
+            raise argparse.ArgumentTypeError(f"Cannot override '{key}' (settable keys: {', '.join(scene.CONFIG_KEYS)}).")
+        overrides[key] = _parse_value(key, value.strip())
+    return overrides
+
+def run_batch(count, seed_start, output_dir, workers=None, current_config=None, image_format="png", chunk_size=16,
+              compress_level=config.PNG_COMPRESS_LEVEL):
+    """
+    Generates `count` images from seeds seed_start .. seed_start + count - 1 into output_dir.
+    Returns (images_written, elapsed_seconds).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    seeds = list(range(seed_start, seed_start + count))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    written = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_render_chunk, chunk, output_dir, current_config, image_format, compress_level)
+                   for chunk in chunks]
+        for future in futures:
+            written += len(future.result())
+            elapsed = time.perf_counter() - start
+            print(f"\r  {written}/{count} images ({written / elapsed:.1f} images/s)", end="", flush=True)
+    print()
+    return written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate art images in bulk without a display.")
+    parser.add_argument("--count", type=int, required=True, help="Number of images to generate.")
+    parser.add_argument("--seed-start", type=int, default=0, help="Seed of the first image; image N uses seed-start + N.")
+    parser.add_argument("--output-dir", required=True, help="Directory to write images into (created if missing).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU core).")
+    parser.add_argument("--format", choices=("png", "ppm", "svg"), default="png", help="Output format.")
+    parser.add_argument("--compress-level", type=int, choices=range(10), default=config.PNG_COMPRESS_LEVEL, metavar="0-9",
+                        help="PNG zlib level: lower is faster, higher gives smaller files "
+                             f"(default {config.PNG_COMPRESS_LEVEL}).")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Images rendered per worker task.")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a generation setting, e.g. --set NUM_RANDOM_DOTS=200 or --set PLACEMENT_MODE=poisson "
+                             f"(repeatable). Settable keys: {', '.join(scene.CONFIG_KEYS)}.")
+    args = parser.parse_args(argv)
+
+    if args.count <= 0:
+        parser.error("--count must be positive.")
+    try:
+        current_config = _parse_overrides(args.overrides)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    workers = args.workers or os.cpu_count()
+    print(f"Generating {args.count} images (seeds {args.seed_start}-{args.seed_start + args.count - 1}) "
+          f"with {workers} workers into {args.output_dir}...")
+    written, elapsed = run_batch(args.count, args.seed_start, args.output_dir, workers,
+                                 current_config, args.format, args.chunk_size, args.compress_level)
+    print(f"Wrote {written} images in {elapsed:.2f}s ({written / elapsed:.1f} images/s).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+# benchmarks.py
+"""
+Benchmarks for the generative art pipeline.
+
+Every suite runs headless from fixed seeds, prints a table and returns result dicts;
+--json writes them all to a file so runs can be compared across commits.
+
+Run directly:
+    python benchmarks.py                                  # all suites
+    python benchmarks.py --suite animation --suite export
+    python benchmarks.py --json results.json --quick
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import config
+import colour_utils
+import instrumentation
+import scene
+import shapes_3d
+import spatial_index
+import svg_writer
+from offscreen_canvas import OffscreenCanvas
+from scene import check_overlap
+
+# The NumPy-backed modules are optional; suites that need them are skipped without it
+try:
+    import numpy as np
+    import animation_engine
+    import png_writer
+    import raster_renderer
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+BENCH_SEED = 1234 # Every suite samples from this seed so runs are comparable
+
+
+# --- Helpers ---
+def _timed(func, repeat):
+    """Runs func once to warm up, then `repeat` more times, and returns the median wall time in seconds."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def _result(suite, name, seconds, **fields):
+    return dict(suite=suite, name=name, seconds=seconds, **fields)
+
+@contextlib.contextmanager
+def _canvas_size(width, height):
+    """Temporarily changes the canvas size in config, along with the constants derived from it."""
+    names = ('CANVAS_WIDTH', 'CANVAS_HEIGHT', 'INNER_X_MAX', 'INNER_Y_MAX', 'INNER_WIDTH', 'INNER_HEIGHT', 'MAX_SHAPE_SIZE')
+    saved = {name: getattr(config, name) for name in names}
+    config.CANVAS_WIDTH, config.CANVAS_HEIGHT = width, height
+    config.INNER_X_MAX = width - config.BORDER_THICKNESS
+    config.INNER_Y_MAX = height - config.BORDER_THICKNESS
+    config.INNER_WIDTH = width - 2 * config.BORDER_THICKNESS
+    config.INNER_HEIGHT = height - 2 * config.BORDER_THICKNESS
+    config.MAX_SHAPE_SIZE = min(config.MAX_SHAPE_SIZE_LIMIT, config.INNER_WIDTH, config.INNER_HEIGHT)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+
+def _load_art():
+    """Imports the main module (its file name starts with a digit, so a plain import won't do)."""
+    return importlib.import_module('3d_art')
+
+
+# --- Placement Benchmark ---
+PLACEMENT_SHAPE_COUNTS = (100, 1000, 10000)
+PLACEMENT_FILL_RATIO = 0.25 # Fraction of the canvas the requested shapes would cover on average
+
+def _canvas_side_for(num_shapes):
+    """Returns a square canvas side length large enough to fit num_shapes at PLACEMENT_FILL_RATIO."""
+    avg_side = (config.MIN_SHAPE_SIZE + config.MAX_SHAPE_SIZE) / 2
+    return int(math.sqrt(num_shapes * avg_side * avg_side / PLACEMENT_FILL_RATIO))
+
+def place_rectangles(num_shapes, canvas_side, use_index, seed=0):
+    """
+    Runs the rectangle placement loop from generate_art on a canvas_side x canvas_side area.
+    Returns (shapes_placed, overlap_checks).
+    """
+    rng = random.Random(seed)
+    placed = []
+    index = spatial_index.SpatialGrid() if use_index else None
+    checks = 0
+    for _ in range(num_shapes):
+        for attempt in range(config.SHAPE_PLACEMENT_ATTEMPTS):
+            size_x = rng.randint(config.MIN_SHAPE_SIZE, config.MAX_SHAPE_SIZE)
+            size_y = rng.randint(config.MIN_SHAPE_SIZE, config.MAX_SHAPE_SIZE)
+            x1 = rng.randint(0, canvas_side - size_x)
+            y1 = rng.randint(0, canvas_side - size_y)
+            current_bounds = (x1, y1, x1 + size_x, y1 + size_y)
+            candidates = index.query(current_bounds) if use_index else placed
+            overlaps = False
+            for s in candidates:
+                checks += 1
+                if check_overlap(current_bounds, s['bounds']):
+                    overlaps = True; break
+            if not overlaps:
+                shape_data = {'bounds': current_bounds}
+                placed.append(shape_data)
+                if use_index: index.insert(shape_data, current_bounds)
+                break
+    return len(placed), checks
+
+def bench_placement(shape_counts=PLACEMENT_SHAPE_COUNTS, max_linear=PLACEMENT_SHAPE_COUNTS[-1]):
+    """Compares linear-scan and grid-indexed placement at each shape count."""
+    results = []
+    print("Placement: linear scan vs spatial grid")
+    print(f"{'shapes':>8} {'canvas':>7} {'method':>7} {'placed':>7} {'checks':>12} {'seconds':>9}")
+    for num_shapes in shape_counts:
+        canvas_side = _canvas_side_for(num_shapes)
+        for method, use_index in (("linear", False), ("grid", True)):
+            if not use_index and num_shapes > max_linear:
+                print(f"{num_shapes:>8} {canvas_side:>7} {method:>7} {'skipped':>7}")
+                continue
+            start = time.perf_counter()
+            placed, checks = place_rectangles(num_shapes, canvas_side, use_index, BENCH_SEED)
+            elapsed = time.perf_counter() - start
+            print(f"{num_shapes:>8} {canvas_side:>7} {method:>7} {placed:>7} {checks:>12} {elapsed:>9.3f}")
+            results.append(_result("placement", method, elapsed, shapes=num_shapes, canvas=canvas_side,
+                                   placed=placed, overlap_checks=checks))
+    return results
+
+
+# --- Generation Benchmark ---
+GENERATION_SCALES = (1, 4, 16)   # Multiplier on the default number of each shape type
+GENERATION_CANVAS_SIZES = ((600, 400), (1200, 800), (2400, 1600))
+_SHAPE_COUNT_KEYS = ("NUM_RANDOM_RECTANGLES", "NUM_RANDOM_CIRCLES", "NUM_RANDOM_POLYGONS",
+                     "NUM_RANDOM_CUBES", "NUM_RANDOM_PYRAMIDS", "NUM_RANDOM_PRISMS")
+
+def bench_generation(repeat=3):
+    """Times generate_art (scene building plus drawing onto an OffscreenCanvas) per shape scale and canvas size."""
+    art = _load_art()
+    results = []
+    print("Generation: generate_art")
+    print(f"{'canvas':>10} {'scale':>6} {'shapes':>7} {'items':>7} {'seconds':>9}")
+    for width, height in GENERATION_CANVAS_SIZES:
+        for scale in GENERATION_SCALES:
+            current_config = {key: getattr(config, key) * scale for key in _SHAPE_COUNT_KEYS}
+            reports = []
+            def run():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    reports.append(art.generate_art(current_config, target_canvas=OffscreenCanvas(), seed=BENCH_SEED))
+            with _canvas_size(width, height):
+                elapsed = _timed(run, repeat)
+            art_scene = art.current_scene
+            print(f"{f'{width}x{height}':>10} {scale:>6} {len(art_scene.shapes):>7} {len(art_scene):>7} {elapsed:>9.4f}")
+            results.append(_result("generation", "generate_art", elapsed, canvas=[width, height], scale=scale,
+                                   shapes=len(art_scene.shapes), items=len(art_scene),
+                                   phases=reports[-1].to_dict()['phases']))
+    return results
+
+
+# --- Placement Mode Benchmark ---
+# (workload, canvas size, shapes requested of each type): hundreds of shapes filling a 4K canvas (the
+# layouts "packing" is for), the same canvas sparsely filled, and a crowded default-size canvas.
+# "blocks" is the vectorised path testing whole blocks from the first candidate, "vector" the default
+# that tries PLACEMENT_SCALAR_TRIES candidates through the spatial index first
+LAYOUT_WORKLOADS = (("4K full", (3840, 2160), 600), ("4K sparse", (3840, 2160), 100), ("crowded", (800, 600), 200))
+LAYOUT_PATHS = (("random", {"PLACEMENT_MODE": "random", "VECTORISED_PLACEMENT": False}),
+                ("blocks", {"PLACEMENT_MODE": "random", "VECTORISED_PLACEMENT": True, "PLACEMENT_SCALAR_TRIES": 0}),
+                ("vector", {"PLACEMENT_MODE": "random", "VECTORISED_PLACEMENT": True}),
+                ("packing", {"PLACEMENT_MODE": "packing"}))
+_SHAPE_PHASES = ("rectangles", "circles", "polygons", "cubes", "pyramids", "prisms")
+
+def bench_layout(repeat=3):
+    """Time spent placing shapes (the shape phases of build_scene) and how many fit, per placement path and workload."""
+    results = []
+    print("Layout: placement paths per workload")
+    print(f"{'workload':>10} {'path':>8} {'placed':>7} {'ms':>9} {'us/shape':>9}")
+    for workload, (width, height), count in LAYOUT_WORKLOADS:
+        current_config = {key: count for key in _SHAPE_COUNT_KEYS}
+        current_config.update(NUM_RANDOM_DOTS=0, NUM_RANDOM_LINES=0, NUM_CONNECTIONS=0, NUM_ANIMATED_SHAPES=0)
+        for path, settings in LAYOUT_PATHS:
+            if settings.get("VECTORISED_PLACEMENT") and not _HAS_NUMPY:
+                continue
+            times = []
+            with _canvas_size(width, height):
+                for _ in range(repeat):
+                    report = instrumentation.GenerationReport(profile=False)
+                    art_scene = scene.build_scene(dict(current_config, **settings), verbose=False, rng=BENCH_SEED, report=report)
+                    times.append(sum(report.phases[phase] for phase in _SHAPE_PHASES))
+            seconds = statistics.median(times)
+            placed = len(art_scene.shapes)
+            print(f"{workload:>10} {path:>8} {placed:>7} {seconds * 1000:>9.1f} {seconds / max(placed, 1) * 1e6:>9.1f}")
+            results.append(_result("layout", path, seconds, workload=workload, canvas=[width, height],
+                                   requested=count * len(_SHAPE_PHASES), placed=placed))
+    return results
+
+
+# --- Animation Benchmark ---
+ANIMATION_SHAPE_COUNTS = (2, 10, 100, 1000)
+ANIMATION_CANVAS_SIZE = (3000, 2000) # Large enough to place 1000 non-overlapping rectangles
+
+def bench_animation(frames=200):
+    """
+    Frames per second of update_animation at each animated shape count, for the NumPy engine (with
+    SUPPRESS_REDUNDANT_UPDATES on, the default, and off) and the dict loop.
+    """
+    art = _load_art()
+    results = []
+    print("Animation: update_animation")
+    print(f"{'shapes':>7} {'path':>7} {'frames':>7} {'fps':>10} {'suppressed':>11}")
+    paths = (("engine", True, True), ("engine", True, False), ("dicts", False, False))
+    if not art._HAS_ANIMATION_ENGINE:
+        paths = paths[-1:]
+    has_engine = art._HAS_ANIMATION_ENGINE
+    suppress_default = config.SUPPRESS_REDUNDANT_UPDATES
+    with _canvas_size(*ANIMATION_CANVAS_SIZE):
+        for count in ANIMATION_SHAPE_COUNTS:
+            current_config = {key: 0 for key in _SHAPE_COUNT_KEYS}
+            current_config.update(NUM_RANDOM_RECTANGLES=count, NUM_ANIMATED_SHAPES=count,
+                                  NUM_RANDOM_DOTS=0, NUM_RANDOM_LINES=0, NUM_CONNECTIONS=0)
+            art_scene = scene.build_scene(current_config, verbose=False, rng=BENCH_SEED)
+            for path, use_engine, suppress in paths:
+                canvas_obj = OffscreenCanvas()
+                art.canvas = canvas_obj
+                art._HAS_ANIMATION_ENGINE = use_engine
+                config.SUPPRESS_REDUNDANT_UPDATES = suppress
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        art.show_scene(art_scene, current_config)
+                    # show_scene ran the first frame and scheduled the next; run the loop from there.
+                    # The scheduler gets a clock that advances exactly one interval per frame, so every
+                    # frame does one nominal frame of work however long the previous one took.
+                    scheduler = art.animation_scheduler
+                    fake_now = [scheduler.last_frame]
+                    scheduler.clock = lambda: fake_now[0]
+                    start = time.perf_counter()
+                    for _ in range(frames):
+                        fake_now[0] += scheduler.period
+                        canvas_obj.run_pending()
+                    elapsed = time.perf_counter() - start
+                    scheduler.cancel()
+                    updates = art.animation_updates.stats() if art.animation_updates is not None else None
+                finally:
+                    art._HAS_ANIMATION_ENGINE = has_engine
+                    config.SUPPRESS_REDUNDANT_UPDATES = suppress_default
+                    art.canvas = None
+                # Share of itemconfig and move calls the engine's change detection dropped
+                if updates:
+                    calls = sum(updates.values())
+                    dropped = updates['configs_suppressed'] + updates['moves_suppressed']
+                    suppressed = f"{dropped / calls:.0%}" if calls else "-"
+                else:
+                    suppressed = "off"
+                print(f"{len(art_scene.animated):>7} {path:>7} {frames:>7} {frames / elapsed:>10.1f} {suppressed:>11}")
+                results.append(_result("animation", path, elapsed / frames, shapes=len(art_scene.animated),
+                                       frames=frames, fps=frames / elapsed, suppress=suppress, updates=updates))
+    return results
+
+
+# --- Colour Benchmark ---
+def bench_colour(count=20000, repeat=3):
+    """Throughput of the colour_utils conversions, per call and in bulk."""
+    rng = random.Random(BENCH_SEED)
+    hexes = [colour_utils.get_random_color(rng) for _ in range(count)]
+    rgbs = [colour_utils.hex_to_rgb(c) for c in hexes]
+    cases = [
+        ("hex_to_rgb", lambda: [colour_utils.hex_to_rgb(c) for c in hexes]),
+        ("rgb_to_hex", lambda: [colour_utils.rgb_to_hex(c) for c in rgbs]),
+        ("interpolate_color", lambda: [colour_utils.interpolate_color(a, b, 0.5) for a, b in zip(hexes, reversed(hexes))]),
+        ("interpolate_rgb", lambda: [colour_utils.interpolate_rgb(a, b, 0.5) for a, b in zip(rgbs, reversed(rgbs))]),
+        ("adjust_brightness", lambda: [colour_utils.adjust_brightness(c, 0.8) for c in hexes]),
+        ("shade_color x3", lambda: [colour_utils.shade_color(c, (1.2, 0.8, 0.6)) for c in rgbs]),
+    ]
+    if _HAS_NUMPY:
+        array = np.array(rgbs, dtype=np.float64)
+        cases += [
+            ("interpolate_rgb_array", lambda: colour_utils.interpolate_rgb_array(array, array[::-1], 0.5)),
+            ("rgb_array_to_hex", lambda: colour_utils.rgb_array_to_hex(array)),
+        ]
+    results = []
+    print("Colour: colour_utils throughput")
+    print(f"{'operation':>22} {'colours/s':>14}")
+    for name, func in cases:
+        elapsed = _timed(func, repeat)
+        print(f"{name:>22} {count / elapsed:>14,.0f}")
+        results.append(_result("colour", name, elapsed, count=count, rate=count / elapsed))
+    return results
+
+
+# --- 3D Shapes Benchmark ---
+def bench_shapes_3d(count=5000, repeat=3):
+    """Shapes per second for computing and drawing each isometric shape's faces."""
+    rng = random.Random(BENCH_SEED)
+    colours = [colour_utils.get_random_rgb(rng) for _ in range(count)]
+    cases = [
+        ("cube", lambda canvas_obj, c: shapes_3d.draw_isometric_cube(canvas_obj, 300, 200, 30, c)),
+        ("pyramid", lambda canvas_obj, c: shapes_3d.draw_isometric_pyramid(canvas_obj, 300, 200, 40, 1.2, c)),
+        ("prism", lambda canvas_obj, c: shapes_3d.draw_isometric_prism(canvas_obj, 300, 200, 30, 20, 40, c)),
+    ]
+    results = []
+    print("3D shapes: shapes_3d drawing")
+    print(f"{'shape':>10} {'shapes/s':>12}")
+    for name, draw in cases:
+        canvas_obj = OffscreenCanvas()
+        elapsed = _timed(lambda: [draw(canvas_obj, c) for c in colours], repeat)
+        print(f"{name:>10} {count / elapsed:>12,.0f}")
+        results.append(_result("shapes_3d", name, elapsed, count=count, rate=count / elapsed))
+    return results
+
+
+# --- Export Benchmark ---
+EXPORT_SCALES = (1, 16)
+PNG_COMPRESS_LEVELS = (1, 6, 9)
+
+def bench_export(repeat=3):
+    """Latency of rasterising + encoding a PNG (per zlib level) and of streaming an SVG, for a fixed scene."""
+    results = []
+    print("Export: PNG and SVG latency")
+    print(f"{'scale':>6} {'format':>8} {'bytes':>10} {'seconds':>9}")
+    for scale in EXPORT_SCALES:
+        current_config = {key: getattr(config, key) * scale for key in _SHAPE_COUNT_KEYS}
+        art_scene = scene.build_scene(current_config, verbose=False, rng=BENCH_SEED)
+        cases = []
+        if _HAS_NUMPY:
+            for level in PNG_COMPRESS_LEVELS:
+                cases.append((f"png-{level}", lambda level=level: png_writer.encode_png(raster_renderer.render_scene(art_scene), level)))
+        def svg():
+            out = io.StringIO()
+            svg_writer.write_svg(out, art_scene)
+            return out.getvalue()
+        cases.append(("svg", svg))
+        for name, func in cases:
+            size = len(func())
+            elapsed = _timed(func, repeat)
+            print(f"{scale:>6} {name:>8} {size:>10} {elapsed:>9.4f}")
+            results.append(_result("export", name, elapsed, scale=scale, items=len(art_scene), bytes=size))
+    return results
+
+
+# --- Runner ---
+SUITES = ("placement", "layout", "generation", "animation", "colour", "shapes_3d", "export")
+
+def _environment():
+    """Where the results came from, so JSON files from different runs can be compared."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__ if _HAS_NUMPY else None,
+        'platform': platform.platform(),
+        'seed': BENCH_SEED,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def run_suites(suites=SUITES, quick=False, max_linear=PLACEMENT_SHAPE_COUNTS[-1]):
+    """Runs the named suites and returns {'environment': ..., 'results': [...]}."""
+    repeat = 1 if quick else 3
+    runners = {
+        "placement": lambda: bench_placement(PLACEMENT_SHAPE_COUNTS[:2] if quick else PLACEMENT_SHAPE_COUNTS, max_linear),
+        "layout": lambda: bench_layout(repeat),
+        "generation": lambda: bench_generation(repeat),
+        "animation": lambda: bench_animation(50 if quick else 200),
+        "colour": lambda: bench_colour(repeat=repeat),
+        "shapes_3d": lambda: bench_shapes_3d(repeat=repeat),
+        "export": lambda: bench_export(repeat),
+    }
+    results = []
+    for suite in suites:
+        results.extend(runners[suite]())
+        print()
+    return {'environment': _environment(), 'results': results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run generative art benchmarks.")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Suite to run (repeatable; default: all).")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and smaller sizes, for a fast check.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON to PATH.")
+    parser.add_argument("--max-linear", type=int, default=PLACEMENT_SHAPE_COUNTS[-1],
+                        help="Largest shape count to run the linear-scan baseline at.")
+    args = parser.parse_args()
+    report = run_suites(args.suite or SUITES, args.quick, args.max_linear)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.json}")
@@ -0,0 +1,179 @@
+# collision.py
+"""
+Exact overlap tests between shape outlines, used after the bounding-box prefilter.
+
+Bounding boxes make irregular polygons, circles and the isometric shapes reserve
+far more room than they cover. An Outline is the polygon a shape actually covers
+on the canvas: the box of a rectangle, a polygon circumscribing an oval, the
+points of a random polygon, or the convex hull of a 3D shape's faces. Two convex
+outlines are tested with the separating axis theorem; if either is concave (or
+self-intersecting, as random polygons can be) their edges are tested for
+crossings and each is tested for containing the other.
+"""
+import math
+
+OVAL_OUTLINE_VERTICES = 16 # Sides of the polygon that stands in for an oval (it circumscribes the oval)
+
+# Unit-circle vertices of the oval polygon, pushed out so its edges touch the circle instead of cutting inside it
+_OVAL_UNIT = [(math.cos(2 * math.pi * k / OVAL_OUTLINE_VERTICES) / math.cos(math.pi / OVAL_OUTLINE_VERTICES),
+               math.sin(2 * math.pi * k / OVAL_OUTLINE_VERTICES) / math.cos(math.pi / OVAL_OUTLINE_VERTICES))
+              for k in range(OVAL_OUTLINE_VERTICES)]
+
+
+class Outline:
+    """The polygon a shape covers: a list of (x, y) points, its bounding box and whether it is convex."""
+    __slots__ = ('points', 'bounds', 'convex', 'is_box', '_axes')
+
+    def __init__(self, points, bounds=None, convex=None, is_box=False):
+        self.points = points
+        xs = [p[0] for p in points]; ys = [p[1] for p in points]
+        self.bounds = bounds or (min(xs), min(ys), max(xs), max(ys))
+        self.convex = _is_convex(points) if convex is None else convex
+        self.is_box = is_box # Exactly its bounding box, so a box overlap is already exact
+        self._axes = None
+
+    @property
+    def axes(self):
+        """The edge normals of a convex outline, each as (nx, ny, lowest, highest) projection of the outline."""
+        if self._axes is None:
+            self._axes = _edge_axes(self.points, len(self.points))
+        return self._axes
+
+    def __repr__(self):
+        return f"Outline({len(self.points)} points, bounds={self.bounds!r}, convex={self.convex})"
+
+
+# --- Building Outlines ---
+def box_outline(bounds):
+    x1, y1, x2, y2 = bounds
+    outline = Outline([(x1, y1), (x2, y1), (x2, y2), (x1, y2)], bounds, True, is_box=True)
+    outline._axes = [(1, 0, x1, x2), (0, 1, y1, y2)]
+    return outline
+
+def oval_outline(bounds):
+    """A polygon around the oval in bounds (its corners reach slightly outside bounds)."""
+    x1, y1, x2, y2 = bounds
+    cx = (x1 + x2) / 2; cy = (y1 + y2) / 2; rx = (x2 - x1) / 2; ry = (y2 - y1) / 2
+    outline = Outline([(cx + rx * ux, cy + ry * uy) for ux, uy in _OVAL_UNIT], convex=True)
+    outline._axes = _edge_axes(outline.points, OVAL_OUTLINE_VERTICES // 2) # Opposite edges are parallel
+    return outline
+
+def flat_outline(coords):
+    """Outline of a polygon given as flat [x1, y1, x2, y2, ...] coordinates."""
+    return Outline(list(zip(coords[0::2], coords[1::2])))
+
+def hull_outline(points):
+    """Convex hull of (x, y) points (Andrew's monotone chain)."""
+    pts = sorted(set(points))
+    if len(pts) < 3:
+        return Outline(pts, convex=True)
+    def half(seq):
+        chain = []
+        for p in seq:
+            while len(chain) >= 2 and _cross(chain[-2], chain[-1], p) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain[:-1]
+    return Outline(half(pts) + half(reversed(pts)), convex=True)
+
+def faces_outline(faces):
+    """Outline of a shapes_3d shape from its (points, fill) faces: the hull of everything drawn."""
+    return hull_outline([point for face_points, _ in faces for point in face_points])
+
+def shape_outline(shape):
+    """Outline of a scene.PlacedShape, from the items it draws."""
+    if len(shape.items) > 1:
+        return hull_outline([(item.coords[i], item.coords[i + 1]) for item in shape.items for i in range(0, len(item.coords) - 1, 2)])
+    item = shape.items[0]
+    if item.kind == 'rectangle':
+        return box_outline(shape.bounds)
+    if item.kind == 'oval':
+        return oval_outline(shape.bounds)
+    return flat_outline(item.coords)
+
+
+# --- Overlap Tests ---
+def _edge_axes(points, count):
+    """(nx, ny, lowest, highest) for the normals of the first count edges, with points projected onto each."""
+    axes = []
+    for i in range(count):
+        x1, y1 = points[i - 1]; x2, y2 = points[i]
+        nx = y1 - y2; ny = x2 - x1
+        projections = [nx * x + ny * y for x, y in points]
+        axes.append((nx, ny, min(projections), max(projections)))
+    return axes
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+def _is_convex(points):
+    """True for a simple convex polygon: every turn goes the same way and the outline winds around once."""
+    n = len(points)
+    if n < 4:
+        return True
+    sign = 0
+    turning = 0.0
+    for i in range(n):
+        a, b, c = points[i - 2], points[i - 1], points[i]
+        cross = _cross(a, b, c)
+        if cross:
+            if sign and (cross > 0) != (sign > 0):
+                return False
+            sign = cross
+        turning += math.atan2(cross, (b[0] - a[0]) * (c[0] - b[0]) + (b[1] - a[1]) * (c[1] - b[1]))
+    return abs(turning) < 3 * math.pi # One full turn is 2*pi; a star that winds twice is 4*pi
+
+def _separated(a, b):
+    """True if an edge normal of a separates a from b (the separating axis test, in one direction)."""
+    pb = b.points
+    for nx, ny, lowest, highest in a.axes:
+        below = above = True
+        for x, y in pb:
+            projection = nx * x + ny * y
+            if projection >= lowest: below = False
+            if projection <= highest: above = False
+            if not (below or above):
+                break
+        if below or above:
+            return True
+    return False
+
+def _segments_cross(p1, p2, q1, q2):
+    """True if segments p1-p2 and q1-q2 intersect (touching counts)."""
+    d1 = _cross(q1, q2, p1); d2 = _cross(q1, q2, p2)
+    d3 = _cross(p1, p2, q1); d4 = _cross(p1, p2, q2)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    def on_segment(a, b, p):
+        return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+    return ((d1 == 0 and on_segment(q1, q2, p1)) or (d2 == 0 and on_segment(q1, q2, p2)) or
+            (d3 == 0 and on_segment(p1, p2, q1)) or (d4 == 0 and on_segment(p1, p2, q2)))
+
+def _contains_point(points, x, y):
+    """Even-odd point-in-polygon test (Tk fills polygons with the even-odd rule)."""
+    inside = False
+    for i in range(len(points)):
+        x1, y1 = points[i - 1]; x2, y2 = points[i]
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+def outlines_overlap(a, b):
+    """True if Outlines a and b overlap (touching counts, as with scene.check_overlap)."""
+    ab = a.bounds; bb = b.bounds
+    if ab[2] < bb[0] or ab[0] > bb[2] or ab[3] < bb[1] or ab[1] > bb[3]:
+        return False
+    if a.is_box and b.is_box:
+        return True
+    if a.convex and b.convex:
+        return not (_separated(a, b) or _separated(b, a))
+    pa = a.points; pb = b.points
+    for i in range(len(pa)):
+        p1 = pa[i - 1]; p2 = pa[i]
+        # Skip edges entirely outside the other outline's box
+        if max(p1[0], p2[0]) < bb[0] or min(p1[0], p2[0]) > bb[2] or max(p1[1], p2[1]) < bb[1] or min(p1[1], p2[1]) > bb[3]:
+            continue
+        for j in range(len(pb)):
+            if _segments_cross(p1, p2, pb[j - 1], pb[j]):
+                return True
+    return _contains_point(pb, *pa[0]) or _contains_point(pa, *pb[0])
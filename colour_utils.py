@@ -2,29 +2,50 @@
 import random
 import config # Needs config for faint color defaults
 
-def get_random_color():
-    """Generates a random hex color code."""
-    return f'#{random.randint(0, 0xFFFFFF):06x}'
+# NumPy is only needed for the bulk (array) colour functions
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+# Colours are held internally as (R, G, B) int tuples (or packed 0xRRGGBB ints / NumPy arrays);
+# hex strings are only produced at the Tk/SVG boundary.
+_HEX_BYTES = [f'{i:02x}' for i in range(256)]
+
+def get_random_color(rng=None):
+    """Generates a random hex color code. rng is a random.Random (defaults to the global random module)."""
+    rng = rng or random
+    return f'#{rng.randint(0, 0xFFFFFF):06x}'
 
 def get_random_faint_color(min_brightness=config.FAINT_COLOR_MIN_BRIGHTNESS,
-                           max_brightness=config.FAINT_COLOR_MAX_BRIGHTNESS):
+                           max_brightness=config.FAINT_COLOR_MAX_BRIGHTNESS, rng=None):
     """Generates a random hex color code that is relatively light/pale."""
+    return rgb_to_hex(get_random_faint_rgb(min_brightness, max_brightness, rng))
+
+def get_random_faint_rgb(min_brightness=config.FAINT_COLOR_MIN_BRIGHTNESS,
+                         max_brightness=config.FAINT_COLOR_MAX_BRIGHTNESS, rng=None):
+    """Generates a random, relatively light/pale (R, G, B) tuple."""
+    rng = rng or random
     try:
-        r = random.randint(min_brightness, max_brightness)
-        g = random.randint(min_brightness, max_brightness)
-        b = random.randint(min_brightness, max_brightness)
-        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
-        return f'#{r:02x}{g:02x}{b:02x}'
+        r = rng.randint(min_brightness, max_brightness)
+        g = rng.randint(min_brightness, max_brightness)
+        b = rng.randint(min_brightness, max_brightness)
+        return max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
     except ValueError:
         print(f"Warning: Invalid brightness range ({min_brightness}-{max_brightness}). Using default grey.")
-        return "#DDDDDD"
+        return (0xDD, 0xDD, 0xDD)
+
+def get_random_rgb(rng=None):
+    """Generates a random (R, G, B) tuple."""
+    return int_to_rgb((rng or random).randint(0, 0xFFFFFF))
 
 def hex_to_rgb(hex_color):
     """Converts a hex color string (e.g., '#ffffff') to an (R, G, B) tuple."""
     hex_color = hex_color.lstrip('#')
     if len(hex_color) != 6: return (0, 0, 0) # Return black for invalid format
     try:
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return int_to_rgb(int(hex_color, 16))
     except ValueError:
         print(f"Warning: Invalid hex color value '{hex_color}'. Using black.")
         return (0, 0, 0) # Return black for invalid hex values
@@ -32,35 +53,138 @@ def hex_to_rgb(hex_color):
 def rgb_to_hex(rgb):
     """Converts an (R, G, B) tuple to a hex color string."""
     try:
-        rgb_clamped = tuple(max(0, min(255, int(c))) for c in rgb)
-        return f'#{rgb_clamped[0]:02x}{rgb_clamped[1]:02x}{rgb_clamped[2]:02x}'
+        r, g, b = (max(0, min(255, int(c))) for c in rgb)
+        return '#' + _HEX_BYTES[r] + _HEX_BYTES[g] + _HEX_BYTES[b]
     except (ValueError, TypeError):
         print(f"Warning: Invalid RGB value '{rgb}'. Using black.")
         return '#000000'
 
+def tk_colour(rgb):
+    """Formats an (R, G, B) tuple as a Tk colour value: hex, or '' (not drawn) for None."""
+    return '' if rgb is None else rgb_to_hex(rgb)
+
+# Tk colour names used by the art generator (anything else should be hex)
+_TK_NAMED_COLOURS = {
+    'black': (0, 0, 0),
+    'white': (255, 255, 255),
+    'grey': (190, 190, 190),
+    'gray': (190, 190, 190),
+}
+
+def parse_tk_colour(colour):
+    """
+    Converts a Tk colour value to an (R, G, B) tuple.
+    Returns None for an empty string/None, which Tk treats as 'not drawn'.
+    """
+    if not colour:
+        return None
+    if colour.startswith('#'):
+        return hex_to_rgb(colour)
+    name = colour.lower()
+    if name in _TK_NAMED_COLOURS:
+        return _TK_NAMED_COLOURS[name]
+    # Tk's greyN/grayN scale: N percent of full intensity
+    for prefix in ('grey', 'gray'):
+        if name.startswith(prefix) and name[len(prefix):].isdigit():
+            level = round(int(name[len(prefix):]) * 255 / 100)
+            level = max(0, min(255, level))
+            return (level, level, level)
+    print(f"Warning: Unknown colour name '{colour}'. Using black.")
+    return (0, 0, 0)
+
+def int_to_rgb(value):
+    """Unpacks a 0xRRGGBB int to an (R, G, B) tuple."""
+    return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+
+def rgb_to_int(rgb):
+    """Packs an (R, G, B) tuple (clamped to 0-255) into a 0xRRGGBB int."""
+    r, g, b = (max(0, min(255, int(c))) for c in rgb)
+    return (r << 16) | (g << 8) | b
+
+def int_to_hex(value):
+    """Formats a packed 0xRRGGBB int as a hex color string."""
+    return f'#{value & 0xFFFFFF:06x}'
+
+def interpolate_rgb(rgb1, rgb2, factor):
+    """Finds an (R, G, B) tuple between rgb1 and rgb2. factor = 0.0 -> rgb1, factor = 1.0 -> rgb2."""
+    factor = max(0.0, min(1.0, factor))
+    return (int(rgb1[0] + (rgb2[0] - rgb1[0]) * factor),
+            int(rgb1[1] + (rgb2[1] - rgb1[1]) * factor),
+            int(rgb1[2] + (rgb2[2] - rgb1[2]) * factor))
+
 def interpolate_color(color1_hex, color2_hex, factor):
     """Finds a color between color1 and color2. factor = 0.0 -> color1, factor = 1.0 -> color2."""
     rgb1 = hex_to_rgb(color1_hex)
     rgb2 = hex_to_rgb(color2_hex)
-    # Clamp factor
-    factor = max(0.0, min(1.0, factor))
     try:
-        new_rgb = [rgb1[i] + (rgb2[i] - rgb1[i]) * factor for i in range(3)]
-        return rgb_to_hex(tuple(new_rgb))
+        return rgb_to_hex(interpolate_rgb(rgb1, rgb2, factor))
     except (IndexError, TypeError):
          print(f"Warning: Error interpolating colors '{color1_hex}' and '{color2_hex}'. Using color1.")
          return color1_hex
 
+def adjust_brightness_rgb(rgb, factor):
+    """Scales an (R, G, B) tuple by factor, clamping each component between 0 and 255."""
+    if factor < 0: factor = 0 # Prevent negative factors
+    return tuple(max(0, min(255, int(c * factor))) for c in rgb)
 
 def adjust_brightness(hex_color, factor):
     """Adjusts the brightness of a hex color by a factor. Clamps result between #000000 and #ffffff."""
     rgb = hex_to_rgb(hex_color)
-    if factor < 0: factor = 0 # Prevent negative factors
-
     try:
-        # Adjust each component, clamping between 0 and 255
-        new_rgb = tuple(max(0, min(255, int(c * factor))) for c in rgb)
-        return rgb_to_hex(new_rgb)
+        return rgb_to_hex(adjust_brightness_rgb(rgb, factor))
     except (TypeError):
         print(f"Warning: Error adjusting brightness for '{hex_color}'. Returning original.")
         return hex_color
+
+def fade_ramp(start_rgb, end_rgb, steps):
+    """
+    Precomputes the colours of a fade from start_rgb to end_rgb over `steps` frames, as packed 0xRRGGBB ints.
+    ramp[step - 1] is the colour shown at frame `step` (the last entry is end_rgb).
+    """
+    return [rgb_to_int(interpolate_rgb(start_rgb, end_rgb, step / steps)) for step in range(1, steps + 1)]
+
+def shade_color(rgb, factors):
+    """Returns a list of (R, G, B) shades of one colour, one per brightness factor."""
+    return [adjust_brightness_rgb(rgb, factor) for factor in factors]
+
+
+# --- Bulk (NumPy) Colour Functions ---
+# Colour arrays are (N, 3) arrays of R, G, B values.
+
+def hex_list_to_rgb_array(hex_colors):
+    """Converts a list of hex color strings to an (N, 3) float array."""
+    return np.array([hex_to_rgb(c) for c in hex_colors], dtype=np.float64).reshape(len(hex_colors), 3)
+
+def interpolate_rgb_array(start, end, factors):
+    """Interpolates whole arrays of colours at once: factors is a scalar or one factor per row (0.0 -> start, 1.0 -> end)."""
+    factors = np.clip(np.asarray(factors, dtype=np.float64), 0.0, 1.0)
+    if factors.ndim == 1:
+        factors = factors[:, np.newaxis]
+    return start + (end - start) * factors
+
+def shade_rgb_array(colours, factors):
+    """Scales an array of colours by a scalar or per-row brightness factor, clamped to 0-255."""
+    factors = np.maximum(np.asarray(factors, dtype=np.float64), 0.0)
+    if factors.ndim == 1:
+        factors = factors[:, np.newaxis]
+    return np.clip(np.asarray(colours, dtype=np.float64) * factors, 0, 255)
+
+def rgb_array_to_ints(colours):
+    """Packs an (N, 3) colour array into 0xRRGGBB ints, truncating and clamping like rgb_to_hex."""
+    channels = np.clip(colours, 0, 255).astype(np.int64)
+    return (channels[:, 0] << 16) | (channels[:, 1] << 8) | channels[:, 2]
+
+def rgb_array_to_hex(colours):
+    """Formats an (N, 3) colour array as a list of hex color strings."""
+    return [f'#{value:06x}' for value in rgb_array_to_ints(colours).tolist()]
+
+def fade_ramp_ints(start, end, steps):
+    """Bulk fade_ramp as packed 0xRRGGBB ints: an (N, steps) array, one ramp per row of the start/end colour arrays."""
+    count = len(start)
+    factors = np.arange(1, steps + 1) / steps
+    colours = start[:, np.newaxis, :] + (end - start)[:, np.newaxis, :] * factors[np.newaxis, :, np.newaxis]
+    return rgb_array_to_ints(colours.reshape(count * steps, 3)).reshape(count, steps)
+
+def fade_ramps(start, end, steps):
+    """Bulk fade_ramp: builds one hex ramp per row of the (N, 3) start/end colour arrays."""
+    return [[f'#{value:06x}' for value in ramp] for ramp in fade_ramp_ints(start, end, steps).tolist()]
@@ -41,6 +41,21 @@ MAX_PYRAMID_HEIGHT_FACTOR = 1.5
 MIN_PRISM_DIM = 10 # Min dimension for width/depth/height
 MAX_PRISM_DIM = 40 # Max dimension for width/depth/height
 SHAPE_PLACEMENT_ATTEMPTS = 100
+ADAPTIVE_PLACEMENT_BUDGET = False # Halve a shape type's attempt budget after each failure, and stop once the canvas is full
+                                  # (bounds worst-case time on crowded canvases, but places fewer shapes there)
+MIN_PLACEMENT_ATTEMPTS = 25 # Smallest budget the adaptive budget shrinks to
+PLACEMENT_GIVE_UP_AFTER = 20 # Failures in a row after which the rest of that shape type is skipped as saturated
+SPATIAL_GRID_CELL_SIZE = 64 # Cell size (pixels) of the grid used to speed up overlap checks
+VECTORISED_PLACEMENT = True # Sample placement candidates in NumPy blocks (needs NumPy, otherwise ignored)
+PLACEMENT_BATCH_SIZE = 32   # Candidates tested per block once a shape's scalar tries are rejected (VECTORISED_PLACEMENT)
+PLACEMENT_POOL_SIZE = 256   # Candidates of a shape type sampled in one go and handed out in order (VECTORISED_PLACEMENT)
+PLACEMENT_SCALAR_TRIES = 4  # Candidates tested one at a time through the spatial index before switching to blocks
+PLACEMENT_MODE = "random"   # "random": rejection sampling, "poisson": blue-noise packing around placed shapes,
+                            # "packing": free-rectangle bin packing (every shape type except polygons)
+POISSON_CANDIDATES = 30     # Candidate spots tried around an active shape before it is retired ("poisson" mode)
+POISSON_GAP = 2             # Minimum pixels between neighbouring shapes in "poisson" mode
+PACKING_GAP = 2             # Minimum pixels between neighbouring shapes in "packing" mode
+EXACT_OVERLAP_TESTS = False # Confirm bounding-box hits with exact outline tests, letting shapes nest closer
 CONNECTION_LINE_COLOR = "grey50" # Color for connecting lines
 CONNECTION_LINE_WIDTH = 1        # Width for connecting lines
 
@@ -55,8 +70,34 @@ FAINT_COLOR_MAX_BRIGHTNESS = 245
 # --- Animation Constants ---
 NUM_ANIMATED_SHAPES = 2  # How many shapes to animate
 UPDATE_INTERVAL_MS = 50  # Milliseconds between animation frames (e.g., 50ms = 20 FPS)
-MOVEMENT_SPEED = 0.8     # Pixels to move per frame
+MOVEMENT_SPEED = 0.8     # Pixels to move per frame (per UPDATE_INTERVAL_MS of real time, however often frames run)
 COLOR_FADE_STEPS = 150   # How many steps (frames) a color fade should take
+MAX_CATCH_UP_FRAMES = 5  # Most frames' worth of movement a single late frame may catch up on
+FRAME_STATS_WINDOW = 120 # Recent frames the measured FPS and jitter are computed over
+SUPPRESS_REDUNDANT_UPDATES = True # Animation engine: skip itemconfig calls that repeat the last colour and moves smaller than a pixel
+
+# --- Drawing ---
+BATCH_TK_DRAWING = True  # Create a scene's items on a tk.Canvas through a few Tcl evaluations instead of one call each
+TK_BATCH_SIZE = 2000     # Items created per Tcl evaluation when BATCH_TK_DRAWING is on
+PROGRESSIVE_DRAWING = True       # Draw large scenes on screen a time slice at a time so the window stays responsive
+PROGRESSIVE_DRAW_MIN_ITEMS = 5000 # Scenes with fewer items than this are drawn in one go
+PROGRESSIVE_SLICE_MS = 12        # Drawing time per slice before handing control back to the event loop
+PROGRESSIVE_CHUNK_SIZE = 250     # Items created per Tcl call in progressive drawing (the clock is checked between chunks)
+
+# --- Regeneration ---
+BACKGROUND_GENERATION = True # Build new scenes in a worker thread so the window and animation keep running
+WORKER_POLL_MS = 15          # How often the Tk thread checks whether the worker has finished a scene
+CANCEL_CHECK_INTERVAL = 1000 # Dots, lines and connections generated between checks for a cancelled generation
+LIVE_PREVIEW = False         # Start with "Live preview" ticked: slider changes redraw the art without pressing Regenerate
+LIVE_PREVIEW_DEBOUNCE_MS = 150 # Least time between low-detail previews while a slider is being dragged
+LIVE_PREVIEW_SETTLE_MS = 600   # Full render once the sliders have not changed for this long (or on release)
+LIVE_PREVIEW_DETAIL = 0.25     # Share of the shape and decoration counts drawn in a preview
+
+# --- Export ---
+PNG_COMPRESS_LEVEL = 6   # zlib level for PNG export: 0 (none) / 1 (fastest) .. 9 (smallest files)
+
+# --- Instrumentation ---
+PROFILE_GENERATION = False # Run scene generation under cProfile and print the hottest functions
 
 # --- Calculated Inner Bounds (dependent on other constants) ---
 # These are calculated here for convenience but used in main.py
@@ -0,0 +1,109 @@
+# frame_scheduler.py
+"""
+Fixed-rate frame scheduling for the animation loop.
+
+Rescheduling with after(UPDATE_INTERVAL_MS) once a frame's work is done makes
+the real frame period the interval plus the work time, so a busy frame slows
+the whole animation down. FrameScheduler keeps a timeline of deadlines
+instead: deadline n is start + n * interval on a monotonic clock, and each
+frame waits only for whatever is left until the next one, so the rate cannot
+drift. Each frame is told how many nominal frames really elapsed since the
+previous one, so movement and fades advance by time rather than by callback
+count. When a frame runs late by whole intervals, those deadlines are skipped
+instead of being run back to back. The measured frame rate and jitter can be
+read at any time.
+"""
+import math
+import statistics
+import time
+from collections import deque
+import tkinter as tk
+import config
+
+
+class FrameScheduler:
+    """
+    Calls on_frame(frames) at a steady rate using widget.after, where frames is the number of
+    nominal frames that actually elapsed since the previous call (1.0 when exactly on time,
+    at most max_catch_up after a long stall).
+    """
+
+    def __init__(self, widget, on_frame, interval_ms=config.UPDATE_INTERVAL_MS,
+                 max_catch_up=config.MAX_CATCH_UP_FRAMES, clock=time.perf_counter):
+        self.widget = widget
+        self.on_frame = on_frame
+        self.period = interval_ms / 1000
+        self.max_catch_up = max_catch_up
+        self.clock = clock             # Monotonic clock in seconds (replaceable, e.g. for benchmarks)
+        self.after_id = None
+        self.deadline = None           # When the next frame is due
+        self.last_frame = None         # When the previous frame started
+        self.frames = 0
+        self.skipped = 0               # Deadlines dropped because a frame ran late
+        self.intervals = deque(maxlen=config.FRAME_STATS_WINDOW) # Recent start-to-start frame times (s)
+
+    @property
+    def running(self):
+        return self.after_id is not None
+
+    def start(self):
+        """Runs the first frame now and schedules the rest."""
+        self.cancel()
+        self.deadline = self.clock()
+        self._tick()
+
+    def cancel(self):
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except tk.TclError:
+                pass # Window already gone
+            self.after_id = None
+
+    def _tick(self):
+        self.after_id = None
+        now = self.clock()
+        if self.last_frame is None:
+            frames = 1.0
+        else:
+            self.intervals.append(now - self.last_frame)
+            frames = min((now - self.last_frame) / self.period, self.max_catch_up)
+        self.last_frame = now
+        self.on_frame(frames)
+        self.frames += 1
+
+        # The next deadline is on the fixed timeline; deadlines already missed by a whole period are skipped
+        self.deadline += self.period
+        now = self.clock()
+        behind = now - self.deadline
+        if behind >= self.period:
+            missed = int(behind // self.period)
+            self.deadline += missed * self.period
+            self.skipped += missed
+        delay_ms = max(0, math.ceil((self.deadline - now) * 1000))
+        try:
+            self.after_id = self.widget.after(delay_ms, self._tick)
+        except tk.TclError:
+            print("Window closed, stopping animation loop.")
+
+    def stats(self):
+        """Measured rate over the recent frames: fps, mean and max frame time and jitter (standard deviation), in ms."""
+        intervals = list(self.intervals)
+        if not intervals:
+            return {'frames': self.frames, 'skipped': self.skipped, 'fps': 0.0,
+                    'frame_ms': 0.0, 'jitter_ms': 0.0, 'max_frame_ms': 0.0}
+        mean = sum(intervals) / len(intervals)
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'fps': 1 / mean if mean else 0.0,
+            'frame_ms': mean * 1000,
+            'jitter_ms': statistics.pstdev(intervals) * 1000,
+            'max_frame_ms': max(intervals) * 1000,
+        }
+
+    def format(self):
+        s = self.stats()
+        return (f"{s['frames']} frames at {s['fps']:.1f} fps (target {1 / self.period:.1f}), frame time "
+                f"{s['frame_ms']:.1f} ms +/- {s['jitter_ms']:.1f} ms (max {s['max_frame_ms']:.1f} ms), "
+                f"{s['skipped']} skipped")
@@ -0,0 +1,131 @@
+# instrumentation.py
+"""
+Timers and counters for the stages of art generation.
+
+A GenerationReport is passed through build_scene (and show_scene for the drawing
+stages). Each stage runs inside report.phase(name), which times it and hands back
+a Counter for that stage's numbers (placement attempts, rejections, overlap checks,
+...). The finished report can be printed, turned into a dict (e.g. dumped as JSON to
+track regressions), or followed live with a callback. With profile=True the whole
+generation is also run under cProfile.
+
+A report can also be cancelled from another thread: generation checks it as each
+phase starts, before each shape is placed and every CANCEL_CHECK_INTERVAL dots,
+lines and connections, and stops with GenerationCancelled.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+import config
+
+
+class GenerationCancelled(Exception):
+    """Raised inside generation once its GenerationReport has been cancelled."""
+
+
+class GenerationReport:
+    """Per-phase timings and counters for one generated piece of art."""
+
+    def __init__(self, callback=None, profile=None):
+        """
+        callback: optional callable(name, seconds, counters) run as each phase finishes.
+        profile: run generation under cProfile (defaults to config.PROFILE_GENERATION).
+        """
+        self.callback = callback
+        self.profile = config.PROFILE_GENERATION if profile is None else profile
+        self.seed = None
+        self.phases = {}   # phase name -> seconds, in the order the phases first ran
+        self.counters = {} # phase name -> Counter
+        self._profiler = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Asks the generation using this report to stop (safe to call from any thread)."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        """Raises GenerationCancelled if cancel() has been called."""
+        if self._cancelled.is_set():
+            raise GenerationCancelled("Generation was cancelled.")
+
+    @contextmanager
+    def phase(self, name):
+        """Times the enclosed block as phase `name` and yields its Counter (phases run twice accumulate)."""
+        self.check_cancelled()
+        counters = self.counters.setdefault(name, Counter())
+        self.phases.setdefault(name, 0.0)
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] += elapsed
+            if self.callback:
+                self.callback(name, elapsed, counters)
+
+    def add_phase(self, name, seconds, **counters):
+        """Records a phase timed elsewhere (e.g. one spread over several event-loop callbacks)."""
+        phase_counters = self.counters.setdefault(name, Counter())
+        phase_counters.update(counters)
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self.callback:
+            self.callback(name, seconds, phase_counters)
+
+    @contextmanager
+    def profiling(self):
+        """Runs the enclosed block under cProfile when profiling is enabled (a no-op otherwise)."""
+        if not self.profile:
+            yield
+            return
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    @property
+    def total_seconds(self):
+        return sum(self.phases.values())
+
+    def totals(self):
+        """Counters summed over all phases."""
+        total = Counter()
+        for counters in self.counters.values():
+            total.update(counters)
+        return total
+
+    def profile_text(self, limit=25, sort_by='cumulative'):
+        """The cProfile statistics as text (empty if profiling was off)."""
+        if self._profiler is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats(sort_by).print_stats(limit)
+        return out.getvalue()
+
+    def to_dict(self):
+        """A JSON-serialisable summary of the report."""
+        return {
+            'seed': self.seed,
+            'total_seconds': self.total_seconds,
+            'phases': [dict(name=name, seconds=seconds, **self.counters[name]) for name, seconds in self.phases.items()],
+            'totals': dict(self.totals()),
+        }
+
+    def format(self):
+        """A human-readable table of the phases."""
+        lines = [f"{'Phase':<22}{'ms':>10}  Counters"]
+        for name, seconds in self.phases.items():
+            counters = ', '.join(f"{key}={value}" for key, value in self.counters[name].items())
+            lines.append(f"{name:<22}{seconds * 1000:>10.2f}  {counters}")
+        lines.append(f"{'total':<22}{self.total_seconds * 1000:>10.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,240 @@
+# offscreen_canvas.py
+"""
+An in-memory stand-in for the parts of tk.Canvas the art generator uses.
+
+Items are kept in compact parallel arrays (kind, coordinate offsets, width) with all
+coordinates in one shared array('d') pool, so thousands of items cost little memory
+and create/move/coords calls are plain array operations. No display or Tk
+interpreter is needed, which makes it suitable for batch jobs, benchmarks and tests.
+raster_renderer.RasterCanvas builds on it to render the items to pixels.
+"""
+from array import array
+import config # Needs canvas dimensions
+
+_KINDS = ('rectangle', 'oval', 'polygon', 'line')
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+# Option values Tk gives an item that wasn't passed them: (fill, outline)
+_DEFAULT_PAINT = {
+    'rectangle': ('', 'black'),
+    'oval': ('', 'black'),
+    'polygon': ('black', ''),
+    'line': ('black', ''),
+}
+
+def _flatten_coords(args):
+    """Flattens Tk-style coordinates (flat numbers, a flat list, or a list of (x, y) pairs)."""
+    flat = []
+    for value in args:
+        if isinstance(value, (list, tuple)):
+            flat.extend(_flatten_coords(value))
+        else:
+            flat.append(float(value))
+    return flat
+
+
+class OffscreenCanvas:
+    """
+    Supports create_rectangle/oval/polygon/line, coords, move, itemconfig, itemcget,
+    tag_lower, delete, find_all and type, plus after/after_cancel so the animation loop
+    can be driven headlessly with run_pending().
+    """
+
+    def __init__(self, width=config.CANVAS_WIDTH, height=config.CANVAS_HEIGHT, background="grey"):
+        self.width = width
+        self.height = height
+        self.background = background
+        self._after = {}  # after ID -> (func, args), run by run_pending()
+        self._next_after = 1
+        self._clear()
+
+    def _clear(self):
+        # Per-item slots; an item's slot never changes while it exists
+        self._kind = array('B')
+        self._start = array('l')   # Offset of the item's coordinates in _coords
+        self._length = array('l')  # Number of coordinate values
+        self._width = array('d')
+        self._fill = []
+        self._outline = []
+        self._extra = {}           # slot -> dict of any other options (tags, dash, ...)
+        self._coords = array('d')  # Coordinate pool shared by all items
+        self._garbage = 0          # Pool values no longer used by any item
+        self._ids = array('l')     # slot -> item ID (0 once deleted)
+        self._slots = {}           # item ID -> slot
+        self._order = []           # Slots in stacking order, bottom first
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __bool__(self):
+        return True # An empty canvas is still a canvas (callers test `if not canvas`)
+
+    # --- Item Creation ---
+    def _create(self, kind, args, options):
+        coords = _flatten_coords(args)
+        default_fill, default_outline = _DEFAULT_PAINT[kind]
+        slot = len(self._ids)
+        item_id = self._next_id
+        self._next_id += 1
+        self._kind.append(_KIND_CODES[kind])
+        self._start.append(len(self._coords))
+        self._length.append(len(coords))
+        self._coords.extend(coords)
+        self._width.append(float(options.pop('width', 1)))
+        self._fill.append(options.pop('fill', default_fill))
+        self._outline.append(options.pop('outline', default_outline))
+        if options:
+            self._extra[slot] = options
+        self._ids.append(item_id)
+        self._slots[item_id] = slot
+        self._order.append(slot)
+        return item_id
+
+    def create_rectangle(self, *args, **options):
+        return self._create('rectangle', args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create('oval', args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create('polygon', args, options)
+
+    def create_line(self, *args, **options):
+        return self._create('line', args, options)
+
+    # --- Item Access ---
+    def coords(self, item_id, *args):
+        """Returns the item's coordinates as a flat list, or replaces them when new ones are given."""
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return [] if not args else None # Like Tk, unknown IDs match nothing
+        start, length = self._start[slot], self._length[slot]
+        if not args:
+            return self._coords[start:start + length].tolist()
+        coords = _flatten_coords(args)
+        if len(coords) == length:
+            self._coords[start:start + length] = array('d', coords)
+            return None
+        self._start[slot] = len(self._coords)
+        self._length[slot] = len(coords)
+        self._coords.extend(coords)
+        self._garbage += length
+        self._compact_if_needed()
+        return None
+
+    def move(self, item_id, dx, dy):
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return
+        pool = self._coords
+        start = self._start[slot]
+        for i in range(start, start + self._length[slot], 2):
+            pool[i] += dx
+            pool[i + 1] += dy
+
+    def itemconfig(self, item_id, **options):
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return
+        if 'fill' in options: self._fill[slot] = options.pop('fill')
+        if 'outline' in options: self._outline[slot] = options.pop('outline')
+        if 'width' in options: self._width[slot] = float(options.pop('width'))
+        if options:
+            self._extra.setdefault(slot, {}).update(options)
+    itemconfigure = itemconfig
+
+    def itemcget(self, item_id, option):
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return ''
+        if option == 'fill': return self._fill[slot]
+        if option == 'outline': return self._outline[slot]
+        if option == 'width': return self._width[slot]
+        return self._extra.get(slot, {}).get(option, '')
+
+    def type(self, item_id):
+        slot = self._slots.get(item_id)
+        return None if slot is None else _KINDS[self._kind[slot]]
+
+    def find_all(self):
+        """Item IDs in stacking order, bottom first."""
+        return tuple(self._ids[slot] for slot in self._order)
+
+    def items(self):
+        """Yields (item_id, kind, coords, options) for every item in stacking order, bottom first."""
+        for slot in self._order:
+            start = self._start[slot]
+            options = {'fill': self._fill[slot], 'outline': self._outline[slot], 'width': self._width[slot]}
+            options.update(self._extra.get(slot, {}))
+            yield (self._ids[slot], _KINDS[self._kind[slot]],
+                   self._coords[start:start + self._length[slot]].tolist(), options)
+
+    # --- Stacking and Deletion ---
+    def tag_lower(self, item_id):
+        """Moves an item to the bottom of the stacking order."""
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return
+        self._order.remove(slot)
+        self._order.insert(0, slot)
+
+    def delete(self, item_id):
+        """Deletes a single item, or everything when passed "all"."""
+        if item_id == "all":
+            self._clear()
+            return
+        slot = self._slots.pop(item_id, None)
+        if slot is None:
+            return
+        self._ids[slot] = 0
+        self._order.remove(slot)
+        self._extra.pop(slot, None)
+        self._garbage += self._length[slot]
+        self._length[slot] = 0
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        """Rebuilds the coordinate pool once more than half of it is unused."""
+        if self._garbage * 2 <= len(self._coords):
+            return
+        pool = array('d')
+        for slot in self._slots.values():
+            start = self._start[slot]
+            self._start[slot] = len(pool)
+            pool.extend(self._coords[start:start + self._length[slot]])
+        self._coords = pool
+        self._garbage = 0
+
+    # --- Widget Methods Used by the App ---
+    def cget(self, option):
+        if option in ('background', 'bg'):
+            return self.background
+        if option in ('width', 'height'):
+            return getattr(self, option)
+        return ''
+
+    def winfo_toplevel(self):
+        return self
+
+    def after(self, ms, func=None, *args):
+        """Records a callback; nothing runs until run_pending() is called."""
+        after_id = f"after#{self._next_after}"
+        self._next_after += 1
+        if func is not None:
+            self._after[after_id] = (func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        """Same as after(0, ...): runs at the next run_pending()."""
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self._after.pop(after_id, None)
+
+    def run_pending(self):
+        """Runs the callbacks scheduled so far (e.g. one animation frame); returns how many ran."""
+        pending, self._after = self._after, {}
+        for func, args in pending.values():
+            func(*args)
+        return len(pending)
@@ -0,0 +1,255 @@
+# placement.py
+"""
+Vectorised candidate sampling for the non-overlapping placement stage.
+
+Instead of drawing one candidate at a time and scanning for overlaps, candidate
+boxes are sampled as NumPy arrays in large pools and tested against every placed
+box with broadcast interval comparisons; the first free one wins. Each shape's
+first few candidates are tested one at a time (through the caller's spatial
+index) and whole blocks only once those are rejected, so sparse canvases, where
+the first candidate is usually free, don't pay for blocks they never needed.
+PlacementBudget (which needs no NumPy) decides how many candidates each shape gets.
+"""
+from collections import Counter
+import config
+import shapes_3d
+
+# NumPy is optional: without it build_scene falls back to one-at-a-time sampling
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+def numpy_generator(rng):
+    """Derives a numpy.random.Generator from a random.Random-compatible rng, so seeding stays deterministic."""
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+class PlacedBoxes:
+    """Bounding boxes (x1, y1, x2, y2) of placed shapes, stored as the columns of a growable NumPy array."""
+
+    def __init__(self, capacity=64):
+        # One row per coordinate, so each comparison in free_mask reads a contiguous row
+        self._columns = np.empty((4, capacity), dtype=np.float64)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, bounds):
+        if self._count == self._columns.shape[1]:
+            grown = np.empty((4, self._columns.shape[1] * 2), dtype=np.float64)
+            grown[:, :self._count] = self._columns[:, :self._count]
+            self._columns = grown
+        self._columns[:, self._count] = bounds
+        self._count += 1
+
+    def free_mask(self, candidates):
+        """
+        Returns a bool array: True where a candidate box (row of a (K, 4) array) overlaps no placed box.
+        Uses the same inclusive test as scene.check_overlap (touching edges count as overlapping).
+        """
+        if self._count == 0:
+            return np.ones(len(candidates), dtype=bool)
+        x1, y1, x2, y2 = self._columns[:, :self._count]
+        hit = candidates[:, 2, np.newaxis] >= x1
+        hit &= candidates[:, 0, np.newaxis] <= x2
+        hit &= candidates[:, 3, np.newaxis] >= y1
+        hit &= candidates[:, 1, np.newaxis] <= y2
+        return ~hit.any(axis=1)
+
+
+# --- Candidate Samplers ---
+# Each sampler returns (params, bounds): params rows are what the caller needs to build
+# the shape, bounds rows the (x1, y1, x2, y2) box to test. Rows that can't fit are dropped.
+
+def box_candidates(gen, count):
+    """Axis-aligned boxes (rectangles, ovals) inside the inner bounds. params rows are (x1, y1, x2, y2)."""
+    max_possible_size_x = min(config.MAX_SHAPE_SIZE, config.INNER_WIDTH)
+    max_possible_size_y = min(config.MAX_SHAPE_SIZE, config.INNER_HEIGHT)
+    if max_possible_size_x < config.MIN_SHAPE_SIZE or max_possible_size_y < config.MIN_SHAPE_SIZE:
+        empty = np.empty((0, 4), dtype=np.int64)
+        return empty, empty
+    size_x = gen.integers(config.MIN_SHAPE_SIZE, max_possible_size_x, size=count, endpoint=True)
+    size_y = gen.integers(config.MIN_SHAPE_SIZE, max_possible_size_y, size=count, endpoint=True)
+    x1 = gen.integers(config.INNER_X_MIN, config.INNER_X_MAX - size_x, endpoint=True)
+    y1 = gen.integers(config.INNER_Y_MIN, config.INNER_Y_MAX - size_y, endpoint=True)
+    bounds = np.column_stack((x1, y1, x1 + size_x, y1 + size_y))
+    return bounds, bounds
+
+def _centres(gen, min_cx, max_cx, min_cy, max_cy):
+    """Uniform centres within per-row ranges, plus a mask of rows whose range is non-empty."""
+    valid = (min_cx < max_cx) & (min_cy < max_cy)
+    center_x = min_cx + gen.random(len(min_cx)) * (max_cx - min_cx)
+    center_y = min_cy + gen.random(len(min_cy)) * (max_cy - min_cy)
+    return center_x, center_y, valid
+
+def cube_candidates(gen, count):
+    """Isometric cubes. params rows are (center_x, center_y, size)."""
+    size = gen.integers(config.MIN_CUBE_SIZE, config.MAX_CUBE_SIZE, size=count, endpoint=True).astype(np.float64)
+    offset_x = size * 0.866
+    center_x, center_y, valid = _centres(gen, config.INNER_X_MIN + offset_x, config.INNER_X_MAX - offset_x,
+                                         config.INNER_Y_MIN + size, config.INNER_Y_MAX - size)
+    params = np.column_stack((center_x, center_y, size))
+    bounds = np.column_stack((center_x - offset_x, center_y - size, center_x + offset_x, center_y + size))
+    return params[valid], bounds[valid]
+
+def pyramid_candidates(gen, count):
+    """Isometric pyramids. params rows are (center_x, center_y, base, height_factor)."""
+    base = gen.integers(config.MIN_PYRAMID_BASE, config.MAX_PYRAMID_BASE, size=count, endpoint=True).astype(np.float64)
+    height_factor = gen.uniform(config.MIN_PYRAMID_HEIGHT_FACTOR, config.MAX_PYRAMID_HEIGHT_FACTOR, size=count)
+    # Extents of each pyramid's drawn bounds around its centre
+    left, top, right, bottom = shapes_3d.isometric_pyramid_bounds(0.0, 0.0, base, height_factor)
+    center_x, center_y, valid = _centres(gen, config.INNER_X_MIN - left, config.INNER_X_MAX - right,
+                                         config.INNER_Y_MIN - top, config.INNER_Y_MAX - bottom)
+    params = np.column_stack((center_x, center_y, base, height_factor))
+    bounds = np.column_stack(shapes_3d.isometric_pyramid_bounds(center_x, center_y, base, height_factor))
+    return params[valid], bounds[valid]
+
+def prism_candidates(gen, count):
+    """Isometric prisms. params rows are (center_x, center_y, width, depth, height)."""
+    dims = gen.integers(config.MIN_PRISM_DIM, config.MAX_PRISM_DIM, size=(count, 3), endpoint=True).astype(np.float64)
+    width, depth, height = dims[:, 0], dims[:, 1], dims[:, 2]
+    half_w = (width + depth) * 0.866 / 2
+    half_h = (height + (width + depth) * 0.5) / 2
+    center_x, center_y, valid = _centres(gen, config.INNER_X_MIN + half_w, config.INNER_X_MAX - half_w,
+                                         config.INNER_Y_MIN + half_h, config.INNER_Y_MAX - half_h)
+    params = np.column_stack((center_x, center_y, width, depth, height))
+    bounds = np.column_stack((center_x - half_w, center_y - half_h, center_x + half_w, center_y + half_h))
+    return params[valid], bounds[valid]
+
+
+class CandidatePool:
+    """
+    Candidates of one shape type, sampled pool_size at a time and handed out in order.
+    Sampling a block costs about the same whatever its size, so one draw is shared by many shapes.
+    Each pool is also kept as lists, so single candidates can be tested without touching NumPy.
+    """
+
+    def __init__(self, sampler, gen, pool_size=config.PLACEMENT_POOL_SIZE):
+        self.sampler = sampler
+        self.gen = gen
+        self.pool_size = pool_size
+        self.params = self.bounds = np.empty((0, 4))
+        self.param_rows = self.bound_rows = []
+        self.next = 0
+
+    def take(self, count):
+        """
+        Hands out the next count candidates (fewer at the end of a pool, none if nothing fits) and returns
+        the (start, stop) range of them in the current pool's params/bounds arrays and row lists.
+        """
+        if self.next >= len(self.bound_rows):
+            self.params, self.bounds = self.sampler(self.gen, self.pool_size)
+            self.param_rows, self.bound_rows = self.params.tolist(), self.bounds.tolist()
+            self.next = 0
+        start = self.next
+        self.next = min(start + count, len(self.bound_rows))
+        return start, self.next
+
+    def put_back(self, start):
+        """Returns the candidates from row start on to the pool, so the next take() hands them out again."""
+        self.next = start
+
+
+def find_free_candidate(placed_boxes, pool, attempts=config.SHAPE_PLACEMENT_ATTEMPTS,
+                        batch_size=config.PLACEMENT_BATCH_SIZE, stats=None, overlaps=None,
+                        scalar_tries=config.PLACEMENT_SCALAR_TRIES):
+    """
+    Takes candidates from pool (a CandidatePool), up to `attempts` in total, and returns the params of the
+    first one that overlaps nothing in placed_boxes, as a list. Returns None if none fit.
+    stats: optional Counter that receives 'attempts' and 'rejections' (candidates up to the first free
+    one, as if tried one at a time), plus 'sampled' and 'overlap_checks' for the work actually done.
+    overlaps: optional overlaps(bounds, stats) that tests a single box against the placed shapes without
+    NumPy (e.g. through a spatial index), counting its own checks and rejection. The first scalar_tries
+    candidates are tested with it, as on a sparse canvas the first is usually free; blocks come after.
+    Either way the candidates are tried in pool order, and any taken past the free one are put back.
+    """
+    remaining = attempts
+    if overlaps is not None:
+        start, stop = pool.take(min(scalar_tries, remaining))
+        remaining -= (stop - start) or min(scalar_tries, remaining)
+        for row in range(start, stop):
+            if stats is not None:
+                stats['attempts'] += 1
+                stats['sampled'] += 1
+            if not overlaps(pool.bound_rows[row], stats if stats is not None else Counter()):
+                pool.put_back(row + 1)
+                return pool.param_rows[row]
+    while remaining > 0:
+        start, stop = pool.take(min(batch_size, remaining))
+        remaining -= (stop - start) or batch_size
+        free = np.flatnonzero(placed_boxes.free_mask(pool.bounds[start:stop])) if stop > start else ()
+        if stats is not None:
+            tested = int(free[0]) + 1 if len(free) else stop - start
+            stats['attempts'] += tested
+            stats['rejections'] += tested - (1 if len(free) else 0)
+            stats['sampled'] += stop - start
+            stats['overlap_checks'] += (stop - start) * len(placed_boxes)
+        if len(free):
+            # Candidates after the free one were never needed; later shapes get them
+            pool.put_back(start + int(free[0]) + 1)
+            return pool.param_rows[start + int(free[0])]
+    return None
+
+
+# --- Attempt Budgets ---
+class PlacementBudget:
+    """
+    The attempt budget for one shape type. Every shape starts with the full
+    SHAPE_PLACEMENT_ATTEMPTS; each shape that fails halves the budget of the next
+    (down to min_attempts) and each one placed doubles it back. After give_up_after
+    failures in a row the canvas is taken to be saturated for this shape type and the
+    rest of the requested shapes are skipped, so a full canvas costs a bounded number
+    of attempts instead of the whole budget for every remaining shape.
+    """
+
+    def __init__(self, stats, attempts=config.SHAPE_PLACEMENT_ATTEMPTS, min_attempts=config.MIN_PLACEMENT_ATTEMPTS,
+                 give_up_after=config.PLACEMENT_GIVE_UP_AFTER, adaptive=True, check_cancelled=None):
+        """
+        stats: the phase's Counter; receives 'skipped' (shapes never tried) and 'budget_cuts'. adaptive=False keeps the full budget.
+        check_cancelled: optional callable run before each shape (e.g. GenerationReport.check_cancelled) that raises to stop.
+        """
+        self.stats = stats
+        self.full = attempts
+        self.attempts = attempts
+        self.min_attempts = min(min_attempts, attempts)
+        self.give_up_after = give_up_after
+        self.adaptive = adaptive
+        self.failed_in_a_row = 0
+        self.check_cancelled = check_cancelled
+
+    @property
+    def saturated(self):
+        return self.adaptive and self.failed_in_a_row >= self.give_up_after
+
+    def record(self, placed):
+        """Adapts the budget to whether the last shape was placed."""
+        if not self.adaptive:
+            return
+        if placed:
+            self.failed_in_a_row = 0
+            self.attempts = min(self.full, self.attempts * 2)
+        else:
+            self.failed_in_a_row += 1
+            if self.attempts > self.min_attempts:
+                self.attempts = max(self.min_attempts, self.attempts // 2)
+                self.stats['budget_cuts'] += 1
+
+    def shapes(self, requested, placed_shapes):
+        """
+        Yields once per requested shape, recording whether the previous one was placed (placed_shapes is
+        the list that grows when a shape is placed). Stops early, counting the rest as skipped, once saturated.
+        """
+        for i in range(requested):
+            if self.check_cancelled:
+                self.check_cancelled()
+            if i:
+                self.record(len(placed_shapes) > placed_before)
+            if self.saturated:
+                self.stats['skipped'] += requested - i
+                return
+            placed_before = len(placed_shapes)
+            yield i
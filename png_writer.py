@@ -0,0 +1,36 @@
+# png_writer.py
+"""
+A minimal PNG encoder (zlib + struct only) for RGB pixel arrays.
+
+Writes 8-bit truecolour PNGs with no row filtering, which suits the flat colour
+regions the art is made of. The zlib level trades CPU time for file size:
+0 stores the data uncompressed, 1 is fastest, 9 is smallest.
+"""
+import struct
+import zlib
+import config
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _chunk(chunk_type, data):
+    """Builds one PNG chunk: length, type, data and the CRC over type + data."""
+    return (struct.pack('>I', len(data)) + chunk_type + data +
+            struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+def encode_png(pixels, compress_level=config.PNG_COMPRESS_LEVEL):
+    """Encodes a (height, width, 3) uint8 array (e.g. from raster_renderer) and returns the PNG bytes."""
+    height, width, channels = pixels.shape
+    if channels != 3:
+        raise ValueError(f"Expected RGB pixels (3 channels), got {channels}.")
+    raw = pixels.tobytes()
+    stride = width * 3
+    # Each scanline is prefixed with its filter type byte (0 = None)
+    scanlines = b''.join(b'\x00' + raw[y * stride:(y + 1) * stride] for y in range(height))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0) # 8-bit, truecolour, no interlace
+    return (_PNG_SIGNATURE + _chunk(b'IHDR', header) +
+            _chunk(b'IDAT', zlib.compress(scanlines, compress_level)) + _chunk(b'IEND', b''))
+
+def write_png(file_path, pixels, compress_level=config.PNG_COMPRESS_LEVEL):
+    """Writes a (height, width, 3) uint8 array to file_path as a PNG."""
+    with open(file_path, 'wb') as f:
+        f.write(encode_png(pixels, compress_level))
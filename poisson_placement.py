@@ -0,0 +1,93 @@
+# poisson_placement.py
+"""
+Blue-noise (Poisson-disc style) placement for dense packing.
+
+Rejection sampling draws candidates uniformly over the whole canvas, so once it
+fills up almost every attempt fails. PoissonPlacer instead grows the layout
+outwards from shapes already placed, as in Bridson's algorithm: it keeps an
+"active" list of placed shapes that may still have free space around them,
+tries a few candidate centres in a ring just outside a random active shape, and
+shrinks a candidate towards its minimum size before giving up on it. A shape
+whose neighbourhood yields nothing is retired from the active list, so each
+placement costs a bounded number of (grid-indexed) overlap checks.
+"""
+import math
+import config
+
+# Sizes tried for each candidate, as fractions of its randomly drawn size range (largest first)
+SHRINK_STEPS = (1.0, 0.5, 0.0)
+
+
+class PoissonPlacer:
+    """
+    Finds free spots for shapes given as footprint functions:
+        footprint(center_x, center_y, scale) -> (bounds, params)
+    where scale in [0, 1] picks a size between the shape's minimum and its randomly drawn
+    maximum, bounds is the (x1, y1, x2, y2) box to keep clear and params is what the
+    caller needs to build the shape.
+    """
+
+    def __init__(self, rng, is_free, candidates=config.POISSON_CANDIDATES, gap=config.POISSON_GAP):
+        """
+        rng: random.Random-compatible generator.
+        is_free(bounds, stats, outline): True if bounds overlaps nothing placed so far (counting its checks
+        in stats); outline is the candidate's exact outline, or None.
+        """
+        self.rng = rng
+        self.is_free = is_free
+        self.candidates = candidates
+        self.gap = gap
+        self.active = [] # (center_x, center_y, radius) of placed shapes that may have free space nearby
+
+    def _inside(self, bounds):
+        return (bounds[0] >= config.INNER_X_MIN and bounds[1] >= config.INNER_Y_MIN and
+                bounds[2] <= config.INNER_X_MAX and bounds[3] <= config.INNER_Y_MAX)
+
+    def _try_at(self, footprint, center_x, center_y, stats, outline):
+        """Tries the footprint at a centre, shrinking it until it fits. Returns (bounds, params) or None."""
+        top = self.rng.random()
+        for step in SHRINK_STEPS:
+            stats['attempts'] += 1
+            bounds, params = footprint(center_x, center_y, top * step)
+            if bounds is None or not self._inside(bounds):
+                stats['rejections'] += 1
+                continue
+            if self.is_free(bounds, stats, outline(bounds, params) if outline else None):
+                return bounds, params
+        return None
+
+    def _accept(self, found):
+        bounds, params = found
+        radius = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / 2
+        self.active.append(((bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2, radius))
+        return params
+
+    def find(self, footprint, stats, outline=None):
+        """
+        Returns the params of a free placement for footprint, or None once the canvas has no room left.
+        outline(bounds, params), if given, builds a candidate's exact outline for is_free.
+        """
+        rng = self.rng
+        min_reach = config.MIN_SHAPE_SIZE / 2 + self.gap
+        max_reach = config.MAX_SHAPE_SIZE / 2 + self.gap
+        while self.active:
+            index = rng.randrange(len(self.active))
+            center_x, center_y, radius = self.active[index]
+            for _ in range(self.candidates):
+                angle = rng.uniform(0, 2 * math.pi)
+                distance = radius + rng.uniform(min_reach, max_reach)
+                found = self._try_at(footprint, center_x + distance * math.cos(angle),
+                                     center_y + distance * math.sin(angle), stats, outline)
+                if found:
+                    return self._accept(found)
+            # Nothing fits around this shape any more
+            self.active[index] = self.active[-1]
+            self.active.pop()
+            stats['retired'] += 1
+        # No active shapes (first shape, or the layout has been exhausted): seed anywhere
+        for _ in range(self.candidates):
+            found = self._try_at(footprint, rng.uniform(config.INNER_X_MIN, config.INNER_X_MAX),
+                                 rng.uniform(config.INNER_Y_MIN, config.INNER_Y_MAX), stats, outline)
+            if found:
+                return self._accept(found)
+        return None
@@ -0,0 +1,128 @@
+# progressive_draw.py
+"""
+Time-sliced drawing of very large scenes.
+
+Even batched, creating tens of thousands of canvas items takes long enough to
+freeze the window. ProgressiveDraw spreads the work over the event loop
+instead: each slice creates items in chunks of PROGRESSIVE_CHUNK_SIZE (one
+TkBatch call each on a live canvas) until PROGRESSIVE_SLICE_MS has been used,
+then schedules the next slice with after_idle. Tk redraws the canvas and
+handles input between slices, so the partial picture shows straight away.
+
+Items go out in layer order: faint background, split background, border,
+shapes, dots and lines, then connections (each lowered to the bottom as it is
+created, as scene.draw_scene does). on_done receives the same shape ID list
+draw_scene returns.
+"""
+import itertools
+import time
+import tkinter as tk
+import config
+import scene as scene_model
+import tk_batch
+
+
+def layered_items(art_scene):
+    """Yields (item, role) for every item of art_scene in drawing order. role is a shape index for the
+    item whose ID represents an animatable shape, 'connection' for connecting lines, otherwise None."""
+    for item in art_scene.faint_background:
+        yield item, None
+    for item in art_scene.split_background:
+        yield item, None
+    if art_scene.border:
+        yield art_scene.border, None
+    for index, shape in enumerate(art_scene.shapes):
+        for position, item in enumerate(shape.items):
+            yield item, index if position == 0 and shape.animatable else None
+    for item in art_scene.dots:
+        yield item, None
+    for item in art_scene.lines:
+        yield item, None
+    for item in art_scene.connections:
+        yield item, 'connection'
+
+
+class ProgressiveDraw:
+    """
+    Draws art_scene onto canvas_obj a slice at a time from the event loop, then calls on_done(shape_ids)
+    (a list parallel to art_scene.shapes: each 2D shape's canvas ID, None for 3D shapes).
+    """
+
+    def __init__(self, canvas_obj, art_scene, on_done=None, slice_ms=config.PROGRESSIVE_SLICE_MS,
+                 chunk_size=config.PROGRESSIVE_CHUNK_SIZE, clock=time.perf_counter):
+        self.canvas = canvas_obj
+        self.on_done = on_done
+        self.slice = slice_ms / 1000
+        self.chunk_size = chunk_size
+        self.clock = clock
+        # A live tk.Canvas gets one Tcl call per chunk; anything else is drawn item by item
+        self.batch = tk_batch.TkBatch(canvas_obj, chunk_size) if getattr(canvas_obj, 'tk', None) is not None else None
+        self.shape_ids = [None] * len(art_scene.shapes)
+        self.total = len(art_scene)
+        self.drawn = 0
+        self.slices = 0
+        self.seconds = 0.0     # Time spent drawing, not counting the gaps between slices
+        self.after_id = None
+        self.done = False
+        self._items = layered_items(art_scene)
+
+    @property
+    def running(self):
+        return self.after_id is not None
+
+    def start(self):
+        """Draws the first slice now and schedules the rest."""
+        self._slice()
+
+    def cancel(self):
+        if self.after_id is not None:
+            try:
+                self.canvas.after_cancel(self.after_id)
+            except tk.TclError:
+                pass # Window already gone
+            self.after_id = None
+
+    def _slice(self):
+        self.after_id = None
+        start = self.clock()
+        deadline = start + self.slice
+        while True:
+            chunk = list(itertools.islice(self._items, self.chunk_size))
+            if chunk:
+                self._draw(chunk)
+            if len(chunk) < self.chunk_size:
+                self.done = True
+                break
+            if self.clock() >= deadline:
+                break
+        self.slices += 1
+        self.seconds += self.clock() - start
+
+        if self.done:
+            if self.on_done:
+                self.on_done(self.shape_ids)
+            return
+        try:
+            self.after_id = self.canvas.after_idle(self._slice)
+        except tk.TclError:
+            print("Window closed, stopping progressive drawing.")
+
+    def _draw(self, chunk):
+        if self.batch is None:
+            for item, role in chunk:
+                item_id = scene_model.draw_item(self.canvas, item)
+                if role == 'connection':
+                    self.canvas.tag_lower(item_id)
+                elif role is not None:
+                    self.shape_ids[role] = item_id
+        else:
+            positions = [(self.batch.add(item), role) for item, role in chunk]
+            ids = self.batch.flush()
+            self.batch.lower([position for position, role in positions if role == 'connection'])
+            for position, role in positions:
+                if role is not None and role != 'connection':
+                    self.shape_ids[role] = ids[position]
+        self.drawn += len(chunk)
+
+    def format(self):
+        return f"{self.drawn}/{self.total} items in {self.slices} slices ({self.seconds * 1000:.1f} ms drawing)"
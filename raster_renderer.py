@@ -0,0 +1,186 @@
+# raster_renderer.py
+"""
+A headless drawing backend that rasterises the art straight into an RGB NumPy array.
+
+RasterCanvas accepts the same calls the art generator makes on a tk.Canvas (it is an
+offscreen_canvas.OffscreenCanvas), and renders its items to pixels on demand.
+No display, Tk window, PostScript or Ghostscript is involved.
+"""
+import math
+import numpy as np
+import config # Needs canvas dimensions
+import colour_utils
+import scene
+from offscreen_canvas import OffscreenCanvas
+
+# --- Colour Handling ---
+# Items copied from a canvas carry Tk colour values (hex, black/white/grey and greyN names), parsed by
+# colour_utils; render_scene draws scene items from their (R, G, B) colours without any parsing
+parse_colour = colour_utils.parse_tk_colour
+
+
+# --- Pixel Helpers ---
+def _pixel_span(lo, hi, limit):
+    """Returns the (start, stop) pixel indices whose centres fall in [lo, hi), clipped to [0, limit)."""
+    start = max(0, int(math.ceil(lo - 0.5)))
+    stop = min(limit, int(math.ceil(hi - 0.5)))
+    return start, stop
+
+
+class RasterCanvas(OffscreenCanvas):
+    """
+    An offscreen_canvas.OffscreenCanvas that can also rasterise its items:
+    they are drawn in stacking order when render() is called.
+    """
+
+    # --- Rendering ---
+    def render(self):
+        """Rasterises the items and returns a (height, width, 3) uint8 array."""
+        pixels = self._blank()
+        for _, kind, coords, options in self.items():
+            # Tk's per-kind defaults for fill/outline were filled in when the item was created
+            self._draw(pixels, kind, coords, parse_colour(options['fill']), parse_colour(options['outline']), float(options['width']))
+        return pixels
+
+    def render_scene_items(self, items):
+        """Rasterises scene.SceneItems (bottom first) over the background, ignoring the canvas's own items."""
+        pixels = self._blank()
+        for item in items:
+            self._draw(pixels, item.kind, item.coords, item.fill, item.outline, float(item.width))
+        return pixels
+
+    def _blank(self):
+        pixels = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        pixels[:, :] = parse_colour(self.background) or (255, 255, 255)
+        return pixels
+
+    def _draw(self, pixels, kind, coords, fill, outline, width):
+        """Draws one item; fill and outline are (R, G, B) tuples or None."""
+        if kind == 'rectangle':
+            self._draw_rectangle(pixels, coords, fill, outline, width)
+        elif kind == 'oval':
+            self._draw_oval(pixels, coords, fill, outline, width)
+        elif kind == 'polygon':
+            self._draw_polygon(pixels, coords, fill, outline, width)
+        elif kind == 'line':
+            self._draw_polyline(pixels, coords, fill, width)
+
+    def _fill_box(self, pixels, x1, y1, x2, y2, rgb):
+        """Fills every pixel whose centre lies inside the box."""
+        px1, px2 = _pixel_span(x1, x2, self.width)
+        py1, py2 = _pixel_span(y1, y2, self.height)
+        if px1 < px2 and py1 < py2:
+            pixels[py1:py2, px1:px2] = rgb
+
+    def _grid(self, x1, y1, x2, y2):
+        """Returns (slices, xs, ys) for the pixel centres inside a bounding box, or None if it's off-canvas."""
+        px1, px2 = _pixel_span(x1, x2, self.width)
+        py1, py2 = _pixel_span(y1, y2, self.height)
+        if px1 >= px2 or py1 >= py2:
+            return None
+        xs = np.arange(px1, px2, dtype=np.float64)[np.newaxis, :] + 0.5
+        ys = np.arange(py1, py2, dtype=np.float64)[:, np.newaxis] + 0.5
+        return (slice(py1, py2), slice(px1, px2)), xs, ys
+
+    def _draw_rectangle(self, pixels, coords, fill, outline, width):
+        if len(coords) < 4: return
+        x1, x2 = sorted((coords[0], coords[2]))
+        y1, y2 = sorted((coords[1], coords[3]))
+        if fill:
+            self._fill_box(pixels, x1, y1, x2, y2, fill)
+        if outline and width > 0:
+            half = width / 2
+            self._fill_box(pixels, x1 - half, y1 - half, x2 + half, y1 + half, outline) # Top
+            self._fill_box(pixels, x1 - half, y2 - half, x2 + half, y2 + half, outline) # Bottom
+            self._fill_box(pixels, x1 - half, y1 + half, x1 + half, y2 - half, outline) # Left
+            self._fill_box(pixels, x2 - half, y1 + half, x2 + half, y2 - half, outline) # Right
+
+    def _draw_oval(self, pixels, coords, fill, outline, width):
+        if len(coords) < 4: return
+        x1, x2 = sorted((coords[0], coords[2]))
+        y1, y2 = sorted((coords[1], coords[3]))
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = (x2 - x1) / 2, (y2 - y1) / 2
+        half = width / 2 if outline and width > 0 else 0
+        grid = self._grid(x1 - half, y1 - half, x2 + half, y2 + half)
+        if grid is None: return
+        region, xs, ys = grid
+        dx, dy = xs - cx, ys - cy
+
+        def inside(rad_x, rad_y):
+            if rad_x <= 0 or rad_y <= 0:
+                return np.zeros((ys.shape[0], xs.shape[1]), dtype=bool)
+            return (dx / rad_x) ** 2 + (dy / rad_y) ** 2 <= 1.0
+
+        if fill:
+            pixels[region][inside(rx, ry)] = fill
+        if half:
+            ring = inside(rx + half, ry + half) & ~inside(rx - half, ry - half)
+            pixels[region][ring] = outline
+
+    def _draw_polygon(self, pixels, coords, fill, outline, width):
+        if len(coords) < 6: return
+        xs_poly, ys_poly = coords[0::2], coords[1::2]
+        if fill:
+            grid = self._grid(min(xs_poly), min(ys_poly), max(xs_poly), max(ys_poly))
+            if grid is not None:
+                region, xs, ys = grid
+                # Even-odd rule: count edge crossings of a ray cast to the right of each pixel centre
+                mask = np.zeros((ys.shape[0], xs.shape[1]), dtype=bool)
+                count = len(xs_poly)
+                for i in range(count):
+                    ax, ay = xs_poly[i], ys_poly[i]
+                    bx, by = xs_poly[(i + 1) % count], ys_poly[(i + 1) % count]
+                    if ay == by: continue
+                    spans = (ys >= min(ay, by)) & (ys < max(ay, by))
+                    cross_x = ax + (ys - ay) * (bx - ax) / (by - ay)
+                    mask ^= spans & (xs < cross_x)
+                pixels[region][mask] = fill
+        if outline and width > 0:
+            self._draw_polyline(pixels, coords + coords[:2], outline, width)
+
+    def _draw_polyline(self, pixels, coords, colour, width):
+        if not colour or len(coords) < 4: return
+        # Thin lines are widened just enough that diagonal runs stay connected
+        half = max(width / 2, 0.71)
+        for i in range(0, len(coords) - 2, 2):
+            self._draw_segment(pixels, coords[i], coords[i + 1], coords[i + 2], coords[i + 3], colour, half)
+
+    def _draw_segment(self, pixels, ax, ay, bx, by, colour, half):
+        grid = self._grid(min(ax, bx) - half, min(ay, by) - half, max(ax, bx) + half, max(ay, by) + half)
+        if grid is None: return
+        region, xs, ys = grid
+        seg_x, seg_y = bx - ax, by - ay
+        length_sq = seg_x * seg_x + seg_y * seg_y
+        if length_sq == 0:
+            mask = (xs - ax) ** 2 + (ys - ay) ** 2 <= half * half
+        else:
+            # Butt caps: keep points whose projection lands on the segment and lie within half the width
+            t = ((xs - ax) * seg_x + (ys - ay) * seg_y) / length_sq
+            dist = np.abs((xs - ax) * seg_y - (ys - ay) * seg_x) / math.sqrt(length_sq)
+            mask = (t >= 0) & (t <= 1) & (dist <= half)
+        pixels[region][mask] = colour
+
+
+def snapshot_canvas(canvas_obj, width=config.CANVAS_WIDTH, height=config.CANVAS_HEIGHT):
+    """
+    Copies the items currently on a tk.Canvas (in stacking order, with their current
+    coordinates and colours) into a new RasterCanvas, e.g. to export a frame of the animation.
+    """
+    raster = RasterCanvas(width, height, canvas_obj.cget('background'))
+    for item_id in canvas_obj.find_all():
+        kind = canvas_obj.type(item_id)
+        if kind not in ('rectangle', 'oval', 'polygon', 'line'):
+            continue
+        options = {'fill': canvas_obj.itemcget(item_id, 'fill'), 'width': canvas_obj.itemcget(item_id, 'width') or 1}
+        if kind != 'line':
+            options['outline'] = canvas_obj.itemcget(item_id, 'outline')
+        getattr(raster, f'create_{kind}')(canvas_obj.coords(item_id), **options)
+    return raster
+
+def render_scene(art_scene):
+    """
+    Rasterises a scene.Scene straight from its items, in the stacking order draw_scene gives them,
+    and returns the (height, width, 3) pixel array.
+    """
+    return RasterCanvas(art_scene.width, art_scene.height).render_scene_items(scene.stacking_order(art_scene))
@@ -0,0 +1,169 @@
+# rect_packing.py
+"""
+Free-rectangle ("maximal rectangles") bin packing for the placement stage.
+
+Instead of sampling positions and testing them for overlaps, FreeRectPacker keeps
+an explicit list of the maximal empty rectangles left on the canvas. Finding a
+spot for a box is a single scan of that list: any free rectangle at least as big
+as the box can hold it, one is picked at random and the box is dropped at a random
+position inside it. Occupying a box splits every free rectangle it cuts into the
+(up to four) maximal pieces around it, so no placement attempt is ever wasted.
+Only the rectangles touching the occupied box take part in a split, so occupying
+never copies or prunes the whole list.
+"""
+import config
+
+# NumPy is optional: it keeps the free list as arrays, otherwise plain lists are used
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+class FreeRectPacker:
+    """Tracks the free space of an area as a list of maximal (x1, y1, x2, y2) rectangles."""
+
+    def __init__(self, rng, area=None, gap=config.PACKING_GAP, min_size=1):
+        """
+        rng: random.Random-compatible generator.
+        area: (x1, y1, x2, y2) to pack into (defaults to the inner canvas area).
+        gap: pixels kept clear around every occupied box.
+        min_size: free rectangles narrower or shorter than this are dropped, as nothing fits in them.
+        """
+        self.rng = rng
+        self.gap = gap
+        self.min_size = min_size
+        area = area or (config.INNER_X_MIN, config.INNER_Y_MIN, config.INNER_X_MAX, config.INNER_Y_MAX)
+        if _HAS_NUMPY:
+            # One column per free rectangle: x1, y1, x2, y2, width, height rows (columns past _count are spare capacity)
+            self._columns = np.empty((6, 64), dtype=np.float64)
+            self._count = 0
+            self._add(np.array([area], dtype=np.float64))
+        else:
+            self._free = [tuple(area)]
+
+    def __len__(self):
+        return self._count if _HAS_NUMPY else len(self._free)
+
+    @property
+    def free(self):
+        """The free rectangles, as a list of (x1, y1, x2, y2) tuples."""
+        if _HAS_NUMPY:
+            return [tuple(r) for r in self._columns[:4, :self._count].T.tolist()]
+        return list(self._free)
+
+    def _fitting(self, width, height):
+        """The free rectangles that can hold a width x height box (column indices with NumPy)."""
+        if _HAS_NUMPY:
+            count = self._count
+            return np.flatnonzero((self._columns[4, :count] >= width) & (self._columns[5, :count] >= height))
+        return [r for r in self._free if r[2] - r[0] >= width and r[3] - r[1] >= height]
+
+    def find(self, width, height, stats, min_width=None, min_height=None):
+        """
+        Returns (x1, y1, width, height) of a free spot for a width x height box, or None if there is none.
+        If min_width/min_height are given and the full size fits nowhere, the box is shrunk to fit a
+        free rectangle that can hold the minimum size instead.
+        """
+        stats['attempts'] += 1
+        stats['free_rects_scanned'] += len(self)
+        fits = self._fitting(width, height)
+        if not len(fits) and min_width is not None:
+            fits = self._fitting(min_width, min_height)
+            if len(fits):
+                stats['shrunk'] += 1
+        if not len(fits):
+            stats['rejections'] += 1
+            return None
+        chosen = fits[self.rng.randrange(len(fits))]
+        if _HAS_NUMPY:
+            chosen = self._columns[:4, chosen].tolist()
+        x1, y1, x2, y2 = (float(v) for v in chosen)
+        width = min(width, x2 - x1); height = min(height, y2 - y1)
+        return self.rng.uniform(x1, x2 - width), self.rng.uniform(y1, y2 - height), width, height
+
+    def occupy(self, bounds):
+        """Removes bounds (plus the gap around it) from the free space."""
+        used = (bounds[0] - self.gap, bounds[1] - self.gap, bounds[2] + self.gap, bounds[3] + self.gap)
+        ux1, uy1, ux2, uy2 = used
+        if not _HAS_NUMPY:
+            cut = [r for r in self._free if ux1 < r[2] and ux2 > r[0] and uy1 < r[3] and uy2 > r[1]]
+            if cut:
+                kept = [r for r in self._free if not (ux1 < r[2] and ux2 > r[0] and uy1 < r[3] and uy2 > r[1])]
+                self._free = kept + _split(cut, [r for r in kept if _touches(r, used)], used, self.min_size)
+            return
+        # Only rectangles touching the used box are cut by it or can contain one of its pieces
+        count = self._count
+        x1, y1, x2, y2 = self._columns[:4, :count]
+        touching = np.flatnonzero((x1 <= ux2) & (x2 >= ux1) & (y1 <= uy2) & (y2 >= uy1))
+        cut, neighbours, gone = [], [], []
+        for index, r in zip(touching.tolist(), self._columns[:4, touching].T.tolist()):
+            if ux1 < r[2] and ux2 > r[0] and uy1 < r[3] and uy2 > r[1]:
+                cut.append(r); gone.append(index)
+            else:
+                neighbours.append(r)
+        if not cut:
+            return
+        pieces = _split(cut, neighbours, used, self.min_size)
+        self._remove(gone)
+        if pieces:
+            self._add(np.array(pieces, dtype=np.float64))
+
+    def _add(self, rects):
+        """Appends the rows of a (K, 4) array to the free columns, growing them as needed."""
+        count = self._count
+        needed = count + len(rects)
+        if needed > self._columns.shape[1]:
+            grown = np.empty((6, max(needed, 2 * self._columns.shape[1])), dtype=np.float64)
+            grown[:, :count] = self._columns[:, :count]
+            self._columns = grown
+        self._columns[:4, count:needed] = rects.T
+        self._columns[4, count:needed] = rects[:, 2] - rects[:, 0]
+        self._columns[5, count:needed] = rects[:, 3] - rects[:, 1]
+        self._count = needed
+
+    def _remove(self, indices):
+        """Removes the given free columns, moving the last one into each gap (highest index first)."""
+        for i in sorted(indices, reverse=True):
+            self._count -= 1
+            self._columns[:, i] = self._columns[:, self._count]
+
+
+# --- Splitting ---
+# Every free rectangle the used box cuts is replaced by the maximal pieces left of, right of, above
+# and below it. Untouched rectangles were already maximal, so only the new pieces can be redundant:
+# a piece is dropped if another free rectangle contains it (the first of two equal pieces is kept).
+# Each piece shares an edge with the used box, so an untouched rectangle can only contain it if it
+# touches the used box too, and a piece can only contain pieces cut on the same side of the box
+# (a left piece reaches past the used box's top and bottom edges, which no top or bottom piece
+# does, and stops at its left edge, where every right piece starts). So each piece is only tested
+# against a few others rather than the whole free list.
+
+def _contains(outer, inner):
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+def _touches(r, used):
+    return r[0] <= used[2] and r[2] >= used[0] and r[1] <= used[3] and r[3] >= used[1]
+
+def _split(cut, neighbours, used, min_size):
+    """The maximal pieces left when used is cut out of the rectangles in cut, minus those another piece or a neighbour contains."""
+    ux1, uy1, ux2, uy2 = used
+    sides = ([], [], [], [])
+    for fx1, fy1, fx2, fy2 in cut:
+        if ux1 > fx1: sides[0].append((fx1, fy1, ux1, fy2))
+        if ux2 < fx2: sides[1].append((ux2, fy1, fx2, fy2))
+        if uy1 > fy1: sides[2].append((fx1, fy1, fx2, uy1))
+        if uy2 < fy2: sides[3].append((fx1, uy2, fx2, fy2))
+    survivors = []
+    for pieces in sides:
+        pieces = [p for p in pieces if p[2] - p[0] >= min_size and p[3] - p[1] >= min_size]
+        for i, p in enumerate(pieces):
+            px1, py1, px2, py2 = p
+            for j, q in enumerate(pieces):
+                if j != i and q[0] <= px1 and q[1] <= py1 and q[2] >= px2 and q[3] >= py2 and (q != p or j < i):
+                    break
+            else:
+                if not any(_contains(q, p) for q in neighbours):
+                    survivors.append(p)
+    return survivors
@@ -0,0 +1,744 @@
+# scene.py
+"""
+Scene description for one piece of art, independent of any drawing backend.
+
+build_scene() does all the random sampling and non-overlapping placement once and
+records the result; draw_scene() replays it onto anything with the tk.Canvas
+create_* API (a live tk.Canvas, a raster_renderer.RasterCanvas, ...). The same
+scene can be drawn any number of times without redoing the placement work.
+"""
+import random
+import math
+import config
+import shapes_3d
+import colour_utils
+import spatial_index
+import placement
+import poisson_placement
+import rect_packing
+import collision
+import tk_batch
+import instrumentation
+
+# The current_config keys build_scene reads (anything else in current_config is ignored)
+COUNT_KEYS = ("NUM_RANDOM_RECTANGLES", "NUM_RANDOM_CIRCLES", "NUM_RANDOM_POLYGONS", "NUM_RANDOM_CUBES",
+              "NUM_RANDOM_PYRAMIDS", "NUM_RANDOM_PRISMS", "NUM_RANDOM_DOTS", "NUM_RANDOM_LINES",
+              "NUM_CONNECTIONS", "NUM_ANIMATED_SHAPES")
+CONFIG_KEYS = COUNT_KEYS + ("PLACEMENT_MODE", "EXACT_OVERLAP_TESTS", "VECTORISED_PLACEMENT", "PLACEMENT_SCALAR_TRIES",
+                             "ADAPTIVE_PLACEMENT_BUDGET")
+PLACEMENT_MODES = ("random", "poisson", "packing")
+
+# --- Scene Records ---
+class SceneItem:
+    """
+    A single drawable primitive: a 'rectangle', 'oval', 'polygon' or 'line' with flat coords.
+    fill and outline are (R, G, B) tuples, or None for not drawn; they become Tk/SVG colour strings when drawn.
+    """
+    __slots__ = ('kind', 'coords', 'fill', 'outline', 'width')
+
+    def __init__(self, kind, coords, fill=None, outline=None, width=1):
+        self.kind = kind
+        self.coords = coords
+        self.fill = fill
+        self.outline = outline
+        self.width = width
+
+    def __repr__(self):
+        return f"SceneItem({self.kind!r}, {self.coords!r}, fill={self.fill!r}, outline={self.outline!r}, width={self.width!r})"
+
+
+class PlacedShape:
+    """
+    A shape placed by the non-overlapping placement stage.
+    'items' holds what gets drawn: one item for 2D shapes, one polygon per face for 3D shapes.
+    fill and outline are the shape's (R, G, B) base colours.
+    'silhouette' is the collision.Outline it covers, when placement uses exact overlap tests.
+    """
+    __slots__ = ('type', 'bounds', 'center', 'fill', 'outline', 'items', 'silhouette')
+
+    def __init__(self, shape_type, bounds, center, fill, outline, items, silhouette=None):
+        self.type = shape_type
+        self.bounds = bounds
+        self.center = center
+        self.fill = fill
+        self.outline = outline
+        self.items = items
+        self.silhouette = silhouette
+
+    @property
+    def animatable(self):
+        """Only single-item (2D) shapes have one canvas ID that can be moved and recoloured."""
+        return len(self.items) == 1
+
+    def __repr__(self):
+        return f"PlacedShape({self.type!r}, bounds={self.bounds!r}, fill={self.fill!r})"
+
+
+class Scene:
+    """Everything needed to draw one piece of art, in drawing (layer) order."""
+    __slots__ = ('seed', 'width', 'height', 'faint_background', 'split_background', 'border',
+                 'shapes', 'dots', 'lines', 'animated', 'connections')
+
+    def __init__(self, width=config.CANVAS_WIDTH, height=config.CANVAS_HEIGHT, seed=None):
+        self.seed = seed           # Seed the scene was generated from, if known
+        self.width = width
+        self.height = height
+        self.faint_background = [] # SceneItems
+        self.split_background = [] # SceneItems
+        self.border = None         # SceneItem
+        self.shapes = []           # PlacedShapes
+        self.dots = []             # SceneItems
+        self.lines = []            # SceneItems
+        self.animated = []         # Indices into shapes selected for animation
+        self.connections = []      # SceneItems, drawn underneath everything else
+
+    def __len__(self):
+        """Total number of canvas items the scene draws."""
+        return (len(self.faint_background) + len(self.split_background) + (1 if self.border else 0) +
+                sum(len(shape.items) for shape in self.shapes) +
+                len(self.dots) + len(self.lines) + len(self.connections))
+
+
+# --- Geometry Helpers ---
+def make_rng(seed_or_rng=None):
+    """
+    Returns a random.Random-compatible generator for scene generation:
+    - None: the global random module (unseeded, shared state)
+    - an int/str/bytes seed: a new random.Random(seed)
+    - a numpy.random.Generator: a random.Random seeded from one draw of it
+    - anything else (e.g. a random.Random) is used as-is
+    """
+    if seed_or_rng is None:
+        return random
+    if isinstance(seed_or_rng, (int, str, bytes)):
+        return random.Random(seed_or_rng)
+    if hasattr(seed_or_rng, 'integers') and not hasattr(seed_or_rng, 'randint'):
+        return random.Random(int(seed_or_rng.integers(0, 2**63)))
+    return seed_or_rng
+
+def generate_random_polygon_points(center_x, center_y, avg_radius, irregularity, spikeyness, num_vertices, rng=None):
+    """Generates points for a random polygon, respecting inner bounds."""
+    rng = rng or random
+    points = []
+    angle_step = 2 * math.pi / num_vertices
+    for i in range(num_vertices):
+        angle = i * angle_step
+        radius = rng.gauss(avg_radius, avg_radius * irregularity)
+        radius = max(config.MIN_SHAPE_SIZE / 2, radius)
+        angle += rng.gauss(0, angle_step * spikeyness * 0.5)
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        x = max(config.INNER_X_MIN, min(config.INNER_X_MAX, x))
+        y = max(config.INNER_Y_MIN, min(config.INNER_Y_MAX, y))
+        points.extend([x, y])
+    return points
+
+def check_overlap(box1, box2):
+    """Checks if two bounding boxes (x1, y1, x2, y2) overlap."""
+    if not box1 or len(box1) != 4 or not box2 or len(box2) != 4:
+        return False
+    if box1[0] > box1[2] or box1[1] > box1[3] or box2[0] > box2[2] or box2[1] > box2[3]:
+        return False
+    if box1[2] < box2[0] or box1[0] > box2[2] or box1[3] < box2[1] or box1[1] > box2[3]:
+        return False
+    return True
+
+def get_polygon_bounds(points):
+    """Calculates the bounding box (x1, y1, x2, y2) for a list of polygon points."""
+    if not points or len(points) < 2: return (0, 0, 0, 0)
+    x_coords = points[0::2]
+    y_coords = points[1::2]
+    if not x_coords or not y_coords: return (0,0,0,0)
+    return (min(x_coords), min(y_coords), max(x_coords), max(y_coords))
+
+def _face_items(faces):
+    """Converts shapes_3d (points, fill) faces to polygon SceneItems."""
+    return [SceneItem('polygon', [c for point in face_points for c in point], fill=face_color,
+                      outline=shapes_3d.OUTLINE_COLOR, width=shapes_3d.OUTLINE_WIDTH)
+            for face_points, face_color in faces]
+
+
+# --- Scene Generation ---
+def build_scene(current_config=None, verbose=True, rng=None, report=None):
+    """
+    Samples and places every element of a new piece of art. Returns a Scene; nothing is drawn.
+    rng is a seed or generator (see make_rng); the same seed always gives the same scene.
+    Pass verbose=False to silence the per-shape-type progress messages (e.g. in batch runs).
+    Pass an instrumentation.GenerationReport as report to collect per-phase timings and counters.
+    """
+    report = report or instrumentation.GenerationReport()
+    with report.profiling():
+        return _build_scene(current_config or {}, verbose, rng, report)
+
+def _build_scene(current_config, verbose, rng, report):
+    log = print if verbose else (lambda *args, **kwargs: None)
+    seed = rng if isinstance(rng, (int, str, bytes)) else None
+    rng = make_rng(rng)
+    scene = Scene(config.CANVAS_WIDTH, config.CANVAS_HEIGHT, seed=seed)
+    report.seed = seed
+    placed_shapes_index = spatial_index.SpatialGrid()
+
+    # "random" rejection-samples each shape; "poisson" packs shapes around those already placed;
+    # "packing" drops rectangles, circles and the 3D shapes into tracked free rectangles (polygons stay random)
+    placement_mode = current_config.get("PLACEMENT_MODE", config.PLACEMENT_MODE)
+    if placement_mode not in PLACEMENT_MODES:
+        raise ValueError(f"Unknown PLACEMENT_MODE '{placement_mode}' (expected 'random', 'poisson' or 'packing').")
+    poisson = placement_mode == "poisson"
+    packing = placement_mode == "packing"
+    # In "random" mode rectangles, circles and the 3D shapes can sample whole blocks of candidates with NumPy
+    # Exact tests compare the shapes' real outlines once their bounding boxes overlap (NumPy blocks only test boxes)
+    exact = current_config.get("EXACT_OVERLAP_TESTS", config.EXACT_OVERLAP_TESTS)
+    vectorised = (placement_mode == "random" and not exact and placement._HAS_NUMPY and
+                  current_config.get("VECTORISED_PLACEMENT", config.VECTORISED_PLACEMENT))
+    if vectorised:
+        gen = placement.numpy_generator(rng)
+        placed_boxes = placement.PlacedBoxes()
+        scalar_tries = current_config.get("PLACEMENT_SCALAR_TRIES", config.PLACEMENT_SCALAR_TRIES)
+        # One candidate pool per shape type; each only samples once its phase takes from it
+        rectangle_pool = placement.CandidatePool(placement.box_candidates, gen)
+        circle_pool = placement.CandidatePool(placement.box_candidates, gen)
+        cube_pool = placement.CandidatePool(placement.cube_candidates, gen)
+        pyramid_pool = placement.CandidatePool(placement.pyramid_candidates, gen)
+        prism_pool = placement.CandidatePool(placement.prism_candidates, gen)
+    # Each shape type gets a PlacementBudget that cuts attempts as it starts failing and stops once it is saturated
+    adaptive = current_config.get("ADAPTIVE_PLACEMENT_BUDGET", config.ADAPTIVE_PLACEMENT_BUDGET)
+
+    def log_placed(placed, name, stats):
+        log(f"Successfully placed {placed} {name}.")
+        if stats['skipped']:
+            log(f"Skipped the last {stats['skipped']} {name}: the canvas is saturated.")
+
+    def place(shape):
+        if exact:
+            shape.silhouette = collision.shape_outline(shape)
+        scene.shapes.append(shape)
+        placed_shapes_index.insert(shape, shape.bounds)
+        if vectorised:
+            placed_boxes.add(shape.bounds)
+        if packing:
+            packer.occupy(shape.bounds)
+
+    def overlaps_placed(bounds, stats, outline=None):
+        """
+        Tests bounds against the nearby placed shapes, counting the checks (and the rejection) in stats.
+        With an outline (a collision.Outline, given when exact tests are on) boxes that overlap are only a
+        candidate hit, confirmed by testing the outlines themselves; its bounds replace bounds.
+        """
+        if outline is not None:
+            bounds = outline.bounds
+        for s in placed_shapes_index.query(bounds):
+            stats['overlap_checks'] += 1
+            if check_overlap(bounds, s.bounds):
+                if outline is not None and s.silhouette is not None:
+                    stats['exact_checks'] += 1
+                    if not collision.outlines_overlap(outline, s.silhouette):
+                        continue
+                stats['rejections'] += 1
+                return True
+        return False
+
+    if poisson:
+        placer = poisson_placement.PoissonPlacer(rng, lambda bounds, stats, outline: not overlaps_placed(bounds, stats, outline))
+    if packing:
+        packer = rect_packing.FreeRectPacker(rng, min_size=min(config.MIN_SHAPE_SIZE, config.MIN_PRISM_DIM))
+
+    def pack_at_origin(origin_bounds, stats):
+        """Finds a free spot for a shape whose bounds are origin_bounds when centred on (0, 0); returns its centre or None."""
+        found = packer.find(origin_bounds[2] - origin_bounds[0], origin_bounds[3] - origin_bounds[1], stats)
+        if not found: return None
+        return found[0] - origin_bounds[0], found[1] - origin_bounds[1]
+
+    # --- Candidate Outlines for Exact Overlap Tests ---
+    # Each returns the collision.Outline of a candidate, or None when exact tests are off
+    def box_outline(bounds, params=None):
+        return collision.box_outline(bounds) if exact else None
+
+    def oval_outline(bounds, params=None):
+        return collision.oval_outline(bounds) if exact else None
+
+    def polygon_outline(bounds, params):
+        return collision.flat_outline(params[0]) if exact else None
+
+    # The face colour doesn't change the outline, so candidates are shaded with a fixed one
+    def cube_outline(bounds, params):
+        return collision.faces_outline(shapes_3d.isometric_cube_faces(*params, shapes_3d.OUTLINE_COLOR)[0]) if exact else None
+
+    def pyramid_outline(bounds, params):
+        return collision.faces_outline(shapes_3d.isometric_pyramid_faces(*params, shapes_3d.OUTLINE_COLOR)[0]) if exact else None
+
+    def prism_outline(bounds, params):
+        return collision.faces_outline(shapes_3d.isometric_prism_faces(*params, shapes_3d.OUTLINE_COLOR)[0]) if exact else None
+
+    # --- Footprints for "poisson" Mode ---
+    # footprint(center_x, center_y, scale) -> (bounds, params): scale 0 is the smallest size, 1 the largest
+    def box_footprint(center_x, center_y, scale):
+        max_possible_size_x = min(config.MAX_SHAPE_SIZE, config.INNER_WIDTH)
+        max_possible_size_y = min(config.MAX_SHAPE_SIZE, config.INNER_HEIGHT)
+        if max_possible_size_x < config.MIN_SHAPE_SIZE or max_possible_size_y < config.MIN_SHAPE_SIZE: return None, None
+        size_x = round(config.MIN_SHAPE_SIZE + scale * (max_possible_size_x - config.MIN_SHAPE_SIZE) * rng.uniform(0.5, 1))
+        size_y = round(config.MIN_SHAPE_SIZE + scale * (max_possible_size_y - config.MIN_SHAPE_SIZE) * rng.uniform(0.5, 1))
+        x1 = round(center_x - size_x / 2); y1 = round(center_y - size_y / 2)
+        bounds = (x1, y1, x1 + size_x, y1 + size_y)
+        return bounds, bounds
+
+    def polygon_footprint(center_x, center_y, scale):
+        avg_radius = config.MIN_SHAPE_SIZE / 2 + scale * (config.MAX_SHAPE_SIZE - config.MIN_SHAPE_SIZE) / 2
+        irregularity = rng.uniform(0.1, 0.5); spikeyness = rng.uniform(0.1, 0.6)
+        num_vertices = rng.randint(config.MIN_POLYGON_VERTICES, config.MAX_POLYGON_VERTICES)
+        points = generate_random_polygon_points(center_x, center_y, avg_radius, irregularity, spikeyness, num_vertices, rng)
+        bounds = get_polygon_bounds(points)
+        return bounds, (points, bounds)
+
+    def cube_footprint(center_x, center_y, scale):
+        cube_size = config.MIN_CUBE_SIZE + scale * (config.MAX_CUBE_SIZE - config.MIN_CUBE_SIZE)
+        offset_x = cube_size * 0.866
+        return (center_x - offset_x, center_y - cube_size, center_x + offset_x, center_y + cube_size), (center_x, center_y, cube_size)
+
+    def pyramid_footprint(center_x, center_y, scale):
+        pyramid_base = config.MIN_PYRAMID_BASE + scale * (config.MAX_PYRAMID_BASE - config.MIN_PYRAMID_BASE)
+        pyramid_height_factor = rng.uniform(config.MIN_PYRAMID_HEIGHT_FACTOR, config.MAX_PYRAMID_HEIGHT_FACTOR)
+        bounds = shapes_3d.isometric_pyramid_bounds(center_x, center_y, pyramid_base, pyramid_height_factor)
+        return bounds, (center_x, center_y, pyramid_base, pyramid_height_factor)
+
+    def prism_footprint(center_x, center_y, scale):
+        prism_w, prism_d, prism_h = (config.MIN_PRISM_DIM + scale * (config.MAX_PRISM_DIM - config.MIN_PRISM_DIM) * rng.uniform(0.5, 1)
+                                     for _ in range(3))
+        est_width = (prism_w + prism_d) * 0.866; est_height = prism_h + (prism_w + prism_d) * 0.5
+        bounds = (center_x - est_width / 2, center_y - est_height / 2, center_x + est_width / 2, center_y + est_height / 2)
+        return bounds, (center_x, center_y, prism_w, prism_d, prism_h)
+
+    # --- Free Rectangles for "packing" Mode ---
+    def pack_box(stats):
+        """A free (x1, y1, x2, y2) box for a rectangle or circle, shrunk towards MIN_SHAPE_SIZE if space is short."""
+        max_possible_size_x = min(config.MAX_SHAPE_SIZE, config.INNER_WIDTH)
+        max_possible_size_y = min(config.MAX_SHAPE_SIZE, config.INNER_HEIGHT)
+        if max_possible_size_x < config.MIN_SHAPE_SIZE or max_possible_size_y < config.MIN_SHAPE_SIZE: return None
+        found = packer.find(rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_x),
+                            rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_y), stats,
+                            min_width=config.MIN_SHAPE_SIZE, min_height=config.MIN_SHAPE_SIZE)
+        if not found: return None
+        x1, y1, size_x, size_y = found
+        # Round inwards so the box stays inside the free rectangle it was given
+        return math.ceil(x1), math.ceil(y1), math.floor(x1 + size_x), math.floor(y1 + size_y)
+
+    # --- Get Values from UI/Config ---
+    # Use .get() with fallback to original config module values
+    num_rectangles = current_config.get("NUM_RANDOM_RECTANGLES", config.NUM_RANDOM_RECTANGLES)
+    num_circles = current_config.get("NUM_RANDOM_CIRCLES", config.NUM_RANDOM_CIRCLES)
+    num_polygons = current_config.get("NUM_RANDOM_POLYGONS", config.NUM_RANDOM_POLYGONS)
+    num_cubes = current_config.get("NUM_RANDOM_CUBES", config.NUM_RANDOM_CUBES)
+    num_pyramids = current_config.get("NUM_RANDOM_PYRAMIDS", config.NUM_RANDOM_PYRAMIDS)
+    num_prisms = current_config.get("NUM_RANDOM_PRISMS", config.NUM_RANDOM_PRISMS)
+    num_dots = current_config.get("NUM_RANDOM_DOTS", config.NUM_RANDOM_DOTS)
+    num_lines = current_config.get("NUM_RANDOM_LINES", config.NUM_RANDOM_LINES)
+    num_connections = current_config.get("NUM_CONNECTIONS", config.NUM_CONNECTIONS)
+    num_animated = current_config.get("NUM_ANIMATED_SHAPES", config.NUM_ANIMATED_SHAPES)
+
+    # --- Faint Background Shapes ---
+    with report.phase('faint_background') as stats:
+        num_faint_shapes = rng.randint(config.NUM_FAINT_SHAPES_MIN, config.NUM_FAINT_SHAPES_MAX)
+        for _ in range(num_faint_shapes):
+            size_x = rng.randint(int(config.CANVAS_WIDTH * config.FAINT_SHAPE_MIN_SCALE), int(config.CANVAS_WIDTH * config.FAINT_SHAPE_MAX_SCALE))
+            size_y = rng.randint(int(config.CANVAS_HEIGHT * config.FAINT_SHAPE_MIN_SCALE), int(config.CANVAS_HEIGHT * config.FAINT_SHAPE_MAX_SCALE))
+            x1 = rng.randint(-size_x // 3, config.CANVAS_WIDTH - (2 * size_x // 3))
+            y1 = rng.randint(-size_y // 3, config.CANVAS_HEIGHT - (2 * size_y // 3))
+            x2 = x1 + size_x
+            y2 = y1 + size_y
+            faint_color = colour_utils.get_random_faint_rgb(rng=rng)
+            kind = 'rectangle' if rng.choice([True, False]) else 'oval'
+            scene.faint_background.append(SceneItem(kind, [x1, y1, x2, y2], fill=faint_color))
+        stats['items'] += num_faint_shapes
+
+    # --- Main Contrasting Background (Split) ---
+    with report.phase('split_background') as stats:
+        bg_color1 = colour_utils.get_random_rgb(rng)
+        bg_color2 = colour_utils.get_random_rgb(rng)
+        while bg_color1 == bg_color2: bg_color2 = colour_utils.get_random_rgb(rng)
+        split_direction = rng.randint(0, 1)
+        if split_direction == 0:
+            halves = ([0, 0, config.CANVAS_WIDTH, config.CANVAS_HEIGHT / 2],
+                      [0, config.CANVAS_HEIGHT / 2, config.CANVAS_WIDTH, config.CANVAS_HEIGHT])
+        else:
+            halves = ([0, 0, config.CANVAS_WIDTH / 2, config.CANVAS_HEIGHT],
+                      [config.CANVAS_WIDTH / 2, 0, config.CANVAS_WIDTH, config.CANVAS_HEIGHT])
+        scene.split_background = [SceneItem('rectangle', halves[0], fill=bg_color1),
+                                  SceneItem('rectangle', halves[1], fill=bg_color2)]
+
+        # --- Border ---
+        scene.border = SceneItem('rectangle', [0, 0, config.CANVAS_WIDTH, config.CANVAS_HEIGHT],
+                                 outline=colour_utils.parse_tk_colour(config.BORDER_COLOR), width=config.BORDER_THICKNESS * 2)
+        stats['items'] += len(scene.split_background) + 1
+
+    # --- Randomized Rectangles ---
+    def add_rectangle(x1, y1, x2, y2):
+        rect_fill_color = colour_utils.get_random_rgb(rng)
+        rect_outline_color = colour_utils.get_random_rgb(rng)
+        rect_outline_width = rng.randint(config.MIN_RECT_OUTLINE, config.MAX_RECT_OUTLINE)
+        item = SceneItem('rectangle', [x1, y1, x2, y2], fill=rect_fill_color, outline=rect_outline_color, width=rect_outline_width)
+        center_x = (x1 + x2) / 2; center_y = (y1 + y2) / 2
+        place(PlacedShape('rectangle', (x1, y1, x2, y2), (center_x, center_y), rect_fill_color, rect_outline_color, [item]))
+
+    with report.phase('rectangles') as stats:
+        log(f"Attempting to place {num_rectangles} rectangles...")
+        rectangles_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_rectangles, scene.shapes):
+            if poisson:
+                found = placer.find(box_footprint, stats, box_outline)
+                if found:
+                    add_rectangle(*found); rectangles_placed += 1
+                continue
+            if packing:
+                found = pack_box(stats)
+                if found:
+                    add_rectangle(*found); rectangles_placed += 1
+                continue
+            if vectorised:
+                found = placement.find_free_candidate(placed_boxes, rectangle_pool, budget.attempts, stats=stats, overlaps=overlaps_placed, scalar_tries=scalar_tries)
+                if found:
+                    add_rectangle(*found); rectangles_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                max_possible_size_x = min(config.MAX_SHAPE_SIZE, config.INNER_WIDTH)
+                max_possible_size_y = min(config.MAX_SHAPE_SIZE, config.INNER_HEIGHT)
+                if max_possible_size_x < config.MIN_SHAPE_SIZE or max_possible_size_y < config.MIN_SHAPE_SIZE: break
+                size_x = rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_x)
+                size_y = rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_y)
+                x1 = rng.randint(config.INNER_X_MIN, config.INNER_X_MAX - size_x)
+                y1 = rng.randint(config.INNER_Y_MIN, config.INNER_Y_MAX - size_y)
+                x2 = x1 + size_x
+                y2 = y1 + size_y
+                if not overlaps_placed((x1, y1, x2, y2), stats, box_outline((x1, y1, x2, y2))):
+                    add_rectangle(x1, y1, x2, y2); rectangles_placed += 1; break
+        log_placed(rectangles_placed, "rectangles", stats)
+        stats['requested'] += num_rectangles
+        stats['placed'] += rectangles_placed
+
+    # --- Randomized Circles ---
+    def add_circle(x1, y1, x2, y2):
+        circle_fill_color = colour_utils.get_random_rgb(rng)
+        circle_outline_color = colour_utils.get_random_rgb(rng)
+        circle_outline_width = rng.randint(config.MIN_CIRCLE_OUTLINE, config.MAX_CIRCLE_OUTLINE)
+        item = SceneItem('oval', [x1, y1, x2, y2], fill=circle_fill_color, outline=circle_outline_color, width=circle_outline_width)
+        center_x = (x1 + x2) / 2; center_y = (y1 + y2) / 2
+        place(PlacedShape('oval', (x1, y1, x2, y2), (center_x, center_y), circle_fill_color, circle_outline_color, [item]))
+
+    with report.phase('circles') as stats:
+        log(f"Attempting to place {num_circles} circles...")
+        circles_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_circles, scene.shapes):
+            if poisson:
+                found = placer.find(box_footprint, stats, oval_outline)
+                if found:
+                    add_circle(*found); circles_placed += 1
+                continue
+            if packing:
+                found = pack_box(stats)
+                if found:
+                    add_circle(*found); circles_placed += 1
+                continue
+            if vectorised:
+                found = placement.find_free_candidate(placed_boxes, circle_pool, budget.attempts, stats=stats, overlaps=overlaps_placed, scalar_tries=scalar_tries)
+                if found:
+                    add_circle(*found); circles_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                max_possible_size_x = min(config.MAX_SHAPE_SIZE, config.INNER_WIDTH)
+                max_possible_size_y = min(config.MAX_SHAPE_SIZE, config.INNER_HEIGHT)
+                if max_possible_size_x < config.MIN_SHAPE_SIZE or max_possible_size_y < config.MIN_SHAPE_SIZE: break
+                size_x = rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_x)
+                size_y = rng.randint(config.MIN_SHAPE_SIZE, max_possible_size_y)
+                x1 = rng.randint(config.INNER_X_MIN, config.INNER_X_MAX - size_x)
+                y1 = rng.randint(config.INNER_Y_MIN, config.INNER_Y_MAX - size_y)
+                x2 = x1 + size_x; y2 = y1 + size_y
+                if not overlaps_placed((x1, y1, x2, y2), stats, oval_outline((x1, y1, x2, y2))):
+                    add_circle(x1, y1, x2, y2); circles_placed += 1; break
+        log_placed(circles_placed, "circles", stats)
+        stats['requested'] += num_circles
+        stats['placed'] += circles_placed
+
+    # --- Randomized Polygons ---
+    def add_polygon(points, current_bounds):
+        poly_fill_color = colour_utils.get_random_rgb(rng)
+        poly_outline_color = colour_utils.get_random_rgb(rng)
+        poly_outline_width = rng.randint(config.MIN_POLYGON_OUTLINE, config.MAX_POLYGON_OUTLINE)
+        item = SceneItem('polygon', points, fill=poly_fill_color, outline=poly_outline_color, width=poly_outline_width)
+        bound_center_x = (current_bounds[0] + current_bounds[2]) / 2; bound_center_y = (current_bounds[1] + current_bounds[3]) / 2
+        place(PlacedShape('polygon', current_bounds, (bound_center_x, bound_center_y), poly_fill_color, poly_outline_color, [item]))
+
+    with report.phase('polygons') as stats:
+        log(f"Attempting to place {num_polygons} polygons...")
+        polygons_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_polygons, scene.shapes):
+            if poisson:
+                found = placer.find(polygon_footprint, stats, polygon_outline)
+                if found:
+                    add_polygon(*found); polygons_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                max_radius = config.MAX_SHAPE_SIZE / 2; center_buffer = max_radius + 5
+                min_center_x = config.INNER_X_MIN + center_buffer; max_center_x = config.INNER_X_MAX - center_buffer
+                min_center_y = config.INNER_Y_MIN + center_buffer; max_center_y = config.INNER_Y_MAX - center_buffer
+                if min_center_x > max_center_x or min_center_y > max_center_y: break
+                center_x = rng.randint(int(min_center_x), int(max_center_x))
+                center_y = rng.randint(int(min_center_y), int(max_center_y))
+                max_possible_avg_radius = min(center_x - config.INNER_X_MIN, config.INNER_X_MAX - center_x, center_y - config.INNER_Y_MIN, config.INNER_Y_MAX - center_y, config.MAX_SHAPE_SIZE / 2)
+                if max_possible_avg_radius < config.MIN_SHAPE_SIZE / 2: stats['rejections'] += 1; continue
+                avg_radius = rng.uniform(config.MIN_SHAPE_SIZE / 2, max_possible_avg_radius)
+                irregularity = rng.uniform(0.1, 0.5); spikeyness = rng.uniform(0.1, 0.6)
+                num_vertices = rng.randint(config.MIN_POLYGON_VERTICES, config.MAX_POLYGON_VERTICES)
+                points = generate_random_polygon_points(center_x, center_y, avg_radius, irregularity, spikeyness, num_vertices, rng)
+                current_bounds = get_polygon_bounds(points)
+                if current_bounds[0] < config.INNER_X_MIN or current_bounds[1] < config.INNER_Y_MIN or current_bounds[2] > config.INNER_X_MAX or current_bounds[3] > config.INNER_Y_MAX: stats['rejections'] += 1; continue
+                if not overlaps_placed(current_bounds, stats, polygon_outline(current_bounds, (points,))):
+                    add_polygon(points, current_bounds); polygons_placed += 1; break
+        log_placed(polygons_placed, "polygons", stats)
+        stats['requested'] += num_polygons
+        stats['placed'] += polygons_placed
+
+    # --- Randomized Isometric Cubes ---
+    def add_cube(center_x, center_y, cube_size, cube_color):
+        faces, actual_bounds = shapes_3d.isometric_cube_faces(center_x, center_y, cube_size, cube_color)
+        place(PlacedShape('isometric_cube', actual_bounds, (center_x, center_y), cube_color, shapes_3d.OUTLINE_COLOR, _face_items(faces)))
+
+    with report.phase('cubes') as stats:
+        log(f"Attempting to place {num_cubes} isometric cubes...")
+        cubes_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_cubes, scene.shapes):
+            if poisson:
+                found = placer.find(cube_footprint, stats, cube_outline)
+                if found:
+                    add_cube(*found, colour_utils.get_random_rgb(rng)); cubes_placed += 1
+                continue
+            if packing:
+                cube_color = colour_utils.get_random_rgb(rng)
+                for cube_size in (rng.randint(config.MIN_CUBE_SIZE, config.MAX_CUBE_SIZE), config.MIN_CUBE_SIZE):
+                    center = pack_at_origin(shapes_3d.isometric_cube_faces(0, 0, cube_size, cube_color)[1], stats)
+                    if center:
+                        add_cube(*center, cube_size, cube_color); cubes_placed += 1; break
+                continue
+            if vectorised:
+                found = placement.find_free_candidate(placed_boxes, cube_pool, budget.attempts, stats=stats, overlaps=overlaps_placed, scalar_tries=scalar_tries)
+                if found:
+                    add_cube(*found, colour_utils.get_random_rgb(rng)); cubes_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                cube_size = rng.randint(config.MIN_CUBE_SIZE, config.MAX_CUBE_SIZE)
+                cube_color = colour_utils.get_random_rgb(rng)
+                est_width = cube_size * 0.866 * 2; est_height = cube_size * 2
+                min_cx = config.INNER_X_MIN + est_width / 2; max_cx = config.INNER_X_MAX - est_width / 2
+                min_cy = config.INNER_Y_MIN + cube_size; max_cy = config.INNER_Y_MAX - cube_size
+                if min_cx >= max_cx or min_cy >= max_cy: break
+                center_x = rng.uniform(min_cx, max_cx); center_y = rng.uniform(min_cy, max_cy)
+                offset_x = cube_size * 0.866
+                potential_bounds = (center_x - offset_x, center_y - cube_size, center_x + offset_x, center_y + cube_size)
+                if not overlaps_placed(potential_bounds, stats, cube_outline(potential_bounds, (center_x, center_y, cube_size))):
+                    add_cube(center_x, center_y, cube_size, cube_color); cubes_placed += 1; break
+        log_placed(cubes_placed, "isometric cubes", stats)
+        stats['requested'] += num_cubes
+        stats['placed'] += cubes_placed
+
+    # --- Randomized Isometric Pyramids ---
+    def add_pyramid(center_x, center_y, pyramid_base, pyramid_height_factor, pyramid_color):
+        faces, actual_bounds = shapes_3d.isometric_pyramid_faces(center_x, center_y, pyramid_base, pyramid_height_factor, pyramid_color)
+        place(PlacedShape('isometric_pyramid', actual_bounds, (center_x, center_y), pyramid_color, shapes_3d.OUTLINE_COLOR, _face_items(faces)))
+
+    with report.phase('pyramids') as stats:
+        log(f"Attempting to place {num_pyramids} isometric pyramids...")
+        pyramids_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_pyramids, scene.shapes):
+            if poisson:
+                found = placer.find(pyramid_footprint, stats, pyramid_outline)
+                if found:
+                    add_pyramid(*found, colour_utils.get_random_rgb(rng)); pyramids_placed += 1
+                continue
+            if packing:
+                pyramid_color = colour_utils.get_random_rgb(rng)
+                pyramid_height_factor = rng.uniform(config.MIN_PYRAMID_HEIGHT_FACTOR, config.MAX_PYRAMID_HEIGHT_FACTOR)
+                for pyramid_base in (rng.randint(config.MIN_PYRAMID_BASE, config.MAX_PYRAMID_BASE), config.MIN_PYRAMID_BASE):
+                    center = pack_at_origin(shapes_3d.isometric_pyramid_bounds(0, 0, pyramid_base, pyramid_height_factor), stats)
+                    if center:
+                        add_pyramid(*center, pyramid_base, pyramid_height_factor, pyramid_color); pyramids_placed += 1; break
+                continue
+            if vectorised:
+                found = placement.find_free_candidate(placed_boxes, pyramid_pool, budget.attempts, stats=stats, overlaps=overlaps_placed, scalar_tries=scalar_tries)
+                if found:
+                    add_pyramid(*found, colour_utils.get_random_rgb(rng)); pyramids_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                pyramid_base = rng.randint(config.MIN_PYRAMID_BASE, config.MAX_PYRAMID_BASE)
+                pyramid_height_factor = rng.uniform(config.MIN_PYRAMID_HEIGHT_FACTOR, config.MAX_PYRAMID_HEIGHT_FACTOR)
+                pyramid_color = colour_utils.get_random_rgb(rng)
+                left, top, right, bottom = shapes_3d.isometric_pyramid_bounds(0, 0, pyramid_base, pyramid_height_factor)
+                min_cx = config.INNER_X_MIN - left; max_cx = config.INNER_X_MAX - right
+                min_cy = config.INNER_Y_MIN - top; max_cy = config.INNER_Y_MAX - bottom
+                if min_cx >= max_cx or min_cy >= max_cy: break
+                center_x = rng.uniform(min_cx, max_cx); center_y = rng.uniform(min_cy, max_cy)
+                potential_bounds = shapes_3d.isometric_pyramid_bounds(center_x, center_y, pyramid_base, pyramid_height_factor)
+                if not overlaps_placed(potential_bounds, stats, pyramid_outline(potential_bounds, (center_x, center_y, pyramid_base, pyramid_height_factor))):
+                    add_pyramid(center_x, center_y, pyramid_base, pyramid_height_factor, pyramid_color); pyramids_placed += 1; break
+        log_placed(pyramids_placed, "isometric pyramids", stats)
+        stats['requested'] += num_pyramids
+        stats['placed'] += pyramids_placed
+
+    # --- Randomized Isometric Prisms ---
+    def add_prism(center_x, center_y, prism_w, prism_d, prism_h, prism_color):
+        faces, actual_bounds = shapes_3d.isometric_prism_faces(center_x, center_y, prism_w, prism_d, prism_h, prism_color)
+        place(PlacedShape('isometric_prism', actual_bounds, (center_x, center_y), prism_color, shapes_3d.OUTLINE_COLOR, _face_items(faces)))
+
+    with report.phase('prisms') as stats:
+        log(f"Attempting to place {num_prisms} isometric prisms...")
+        prisms_placed = 0
+        budget = placement.PlacementBudget(stats, adaptive=adaptive, check_cancelled=report.check_cancelled)
+        for _ in budget.shapes(num_prisms, scene.shapes):
+            if poisson:
+                found = placer.find(prism_footprint, stats, prism_outline)
+                if found:
+                    add_prism(*found, colour_utils.get_random_rgb(rng)); prisms_placed += 1
+                continue
+            if packing:
+                prism_color = colour_utils.get_random_rgb(rng)
+                dims = tuple(rng.randint(config.MIN_PRISM_DIM, config.MAX_PRISM_DIM) for _ in range(3))
+                for prism_w, prism_d, prism_h in (dims, (config.MIN_PRISM_DIM,) * 3):
+                    center = pack_at_origin(shapes_3d.isometric_prism_faces(0, 0, prism_w, prism_d, prism_h, prism_color)[1], stats)
+                    if center:
+                        add_prism(*center, prism_w, prism_d, prism_h, prism_color); prisms_placed += 1; break
+                continue
+            if vectorised:
+                found = placement.find_free_candidate(placed_boxes, prism_pool, budget.attempts, stats=stats, overlaps=overlaps_placed, scalar_tries=scalar_tries)
+                if found:
+                    add_prism(*found, colour_utils.get_random_rgb(rng)); prisms_placed += 1
+                continue
+            for attempt in range(budget.attempts):
+                stats['attempts'] += 1
+                prism_w = rng.randint(config.MIN_PRISM_DIM, config.MAX_PRISM_DIM)
+                prism_d = rng.randint(config.MIN_PRISM_DIM, config.MAX_PRISM_DIM)
+                prism_h = rng.randint(config.MIN_PRISM_DIM, config.MAX_PRISM_DIM)
+                prism_color = colour_utils.get_random_rgb(rng)
+                est_width = (prism_w + prism_d) * 0.866; est_height = prism_h + (prism_w + prism_d) * 0.5
+                min_cx = config.INNER_X_MIN + est_width / 2; max_cx = config.INNER_X_MAX - est_width / 2
+                min_cy = config.INNER_Y_MIN + est_height / 2; max_cy = config.INNER_Y_MAX - est_height / 2
+                if min_cx >= max_cx or min_cy >= max_cy: break
+                center_x = rng.uniform(min_cx, max_cx); center_y = rng.uniform(min_cy, max_cy)
+                potential_bounds = (center_x - est_width / 2, center_y - est_height / 2, center_x + est_width / 2, center_y + est_height / 2)
+                if not overlaps_placed(potential_bounds, stats, prism_outline(potential_bounds, (center_x, center_y, prism_w, prism_d, prism_h))):
+                    add_prism(center_x, center_y, prism_w, prism_d, prism_h, prism_color); prisms_placed += 1; break
+        log_placed(prisms_placed, "isometric prisms", stats)
+        stats['requested'] += num_prisms
+        stats['placed'] += prisms_placed
+
+    # --- Random Dots ---
+    with report.phase('dots') as stats:
+        for i in range(num_dots):
+            if i % config.CANCEL_CHECK_INTERVAL == 0: report.check_cancelled()
+            dot_size = rng.randint(config.MIN_DOT_SIZE, config.MAX_DOT_SIZE)
+            x = rng.randint(config.INNER_X_MIN, config.INNER_X_MAX - dot_size)
+            y = rng.randint(config.INNER_Y_MIN, config.INNER_Y_MAX - dot_size)
+            scene.dots.append(SceneItem('oval', [x, y, x + dot_size, y + dot_size], fill=(0, 0, 0)))
+        stats['items'] += num_dots
+
+    # --- Random Lines ---
+    with report.phase('lines') as stats:
+        for i in range(num_lines):
+            if i % config.CANCEL_CHECK_INTERVAL == 0: report.check_cancelled()
+            lx1 = rng.randint(config.INNER_X_MIN, config.INNER_X_MAX); ly1 = rng.randint(config.INNER_Y_MIN, config.INNER_Y_MAX)
+            lx2 = rng.randint(config.INNER_X_MIN, config.INNER_X_MAX); ly2 = rng.randint(config.INNER_Y_MIN, config.INNER_Y_MAX)
+            thickness = rng.randint(config.MIN_LINE_THICKNESS, config.MAX_LINE_THICKNESS)
+            line_color = colour_utils.get_random_rgb(rng)
+            scene.lines.append(SceneItem('line', [lx1, ly1, lx2, ly2], fill=line_color, width=thickness))
+        stats['items'] += num_lines
+
+    # --- Select Shapes for Animation ---
+    with report.phase('animation_selection') as stats:
+        candidate_indices = [i for i, s in enumerate(scene.shapes) if s.animatable]
+        num_to_animate = min(num_animated, len(candidate_indices))
+        if num_to_animate > 0:
+            scene.animated = rng.sample(candidate_indices, num_to_animate)
+        stats['candidates'] += len(candidate_indices)
+        stats['animated'] += len(scene.animated)
+
+    # --- Connecting Lines (between static shapes) ---
+    with report.phase('connections') as stats:
+        animated_indices = set(scene.animated)
+        connection_color = colour_utils.parse_tk_colour(config.CONNECTION_LINE_COLOR)
+        static_shapes_to_connect = [s for i, s in enumerate(scene.shapes) if s.animatable and i not in animated_indices]
+        if len(static_shapes_to_connect) >= 2:
+            attempts = 0
+            max_connection_attempts = num_connections * 5
+            while len(scene.connections) < num_connections and attempts < max_connection_attempts:
+                if attempts % config.CANCEL_CHECK_INTERVAL == 0: report.check_cancelled()
+                attempts += 1
+                try: shape1, shape2 = rng.sample(static_shapes_to_connect, 2)
+                except ValueError: break
+                center1 = shape1.center; center2 = shape2.center
+                scene.connections.append(SceneItem('line', [center1[0], center1[1], center2[0], center2[1]],
+                                                   fill=connection_color, width=config.CONNECTION_LINE_WIDTH))
+            stats['attempts'] += attempts
+        stats['items'] += len(scene.connections)
+
+    return scene
+
+
+# --- Scene Drawing ---
+def draw_item(canvas_obj, item):
+    """Draws one SceneItem with the tk.Canvas create_* API and returns the new item ID."""
+    fill = colour_utils.tk_colour(item.fill)
+    if item.kind == 'rectangle':
+        return canvas_obj.create_rectangle(*item.coords, fill=fill, outline=colour_utils.tk_colour(item.outline), width=item.width)
+    if item.kind == 'oval':
+        return canvas_obj.create_oval(*item.coords, fill=fill, outline=colour_utils.tk_colour(item.outline), width=item.width)
+    if item.kind == 'polygon':
+        return canvas_obj.create_polygon(item.coords, fill=fill, outline=colour_utils.tk_colour(item.outline), width=item.width)
+    if item.kind == 'line':
+        return canvas_obj.create_line(*item.coords, fill=fill, width=item.width)
+    raise ValueError(f"Unknown scene item kind '{item.kind}'.")
+
+def stacking_order(scene):
+    """Yields every SceneItem in the stacking order draw_scene leaves them in, bottom first."""
+    # draw_scene tag_lowers each connection beneath everything drawn so far, so they end up first, in reverse
+    yield from reversed(scene.connections)
+    yield from scene.faint_background
+    yield from scene.split_background
+    if scene.border:
+        yield scene.border
+    for shape in scene.shapes:
+        yield from shape.items
+    yield from scene.dots
+    yield from scene.lines
+
+def draw_scene(canvas_obj, scene):
+    """
+    Draws a whole scene onto a canvas-like object, in layer order.
+    Returns a list parallel to scene.shapes holding each 2D shape's canvas ID (None for 3D shapes).
+    A live tk.Canvas (anything with a Tcl interpreter in .tk) is drawn in batches by tk_batch.
+    """
+    if config.BATCH_TK_DRAWING and getattr(canvas_obj, 'tk', None) is not None:
+        return tk_batch.draw_scene(canvas_obj, scene)
+    for item in scene.faint_background:
+        draw_item(canvas_obj, item)
+    for item in scene.split_background:
+        draw_item(canvas_obj, item)
+    if scene.border:
+        draw_item(canvas_obj, scene.border)
+
+    shape_ids = []
+    for shape in scene.shapes:
+        ids = [draw_item(canvas_obj, item) for item in shape.items]
+        shape_ids.append(ids[0] if shape.animatable else None)
+
+    for item in scene.dots:
+        draw_item(canvas_obj, item)
+    for item in scene.lines:
+        draw_item(canvas_obj, item)
+    for item in scene.connections:
+        canvas_obj.tag_lower(draw_item(canvas_obj, item))
+    return shape_ids
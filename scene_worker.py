@@ -0,0 +1,108 @@
+# scene_worker.py
+"""
+Scene generation off the Tk thread.
+
+build_scene (placement, colours, geometry) touches no Tk objects, so it can run
+in a worker thread while the Tk thread keeps handling input and animation
+frames. Tk itself may only be used from its own thread, so the worker never
+draws: it puts the finished job on a queue, and the Tk thread polls that queue
+with widget.after every WORKER_POLL_MS and hands the scene to on_ready there.
+
+Submitting a new job cancels the one in flight. Cancelling is cooperative: the
+job's GenerationReport is cancelled, and build_scene stops with
+GenerationCancelled at its next check (see instrumentation). A cancelled job's
+result is never delivered, even if it had already finished.
+
+With profiling on, the report's profiler runs only in the worker thread that
+builds the scene; drawing it on the Tk thread is not profiled.
+"""
+import queue
+import threading
+import tkinter as tk
+import config
+import instrumentation
+import scene as scene_model
+
+
+class SceneJob:
+    """One scene being generated: its config, seed and report, then either scene or error."""
+
+    def __init__(self, current_config, seed, report):
+        self.config = current_config
+        self.seed = seed
+        self.report = report
+        self.scene = None
+        self.error = None
+        self.thread = None
+
+    @property
+    def cancelled(self):
+        return self.report.cancelled
+
+    def cancel(self):
+        self.report.cancel()
+
+
+class SceneWorker:
+    """
+    Builds scenes in background threads for a Tk application. on_ready(job) runs on the Tk
+    thread for each job that finishes without being cancelled (check job.error before job.scene).
+    """
+
+    def __init__(self, widget, on_ready, poll_ms=config.WORKER_POLL_MS):
+        self.widget = widget
+        self.on_ready = on_ready
+        self.poll_ms = poll_ms
+        self.job = None          # The job whose result will be delivered
+        self.cancelled = 0       # Jobs cancelled by a newer submit (or cancel())
+        self._done = queue.Queue()
+        self._poll_id = None
+
+    @property
+    def busy(self):
+        return self.job is not None
+
+    def submit(self, current_config, seed, report=None):
+        """Starts generating a scene for current_config and seed, cancelling any job still in flight. Returns the SceneJob."""
+        self.cancel()
+        job = SceneJob(current_config, seed, report or instrumentation.GenerationReport())
+        job.thread = threading.Thread(target=self._run, args=(job,), name=f"scene-{seed}", daemon=True)
+        self.job = job
+        job.thread.start()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self):
+        """Cancels the job in flight, if any; its thread stops at its next check and its result is dropped."""
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+            self.cancelled += 1
+
+    def _run(self, job):
+        """Worker thread: builds the scene. Must not touch Tk."""
+        try:
+            job.scene = scene_model.build_scene(job.config, rng=job.seed, report=job.report)
+        except instrumentation.GenerationCancelled:
+            pass
+        except Exception as e:
+            job.error = e
+        self._done.put(job)
+
+    def _poll(self):
+        """Tk thread: delivers the current job once it is done, and keeps polling while one is in flight."""
+        self._poll_id = None
+        while True:
+            try:
+                job = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if job is self.job and not job.cancelled:
+                self.job = None
+                self.on_ready(job)
+        if self.job is not None:
+            try:
+                self._poll_id = self.widget.after(self.poll_ms, self._poll)
+            except tk.TclError:
+                pass # Window closed
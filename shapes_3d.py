@@ -1,11 +1,27 @@
 # shapes_3d.py
-from colour_utils import adjust_brightness # Import the needed color utility
+from colour_utils import shade_color, tk_colour # Import the needed color utilities
 
-# --- Helper function to draw Isometric Cube ---
-def draw_isometric_cube(canvas_obj, center_x, center_y, size, color):
+OUTLINE_COLOR = (0, 0, 0) # Outline (black) used for every face of the isometric shapes
+OUTLINE_WIDTH = 1
+
+def _draw_faces(canvas_obj, faces):
+    """Draws a list of (points, fill) faces as outlined polygons, in order."""
+    outline = tk_colour(OUTLINE_COLOR)
+    for face_points, face_color in faces:
+        canvas_obj.create_polygon(face_points, fill=tk_colour(face_color), outline=outline, width=OUTLINE_WIDTH)
+
+def _bounds_of(points):
+    """Returns the 2D bounding box (x1, y1, x2, y2) of a list of (x, y) points."""
+    all_x = [p[0] for p in points]
+    all_y = [p[1] for p in points]
+    return (min(all_x), min(all_y), max(all_x), max(all_y))
+
+
+# --- Isometric Cube ---
+def isometric_cube_faces(center_x, center_y, size, color):
     """
-    Draws an isometric cube on the canvas with simple shading.
-    Returns the 2D bounding box of the drawn cube.
+    Calculates the shaded faces of an isometric cube without drawing anything.
+    Returns (faces, bounds): faces is a list of (points, fill) in drawing order, color and fills are (R, G, B) tuples.
     """
     offset_x = size * 0.866 # approx sqrt(3)/2
     offset_y = size * 0.5   #
@@ -27,30 +43,42 @@ def draw_isometric_cube(canvas_obj, center_x, center_y, size, color):
     right_face = [points[3], points[6], points[5], points[2]]
 
     # Simple shading
-    top_color = adjust_brightness(color, 1.2)  # Lighter top
-    left_color = adjust_brightness(color, 0.8) # Darker left
-    right_color = adjust_brightness(color, 0.6) # Darkest right (or adjust factors)
-
-    outline_col = "black" # adjust_brightness(color, 0.4)
+    # Lighter top, darker left, darkest right
+    top_color, left_color, right_color = shade_color(color, (1.2, 0.8, 0.6))
 
-    # Draw faces (draw darker faces first, potentially)
-    canvas_obj.create_polygon(left_face, fill=left_color, outline=outline_col, width=1)
-    canvas_obj.create_polygon(right_face, fill=right_color, outline=outline_col, width=1)
-    canvas_obj.create_polygon(top_face, fill=top_color, outline=outline_col, width=1)
+    # Darker faces first, so the lighter top is drawn over shared edges
+    faces = [(left_face, left_color), (right_face, right_color), (top_face, top_color)]
 
-    # Calculate the 2D bounding box of the drawn cube
-    all_x = [p[0] for p in points]
-    all_y = [p[1] for p in points]
-    bounds = (min(all_x), min(all_y), max(all_x), max(all_y))
+    # Calculate the 2D bounding box of the cube
+    return faces, _bounds_of(points)
 
+def draw_isometric_cube(canvas_obj, center_x, center_y, size, color):
+    """
+    Draws an isometric cube on the canvas with simple shading.
+    Returns the 2D bounding box of the drawn cube.
+    """
+    faces, bounds = isometric_cube_faces(center_x, center_y, size, color)
+    _draw_faces(canvas_obj, faces)
     return bounds
 
 
-# --- Helper function to draw Isometric Square Pyramid ---
-def draw_isometric_pyramid(canvas_obj, center_x, center_y, base_size, height_factor, color):
+# --- Isometric Square Pyramid ---
+def isometric_pyramid_bounds(center_x, center_y, base_size, height_factor):
     """
-    Draws an isometric square pyramid on the canvas with simple shading.
-    Returns the 2D bounding box of the drawn pyramid.
+    The 2D bounding box of the pyramid isometric_pyramid_faces draws, without building its faces.
+    Uses only arithmetic, so the arguments may also be NumPy arrays (one pyramid per element).
+    """
+    base_offset_x = base_size * 0.866 / 2
+    base_offset_y = base_size * 0.5 / 2
+    pyramid_height = base_size * height_factor
+    base_center_y = center_y + pyramid_height * 0.2
+    return (center_x - base_offset_x * 2, base_center_y - pyramid_height,
+            center_x + base_offset_x * 2, base_center_y + base_offset_y * 2)
+
+def isometric_pyramid_faces(center_x, center_y, base_size, height_factor, color):
+    """
+    Calculates the shaded faces of an isometric square pyramid without drawing anything.
+    Returns (faces, bounds): faces is a list of (points, fill) in drawing order, color and fills are (R, G, B) tuples.
     Base center is offset slightly below the provided center_y for visual balance.
     """
     base_offset_x = base_size * 0.866 / 2 # Half base diagonal projection
@@ -73,29 +101,30 @@ def draw_isometric_pyramid(canvas_obj, center_x, center_y, base_size, height_fac
     right_face = [apex, base_right, base_front]
 
     # Simple shading
-    left_color = adjust_brightness(color, 0.85) # Slightly darker left
-    right_color = adjust_brightness(color, 0.65) # Darker right
-
-    outline_col = "black" # adjust_brightness(color, 0.4)
+    # Slightly darker left, darker right
+    left_color, right_color = shade_color(color, (0.85, 0.65))
 
-    # Draw faces
-    canvas_obj.create_polygon(left_face, fill=left_color, outline=outline_col, width=1)
-    canvas_obj.create_polygon(right_face, fill=right_color, outline=outline_col, width=1)
+    faces = [(left_face, left_color), (right_face, right_color)]
 
     # Calculate the 2D bounding box
-    all_x = [p[0] for p in [apex, base_front, base_left, base_right]]
-    all_y = [p[1] for p in [apex, base_front, base_left, base_right]]
-    bounds = (min(all_x), min(all_y), max(all_x), max(all_y))
+    return faces, _bounds_of([apex, base_front, base_left, base_right])
 
+def draw_isometric_pyramid(canvas_obj, center_x, center_y, base_size, height_factor, color):
+    """
+    Draws an isometric square pyramid on the canvas with simple shading.
+    Returns the 2D bounding box of the drawn pyramid.
+    """
+    faces, bounds = isometric_pyramid_faces(center_x, center_y, base_size, height_factor, color)
+    _draw_faces(canvas_obj, faces)
     return bounds
 
 
-# --- Helper function to draw Isometric Rectangular Prism (Cuboid) ---
-def draw_isometric_prism(canvas_obj, center_x, center_y, width, depth, height, color):
+# --- Isometric Rectangular Prism (Cuboid) ---
+def isometric_prism_faces(center_x, center_y, width, depth, height, color):
     """
-    Draws an isometric rectangular prism (cuboid) on the canvas with simple shading.
+    Calculates the shaded faces of an isometric rectangular prism (cuboid) without drawing anything.
     Width corresponds to the X-diagonal axis, Depth to the Y-diagonal axis, Height is vertical.
-    Returns the 2D bounding box of the drawn prism.
+    Returns (faces, bounds): faces is a list of (points, fill) in drawing order, color and fills are (R, G, B) tuples.
     """
     # Calculate offsets based on dimensions
     offset_x_w = width * 0.866 / 2
@@ -120,21 +149,19 @@ def draw_isometric_prism(canvas_obj, center_x, center_y, width, depth, height, c
     right_face = [p3, p2, p6, p7]
 
     # Simple shading
-    top_color = adjust_brightness(color, 1.2)  # Lighter top
-    left_color = adjust_brightness(color, 0.8) # Darker left
-    right_color = adjust_brightness(color, 0.6) # Darkest right
+    # Lighter top, darker left, darkest right
+    top_color, left_color, right_color = shade_color(color, (1.2, 0.8, 0.6))
 
-    outline_col = "black"
-
-    # Draw faces
-    canvas_obj.create_polygon(left_face, fill=left_color, outline=outline_col, width=1)
-    canvas_obj.create_polygon(right_face, fill=right_color, outline=outline_col, width=1)
-    canvas_obj.create_polygon(top_face, fill=top_color, outline=outline_col, width=1)
+    faces = [(left_face, left_color), (right_face, right_color), (top_face, top_color)]
 
     # Calculate the 2D bounding box
-    all_points = [p0, p1, p2, p3, p4, p5, p6, p7]
-    all_x = [p[0] for p in all_points]
-    all_y = [p[1] for p in all_points]
-    bounds = (min(all_x), min(all_y), max(all_x), max(all_y))
+    return faces, _bounds_of([p0, p1, p2, p3, p4, p5, p6, p7])
 
+def draw_isometric_prism(canvas_obj, center_x, center_y, width, depth, height, color):
+    """
+    Draws an isometric rectangular prism (cuboid) on the canvas with simple shading.
+    Returns the 2D bounding box of the drawn prism.
+    """
+    faces, bounds = isometric_prism_faces(center_x, center_y, width, depth, height, color)
+    _draw_faces(canvas_obj, faces)
     return bounds
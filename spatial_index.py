@@ -0,0 +1,55 @@
+# spatial_index.py
+import config # Needs the default grid cell size
+
+class SpatialGrid:
+    """
+    A uniform grid of buckets used to find placed shapes near a bounding box.
+    Each stored item is registered in every cell its bounds touch, so an overlap
+    query only has to look at the shapes sharing a cell with the candidate box
+    instead of scanning every placed shape.
+    """
+
+    def __init__(self, cell_size=config.SPATIAL_GRID_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError(f"Grid cell size must be positive, got {cell_size}.")
+        self.cell_size = cell_size
+        self._cells = {}  # (cell_x, cell_y) -> list of item indices
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def _cell_span(self, bounds):
+        """Returns the inclusive range of cells (cx1, cy1, cx2, cy2) covered by bounds (x1, y1, x2, y2)."""
+        size = self.cell_size
+        return (int(bounds[0] // size), int(bounds[1] // size),
+                int(bounds[2] // size), int(bounds[3] // size))
+
+    def insert(self, item, bounds):
+        """Stores an item under the cells covered by its bounding box."""
+        index = len(self._items)
+        self._items.append(item)
+        cx1, cy1, cx2, cy2 = self._cell_span(bounds)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self._cells.setdefault((cx, cy), []).append(index)
+
+    def query(self, bounds):
+        """
+        Yields every stored item sharing at least one cell with bounds, each at most once.
+        Edges lying exactly on a cell boundary belong to both cells, so touching boxes
+        are always returned as candidates (matching check_overlap's inclusive test).
+        """
+        cx1, cy1, cx2, cy2 = self._cell_span(bounds)
+        seen = set()
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                for index in self._cells.get((cx, cy), ()):
+                    if index not in seen:
+                        seen.add(index)
+                        yield self._items[index]
+
+    def clear(self):
+        """Removes all stored items."""
+        self._cells.clear()
+        self._items.clear()
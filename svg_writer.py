@@ -0,0 +1,76 @@
+# svg_writer.py
+"""
+Streams a scene.Scene out as SVG.
+
+Every element (backgrounds, border, each face of the 3D shapes, dots, lines and
+connections) is written straight from the scene data, one line at a time, to an
+open text file handle. Nothing is queried from Tk and no document tree is built,
+so memory use does not grow with the number of elements.
+"""
+import colour_utils
+
+CANVAS_BACKGROUND = (190, 190, 190) # Matches the tk.Canvas bg ("grey") used by the app
+
+
+def _num(value):
+    """Formats a coordinate compactly: at most two decimals, no trailing zeros."""
+    text = f'{value:.2f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+def _paint(rgb):
+    """Converts an (R, G, B) colour to an SVG paint value ('none' for None, i.e. not drawn)."""
+    return 'none' if rgb is None else colour_utils.rgb_to_hex(rgb)
+
+def _points(coords):
+    return ' '.join(f'{_num(coords[i])},{_num(coords[i + 1])}' for i in range(0, len(coords) - 1, 2))
+
+def _stroke(outline, width):
+    stroke = _paint(outline)
+    if stroke == 'none' or width <= 0:
+        return 'stroke="none"'
+    return f'stroke="{stroke}" stroke-width="{_num(width)}"'
+
+def item_to_svg(item):
+    """Returns the SVG element (one line) for a scene.SceneItem, using Tk's drawing rules."""
+    coords = item.coords
+    if item.kind in ('rectangle', 'oval'):
+        x1, x2 = sorted((coords[0], coords[2]))
+        y1, y2 = sorted((coords[1], coords[3]))
+        paint = f'fill="{_paint(item.fill)}" {_stroke(item.outline, item.width)}'
+        if item.kind == 'rectangle':
+            return f'<rect x="{_num(x1)}" y="{_num(y1)}" width="{_num(x2 - x1)}" height="{_num(y2 - y1)}" {paint}/>\n'
+        return (f'<ellipse cx="{_num((x1 + x2) / 2)}" cy="{_num((y1 + y2) / 2)}" '
+                f'rx="{_num((x2 - x1) / 2)}" ry="{_num((y2 - y1) / 2)}" {paint}/>\n')
+    if item.kind == 'polygon':
+        # Tk fills polygons with the even-odd rule
+        return (f'<polygon points="{_points(coords)}" fill="{_paint(item.fill)}" fill-rule="evenodd" '
+                f'{_stroke(item.outline, item.width)}/>\n')
+    if item.kind == 'line':
+        return f'<polyline points="{_points(coords)}" fill="none" {_stroke(item.fill, item.width)}/>\n'
+    raise ValueError(f"Unknown scene item kind '{item.kind}'.")
+
+def _group(f, group_id, items):
+    f.write(f'<g id="{group_id}">\n')
+    f.writelines(item_to_svg(item) for item in items)
+    f.write('</g>\n')
+
+def write_svg(f, art_scene, background=CANVAS_BACKGROUND):
+    """Writes art_scene as an SVG document to the text file handle f, in the same stacking order as draw_scene."""
+    f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    f.write(f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{art_scene.width}" '
+            f'height="{art_scene.height}" viewBox="0 0 {art_scene.width} {art_scene.height}">\n')
+    f.write(f'<rect width="100%" height="100%" fill="{_paint(background)}"/>\n')
+    # draw_scene tag_lowers each connection beneath everything drawn so far, so they come first, in reverse
+    _group(f, 'connections', reversed(art_scene.connections))
+    _group(f, 'faint-background', art_scene.faint_background)
+    _group(f, 'split-background', art_scene.split_background)
+    _group(f, 'border', [art_scene.border] if art_scene.border else [])
+    _group(f, 'shapes', (item for shape in art_scene.shapes for item in shape.items))
+    _group(f, 'dots', art_scene.dots)
+    _group(f, 'lines', art_scene.lines)
+    f.write('</svg>\n')
+
+def save_svg(file_path, art_scene):
+    """Writes art_scene to file_path as SVG."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        write_svg(f, art_scene)
@@ -0,0 +1,51 @@
+# test_3d_art.py
+import contextlib
+import importlib
+import io
+import random
+import pytest
+import scene
+from offscreen_canvas import OffscreenCanvas
+
+art = importlib.import_module("3d_art") # Not a valid identifier, so it can't be imported by name
+
+ANIMATED = {"NUM_ANIMATED_SHAPES": 6}
+
+
+@pytest.fixture
+def animate(monkeypatch):
+    """Shows a seeded scene on an offscreen canvas and runs frames of its animation; returns the canvas items."""
+    def run(seed, use_engine, frames=60, global_seed=None):
+        canvas_obj = OffscreenCanvas()
+        for name, value in (("canvas", canvas_obj), ("animated_shapes", []), ("shape_animator", None),
+                            ("animation_scheduler", None), ("animation_updates", None), ("scene_drawer", None),
+                            ("_HAS_ANIMATION_ENGINE", use_engine and art._HAS_ANIMATION_ENGINE)):
+            monkeypatch.setattr(art, name, value)
+        random.seed(global_seed)
+        art_scene = scene.build_scene(ANIMATED, verbose=False, rng=seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            art.show_scene(art_scene, ANIMATED)
+        # Every frame advances exactly one nominal frame, however long it took
+        scheduler = art.animation_scheduler
+        now = [scheduler.last_frame]
+        scheduler.clock = lambda: now[0]
+        for _ in range(frames):
+            now[0] += scheduler.period
+            canvas_obj.run_pending()
+        scheduler.cancel()
+        return list(canvas_obj.items())
+    return run
+
+
+@pytest.mark.parametrize("use_engine", [False, True], ids=["dicts", "engine"])
+def test_a_seeded_scene_always_animates_the_same_way(animate, use_engine):
+    first = animate(5, use_engine, global_seed=1)
+    assert first == animate(5, use_engine, global_seed=2) # The random module's state plays no part
+    assert first != animate(6, use_engine, global_seed=1)
+
+
+def test_the_dict_loop_moves_and_recolours_its_shapes(animate):
+    still = animate(5, use_engine=False, frames=0)
+    moved = animate(5, use_engine=False)
+    changed = [a for a, b in zip(still, moved) if a != b]
+    assert len(changed) == ANIMATED["NUM_ANIMATED_SHAPES"]
@@ -0,0 +1,57 @@
+# test_animation_engine.py
+import json
+import pytest
+import scene
+import animation_engine
+from offscreen_canvas import OffscreenCanvas
+
+
+def make_engine(seed=4, count=4, suppress=True):
+    art_scene = scene.build_scene({'NUM_ANIMATED_SHAPES': count}, verbose=False, rng=11)
+    canvas_obj = OffscreenCanvas()
+    shape_ids = scene.draw_scene(canvas_obj, art_scene)
+    shapes = [{'id': shape_ids[i], 'bounds': art_scene.shapes[i].bounds,
+               'fill': art_scene.shapes[i].fill, 'outline': art_scene.shapes[i].outline} for i in art_scene.animated]
+    return animation_engine.AnimationEngine(shapes, {}, seed=seed, suppress=suppress), canvas_obj
+
+
+@pytest.mark.parametrize("error", [ValueError("bad value"), RuntimeError("broken")])
+def test_any_canvas_error_drops_only_that_shape(error):
+    # Without suppression every shape is recoloured on every frame, so the failing call is always made
+    engine, canvas_obj = make_engine(suppress=False)
+    bad_id = engine.ids[1]
+    itemconfig = canvas_obj.itemconfig
+    def failing_itemconfig(item, **options):
+        if item == bad_id:
+            raise error
+        return itemconfig(item, **options)
+    canvas_obj.itemconfig = failing_itemconfig
+
+    assert engine.step(canvas_obj, {}) == 1
+    assert bad_id not in engine.ids and len(engine) == 3
+    assert engine.step(canvas_obj, {}) == 0
+
+
+def test_suppressed_updates_draw_the_same_frames():
+    slow = {'MOVEMENT_SPEED': 0.3}
+    (engine, canvas_obj), (plain, plain_canvas) = make_engine(count=20), make_engine(count=20, suppress=False)
+    for _ in range(200):
+        engine.step(canvas_obj, slow)
+        plain.step(plain_canvas, slow)
+        for item_id in engine.ids:
+            for option in ('fill', 'outline'):
+                assert canvas_obj.itemcget(item_id, option) == plain_canvas.itemcget(item_id, option)
+            drawn, exact = canvas_obj.coords(item_id), plain_canvas.coords(item_id)
+            assert max(abs(a - b) for a, b in zip(drawn, exact)) <= 0.5 + 1e-9
+    stats = engine.stats()
+    assert stats['configs_suppressed'] and stats['moves_suppressed']
+    assert stats['moves_sent'] < plain.stats()['moves_sent']
+
+
+def test_stats_are_plain_ints():
+    engine, canvas_obj = make_engine()
+    for _ in range(5):
+        engine.step(canvas_obj, {})
+    stats = engine.stats()
+    assert all(type(value) is int for value in stats.values())
+    assert json.loads(json.dumps(stats)) == stats
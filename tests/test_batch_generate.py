@@ -0,0 +1,32 @@
+# test_batch_generate.py
+import argparse
+import pytest
+import batch_generate
+
+
+def test_overrides_parse_by_config_type():
+    overrides = batch_generate._parse_overrides(["NUM_RANDOM_DOTS=200", "PLACEMENT_MODE=poisson",
+                                                  "EXACT_OVERLAP_TESTS=true", "VECTORISED_PLACEMENT=off"])
+    assert overrides == {"NUM_RANDOM_DOTS": 200, "PLACEMENT_MODE": "poisson",
+                         "EXACT_OVERLAP_TESTS": True, "VECTORISED_PLACEMENT": False}
+
+
+@pytest.mark.parametrize("pair", [
+    "CANVAS_WIDTH=1200",             # Not read by build_scene
+    "SHAPE_PLACEMENT_ATTEMPTS=5",
+    "NUM_RANDOM_DOTS",               # No value
+    "NUM_RANDOM_DOTS=2.5",           # Counts are whole numbers
+    "NUM_RANDOM_DOTS=-1",
+    "EXACT_OVERLAP_TESTS=maybe",
+    "PLACEMENT_MODE=hexagonal",
+])
+def test_invalid_overrides_are_rejected(pair):
+    with pytest.raises(argparse.ArgumentTypeError):
+        batch_generate._parse_overrides([pair])
+
+
+def test_cli_reports_rejected_key(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        batch_generate.main(["--count", "1", "--output-dir", str(tmp_path), "--set", "CANVAS_WIDTH=1200"])
+    assert exit_info.value.code == 2
+    assert "Cannot override 'CANVAS_WIDTH'" in capsys.readouterr().err
@@ -0,0 +1,146 @@
+# test_collision.py
+import itertools
+import pytest
+import collision
+import scene
+from test_scene import CROWDED
+
+
+def overlap(a, b):
+    """outlines_overlap must not depend on the argument order."""
+    result = collision.outlines_overlap(a, b)
+    assert collision.outlines_overlap(b, a) == result
+    return result
+
+
+def square(x, y, size):
+    return collision.Outline([(x, y), (x + size, y), (x + size, y + size), (x, y + size)])
+
+
+# A U shape over (0, 0, 30, 30) with a 10 wide notch open at the top between x=10 and x=20
+U_SHAPE = collision.flat_outline([0, 0, 30, 0, 30, 30, 20, 30, 20, 10, 10, 10, 10, 30, 0, 30])
+
+
+# --- Convex Pairs ---
+@pytest.mark.parametrize("make", [square, lambda x, y, size: collision.oval_outline((x, y, x + size, y + size)),
+                                  lambda x, y, size: collision.hull_outline([(x, y), (x + size, y), (x, y + size)])],
+                         ids=["polygon", "oval", "hull"])
+def test_convex_outlines_nested_inside_a_box_overlap(make):
+    assert overlap(collision.box_outline((0, 0, 100, 100)), make(40, 40, 10))
+
+
+def test_convex_outlines_that_touch_overlap():
+    assert overlap(square(0, 0, 10), square(10, 0, 10)) # Shared edge
+    assert overlap(square(0, 0, 10), square(10, 10, 10)) # Shared corner
+    assert overlap(collision.box_outline((0, 0, 10, 10)), collision.box_outline((10, 3, 20, 6)))
+    diamond = collision.Outline([(15, 0), (20, 5), (15, 10), (10, 5)])
+    assert overlap(square(0, 0, 10), diamond) # Corner on an edge
+
+
+def test_disjoint_convex_outlines_with_overlapping_boxes_do_not_overlap():
+    # Triangles past a corner: their bounding boxes overlap, the shapes do not
+    corner_cut = collision.Outline([(0, 0), (10, 0), (10, 9), (9, 10), (0, 10)])
+    assert not overlap(corner_cut, collision.Outline([(10, 10), (16, 10), (10, 16)]))
+    assert not overlap(collision.box_outline((0, 0, 10, 10)), collision.Outline([(8, 14), (20, 8), (14, 8)]))
+    assert not overlap(square(0, 0, 10), square(20, 0, 10))
+
+
+def test_an_oval_outline_leaves_the_corners_of_its_box_free():
+    oval = collision.oval_outline((0, 0, 100, 100))
+    assert not overlap(oval, square(0, 0, 10))
+    assert overlap(oval, square(45, -2, 10)) # Across the top of the circle
+
+
+# --- Concave Outlines ---
+def test_u_shape_is_concave():
+    assert not U_SHAPE.convex
+
+
+def test_concave_outline_containing_another_overlaps():
+    # Inside the U's solid bottom: no edges cross, so only the containment test can catch it
+    assert overlap(U_SHAPE, square(5, 2, 4))
+    assert overlap(U_SHAPE, collision.oval_outline((22, 2, 28, 8)))
+
+
+def test_outline_inside_a_concave_outline_notch_does_not_overlap():
+    assert not overlap(U_SHAPE, square(12, 15, 6))
+    assert overlap(U_SHAPE, square(12, 8, 6)) # Dips into the bottom of the U
+
+
+def test_concave_outline_around_a_much_larger_one():
+    # Every vertex of the U lies inside the big square and no edges cross
+    big = square(-100, -100, 300)
+    assert overlap(U_SHAPE, big)
+
+
+# --- Degenerate Outlines ---
+@pytest.mark.parametrize("points", [[(5, 5)], [(5, 5), (5, 5), (5, 5)]], ids=["hull", "repeated"])
+def test_zero_area_outline_overlaps_only_what_covers_it(points):
+    point = collision.hull_outline(points) if len(points) == 1 else collision.Outline(points)
+    assert overlap(point, square(0, 0, 10))
+    assert overlap(point, U_SHAPE)
+    assert not overlap(point, collision.Outline([(0, 0), (9, 0), (0, 9)])) # Just past the hypotenuse
+    assert not overlap(point, square(6, 0, 10))
+
+
+def test_collinear_outline_behaves_like_a_segment():
+    segment = collision.flat_outline([8, 14, 10, 12, 14, 8, 11, 11]) # Along x + y = 22, doubling back
+    assert overlap(segment, square(0, 0, 20))
+    assert not overlap(segment, square(0, 0, 10)) # Boxes overlap, but the box corner is at x + y = 20
+    assert overlap(segment, square(0, 0, 11)) # Corner at (11, 11) lies on the segment
+    assert overlap(segment, U_SHAPE) # Touches the corner of the U's left arm at (10, 12)
+    hull = collision.hull_outline([(8, 14), (10, 12), (14, 8)])
+    assert len(hull.points) == 2
+    assert not overlap(hull, square(0, 0, 10)) and overlap(hull, square(0, 0, 11))
+
+
+def test_zero_width_box_outline():
+    line = collision.box_outline((10, 0, 10, 30))
+    assert overlap(line, square(0, 0, 10)) # Touching its right edge
+    assert not overlap(line, square(11, 0, 10))
+    assert not overlap(line, collision.Outline([(12, 0), (20, 0), (20, 8)]))
+
+
+# --- Placement With Exact Tests ---
+def inside(points, x, y):
+    """Winding number of the polygon around (x, y) is odd (Tk's even-odd fill), computed independently of collision."""
+    winding = 0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        side = (x2 - x1) * (y - y1) - (x - x1) * (y2 - y1)
+        if y1 <= y < y2 and side > 0:
+            winding += 1
+        elif y2 <= y < y1 and side < 0:
+            winding -= 1
+    return winding % 2 == 1
+
+
+def shared_points(a, b, step=0.5):
+    """Grid points inside both outlines, within the intersection of their bounding boxes."""
+    x1 = max(a.bounds[0], b.bounds[0]); y1 = max(a.bounds[1], b.bounds[1])
+    x2 = min(a.bounds[2], b.bounds[2]); y2 = min(a.bounds[3], b.bounds[3])
+    found = []
+    x = x1 + step / 2
+    while x < x2:
+        y = y1 + step / 2
+        while y < y2:
+            if inside(a.points, x, y) and inside(b.points, x, y):
+                found.append((x, y))
+            y += step
+        x += step
+    return found
+
+
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_exact_overlap_tests_never_accept_an_overlapping_shape(vectorised):
+    art_scene = scene.build_scene(dict(CROWDED, EXACT_OVERLAP_TESTS=True, VECTORISED_PLACEMENT=vectorised),
+                                  verbose=False, rng=11)
+    outlines = [shape.silhouette for shape in art_scene.shapes]
+    assert all(outlines)
+    nested = 0
+    for a, b in itertools.combinations(outlines, 2):
+        boxes_overlap = a.bounds[0] < b.bounds[2] and b.bounds[0] < a.bounds[2] and a.bounds[1] < b.bounds[3] and b.bounds[1] < a.bounds[3]
+        if boxes_overlap:
+            nested += 1
+            assert not collision.outlines_overlap(a, b)
+            assert shared_points(a, b) == []
+    assert nested # Exact tests only matter if some bounding boxes do overlap
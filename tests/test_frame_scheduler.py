@@ -0,0 +1,123 @@
+# test_frame_scheduler.py
+import tkinter as tk
+import pytest
+from frame_scheduler import FrameScheduler
+
+INTERVAL_MS = 20
+
+
+class FakeLoop:
+    """A clock (counting whole ms) plus a widget whose after() callbacks run when the clock reaches them."""
+
+    def __init__(self):
+        self.ms = 0
+        self.pending = None
+        self.cancelled = []
+        self.closed = False
+
+    def clock(self):
+        return self.ms / 1000
+
+    def after(self, ms, func):
+        if self.closed:
+            raise tk.TclError("application has been destroyed")
+        self.pending = (ms, func)
+        return f"after#{len(self.cancelled)}"
+
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+        self.pending = None
+
+    def run(self, count):
+        """Waits for and runs the next count scheduled frames."""
+        for _ in range(count):
+            ms, func = self.pending
+            self.pending = None
+            self.ms += ms
+            func()
+
+
+def scheduler(loop, work_ms, max_catch_up=5):
+    """A FrameScheduler whose frames each take work_ms(frame number) of clock time; records (start ms, frames)."""
+    calls = []
+    def on_frame(frames):
+        calls.append((loop.ms, frames))
+        loop.ms += work_ms(len(calls))
+    return FrameScheduler(loop, on_frame, INTERVAL_MS, max_catch_up, clock=loop.clock), calls
+
+
+def test_busy_frames_do_not_make_the_timeline_drift():
+    loop = FakeLoop()
+    frames, calls = scheduler(loop, lambda n: 7)
+    frames.start()
+    loop.run(99)
+    # Frame n starts at its deadline n * interval (delays are whole ms, rounded up), not n * (interval + work)
+    for n, (start, _) in enumerate(calls):
+        assert n * INTERVAL_MS <= start <= n * INTERVAL_MS + 1
+    assert all(f == pytest.approx(1.0, abs=0.06) for _, f in calls) # Within the 1 ms rounding of a delay
+    assert frames.skipped == 0 and frames.frames == 100
+
+
+def test_a_late_frame_skips_missed_deadlines_and_reports_the_time_that_passed():
+    loop = FakeLoop()
+    frames, calls = scheduler(loop, lambda n: 50 if n == 3 else 5)
+    frames.start()
+    loop.run(6)
+    # Frame 3 (at 40 ms) runs to 90 ms: the 60 ms deadline is dropped, the 80 ms one is run late,
+    # and the timeline carries on from there
+    assert [start for start, _ in calls] == pytest.approx([0, 20, 40, 90, 100, 120, 140], abs=1)
+    assert frames.skipped == 1
+    assert calls[3][1] == pytest.approx(2.5, abs=0.06)
+    assert calls[4][1] == pytest.approx(0.5, abs=0.06)
+    assert calls[5][1] == pytest.approx(1.0, abs=0.06)
+
+
+def test_catch_up_is_capped_after_a_long_stall():
+    loop = FakeLoop()
+    frames, calls = scheduler(loop, lambda n: 1010 if n == 2 else 1, max_catch_up=3)
+    frames.start()
+    loop.run(4)
+    # The stall ran from 20 ms to 1030 ms, past the 49 deadlines at 40 ... 1000 ms; the one at 1020 ms runs late
+    assert calls[2] == (1030, 3)
+    assert frames.skipped == 49
+    # Then the timeline carries on at 1040 ms
+    assert [start for start, _ in calls[3:]] == pytest.approx([1040, 1060], abs=1)
+
+
+def test_stats_report_the_measured_rate():
+    loop = FakeLoop()
+    frames, _ = scheduler(loop, lambda n: 3)
+    assert frames.stats()['fps'] == 0.0
+    frames.start()
+    loop.run(50)
+    stats = frames.stats()
+    assert stats['frames'] == 51 and stats['skipped'] == 0
+    assert stats['fps'] == pytest.approx(1000 / INTERVAL_MS, rel=0.05)
+    assert stats['frame_ms'] == pytest.approx(INTERVAL_MS, abs=1)
+    assert stats['jitter_ms'] < 1 and stats['max_frame_ms'] < INTERVAL_MS + 1
+    assert "51 frames" in frames.format()
+
+
+def test_cancel_and_restart():
+    loop = FakeLoop()
+    frames, calls = scheduler(loop, lambda n: 1)
+    frames.start()
+    loop.run(2)
+    assert frames.running
+    frames.cancel()
+    assert not frames.running and loop.pending is None and len(loop.cancelled) == 1
+    frames.cancel() # Nothing scheduled: no second after_cancel
+    assert len(loop.cancelled) == 1
+    loop.ms = 5000
+    frames.start()
+    assert calls[-1][0] == 5000 and frames.running
+
+
+def test_stops_when_the_window_is_gone(capsys):
+    loop = FakeLoop()
+    frames, calls = scheduler(loop, lambda n: 1)
+    frames.start()
+    loop.closed = True
+    loop.run(1)
+    assert not frames.running and len(calls) == 2
+    assert "stopping animation loop" in capsys.readouterr().out
@@ -0,0 +1,88 @@
+# test_offscreen_canvas.py
+from offscreen_canvas import OffscreenCanvas
+
+
+# --- Scheduled Callbacks ---
+def test_after_callbacks_run_only_when_pending_callbacks_are_run():
+    canvas = OffscreenCanvas()
+    calls = []
+    canvas.after(10, calls.append, 'a')
+    canvas.after_idle(calls.append, 'b')
+    assert calls == []
+    assert canvas.run_pending() == 2
+    assert calls == ['a', 'b'] # In the order they were scheduled
+    assert canvas.run_pending() == 0
+
+
+def test_callbacks_scheduled_while_running_wait_for_the_next_run():
+    canvas = OffscreenCanvas()
+    frames = []
+    def frame(n):
+        frames.append(n)
+        if n < 3:
+            canvas.after(16, frame, n + 1)
+    canvas.after(16, frame, 1)
+    assert canvas.run_pending() == 1 and frames == [1]
+    assert canvas.run_pending() == 1 and frames == [1, 2]
+    assert canvas.run_pending() == 1 and frames == [1, 2, 3]
+    assert canvas.run_pending() == 0
+
+
+def test_after_cancel_removes_a_callback():
+    canvas = OffscreenCanvas()
+    calls = []
+    kept = canvas.after(0, calls.append, 'kept')
+    cancelled = canvas.after(0, calls.append, 'cancelled')
+    assert kept != cancelled
+    canvas.after_cancel(cancelled)
+    canvas.after_cancel(cancelled) # Cancelling twice, or an ID that already ran, is harmless
+    assert canvas.run_pending() == 1 and calls == ['kept']
+    canvas.after_cancel(kept)
+
+
+def test_a_callback_can_cancel_one_scheduled_in_the_same_run():
+    canvas = OffscreenCanvas()
+    calls = []
+    later = []
+    canvas.after(0, lambda: canvas.after_cancel(later[0]))
+    later.append(canvas.after(0, calls.append, 'ran'))
+    canvas.run_pending()
+    # The run works from the callbacks pending when it started; cancelling only affects future runs
+    assert calls == ['ran']
+
+
+def test_after_without_a_function_returns_an_id_and_schedules_nothing():
+    canvas = OffscreenCanvas()
+    assert canvas.after(5).startswith('after#')
+    assert canvas.run_pending() == 0
+
+
+# --- Items ---
+def test_items_keep_their_coordinates_and_options_through_edits():
+    canvas = OffscreenCanvas(100, 80)
+    rect = canvas.create_rectangle(1, 2, 3, 4, fill='red', tags='shape')
+    poly = canvas.create_polygon([(0, 0), (10, 0), (5, 5)], outline='blue')
+    line = canvas.create_line(0, 0, 10, 10)
+    canvas.move(rect, 10, 20)
+    canvas.coords(poly, 1, 1, 2, 2, 3, 3, 4, 4) # A different length moves it to the end of the pool
+    canvas.itemconfig(line, fill='green', width=3, dash=(2, 2))
+    assert canvas.coords(rect) == [11, 22, 13, 24]
+    assert canvas.coords(poly) == [1, 1, 2, 2, 3, 3, 4, 4]
+    assert (canvas.itemcget(rect, 'fill'), canvas.itemcget(rect, 'outline'), canvas.itemcget(rect, 'tags')) == ('red', 'black', 'shape')
+    assert (canvas.itemcget(poly, 'fill'), canvas.itemcget(poly, 'outline')) == ('black', 'blue')
+    assert (canvas.itemcget(line, 'fill'), canvas.itemcget(line, 'width'), canvas.itemcget(line, 'dash')) == ('green', 3.0, (2, 2))
+    assert [canvas.type(i) for i in canvas.find_all()] == ['rectangle', 'polygon', 'line']
+
+
+def test_deleted_items_are_ignored_and_the_pool_is_compacted():
+    canvas = OffscreenCanvas()
+    ids = [canvas.create_rectangle(i, i, i + 1, i + 1) for i in range(10)]
+    for item_id in ids[:8]:
+        canvas.delete(item_id)
+    assert len(canvas) == 2 and len(canvas._coords) < 40 # Compacted once more than half the pool was garbage
+    assert canvas.coords(ids[8]) == [8, 8, 9, 9] and canvas.coords(ids[9]) == [9, 9, 10, 10]
+    canvas.move(ids[0], 1, 1)
+    canvas.itemconfig(ids[0], fill='red')
+    assert canvas.coords(ids[0]) == [] and canvas.itemcget(ids[0], 'fill') == '' and canvas.type(ids[0]) is None
+    canvas.delete('all')
+    assert len(canvas) == 0 and canvas.find_all() == () and bool(canvas)
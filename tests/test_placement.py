@@ -0,0 +1,70 @@
+# test_placement.py
+import random
+from collections import Counter
+import pytest
+import placement
+import scene
+
+pytest.importorskip("numpy")
+
+
+def place_all(scalar_tries, count=150):
+    """Places count rectangles from a seeded pool; returns what was placed and the stats."""
+    pool = placement.CandidatePool(placement.box_candidates, placement.numpy_generator(random.Random(2)))
+    placed_boxes = placement.PlacedBoxes()
+    placed = []
+    stats = Counter()
+
+    def overlaps(bounds, stats):
+        stats['overlap_checks'] += len(placed)
+        if any(scene.check_overlap(bounds, box) for box in placed):
+            stats['rejections'] += 1
+            return True
+        return False
+
+    for _ in range(count):
+        found = placement.find_free_candidate(placed_boxes, pool, stats=stats, overlaps=overlaps, scalar_tries=scalar_tries)
+        if found:
+            placed.append(tuple(found))
+            placed_boxes.add(found)
+    return placed, stats
+
+
+def test_scalar_first_tries_place_the_same_candidates_as_blocks():
+    blocks, block_stats = place_all(scalar_tries=0)
+    for tries in (1, 4):
+        placed, stats = place_all(scalar_tries=tries)
+        assert placed == blocks
+        assert (stats['attempts'], stats['rejections']) == (block_stats['attempts'], block_stats['rejections'])
+        assert stats['sampled'] < block_stats['sampled']
+
+
+def test_placed_candidates_do_not_overlap():
+    placed, stats = place_all(scalar_tries=4)
+    assert stats['rejections'] > 0
+    for i, a in enumerate(placed):
+        assert not any(scene.check_overlap(a, b) for b in placed[i + 1:])
+
+
+def run_budget(outcomes, give_up_after=3):
+    """Drives a PlacementBudget with one placed/failed outcome per shape; returns how many shapes it let through."""
+    stats = Counter()
+    budget = placement.PlacementBudget(stats, attempts=100, min_attempts=10, give_up_after=give_up_after)
+    placed_shapes = []
+    tried = 0
+    for i in budget.shapes(len(outcomes), placed_shapes):
+        tried += 1
+        if outcomes[i]:
+            placed_shapes.append(i)
+    return tried, stats
+
+
+def test_budget_skips_the_rest_once_saturated():
+    tried, stats = run_budget([True, False, False, False] + [True] * 6)
+    assert tried == 4 and stats['skipped'] == 6
+
+
+def test_budget_never_stops_while_shapes_still_fit():
+    # Fewer than give_up_after failures in a row, however many in total
+    tried, stats = run_budget([False, False, True] * 10)
+    assert tried == 30 and stats['skipped'] == 0
@@ -0,0 +1,76 @@
+# test_png_writer.py
+import struct
+import zlib
+import numpy as np
+import pytest
+import png_writer
+
+
+def read_chunks(data):
+    """Splits PNG bytes into (type, data) chunks, checking the signature and every chunk's CRC."""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    chunks = []
+    offset = 8
+    while offset < len(data):
+        length, = struct.unpack('>I', data[offset:offset + 4])
+        chunk_type = data[offset + 4:offset + 8]
+        body = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack('>I', data[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(chunk_type + body) & 0xFFFFFFFF, chunk_type
+        chunks.append((chunk_type, body))
+        offset += 12 + length
+    return chunks
+
+
+def decode(data):
+    """Decodes the PNGs encode_png writes (8-bit RGB, unfiltered) back to a pixel array."""
+    chunks = read_chunks(data)
+    assert [chunk_type for chunk_type, _ in chunks] == [b'IHDR', b'IDAT', b'IEND']
+    width, height, depth, colour_type, compression, filtering, interlace = struct.unpack('>IIBBBBB', chunks[0][1])
+    assert (depth, colour_type, compression, filtering, interlace) == (8, 2, 0, 0, 0)
+    raw = zlib.decompress(chunks[1][1])
+    stride = width * 3 + 1
+    assert len(raw) == height * stride
+    assert all(raw[y * stride] == 0 for y in range(height)) # Filter type None on every scanline
+    rows = [raw[y * stride + 1:(y + 1) * stride] for y in range(height)]
+    return np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(height, width, 3)
+
+
+def sample_pixels(height=7, width=5):
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 255, size=(height, width, 3), endpoint=True, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("level", [0, 1, 6, 9])
+def test_round_trip_at_every_compression_level(level):
+    pixels = sample_pixels()
+    assert (decode(png_writer.encode_png(pixels, level)) == pixels).all()
+
+
+def test_width_and_height_are_not_swapped():
+    pixels = sample_pixels(height=2, width=9)
+    data = png_writer.encode_png(pixels)
+    assert struct.unpack('>II', read_chunks(data)[0][1][:8]) == (9, 2)
+    assert decode(data).shape == (2, 9, 3)
+
+
+def test_non_contiguous_pixels_are_encoded_as_seen():
+    pixels = sample_pixels(height=6, width=8)[::2, ::-1]
+    assert (decode(png_writer.encode_png(pixels)) == pixels).all()
+
+
+def test_higher_levels_shrink_flat_images():
+    pixels = np.full((100, 100, 3), 190, dtype=np.uint8)
+    assert len(png_writer.encode_png(pixels, 9)) < len(png_writer.encode_png(pixels, 0))
+
+
+def test_rejects_anything_but_rgb():
+    with pytest.raises(ValueError):
+        png_writer.encode_png(np.zeros((4, 4, 4), dtype=np.uint8))
+
+
+def test_write_png_writes_the_encoded_bytes(tmp_path):
+    pixels = sample_pixels()
+    path = tmp_path / "art.png"
+    png_writer.write_png(str(path), pixels, 1)
+    assert path.read_bytes() == png_writer.encode_png(pixels, 1)
@@ -0,0 +1,111 @@
+# test_progressive_draw.py
+import math
+import pytest
+import scene
+from offscreen_canvas import OffscreenCanvas
+from progressive_draw import ProgressiveDraw
+from test_tk_batch import StubCanvas
+
+SLICE_MS = 10
+CHUNK_SIZE = 3
+
+
+def item_clock(count_items):
+    """A clock where drawing each item takes 1 ms."""
+    return lambda: count_items() / 1000
+
+
+def drawn_directly(art_scene):
+    canvas = OffscreenCanvas()
+    return canvas, scene.draw_scene(canvas, art_scene)
+
+
+@pytest.fixture
+def art_scene():
+    return scene.build_scene({}, verbose=False, rng=21)
+
+
+def test_each_slice_draws_whole_chunks_until_its_time_is_used(art_scene):
+    canvas = OffscreenCanvas()
+    finished = []
+    drawer = ProgressiveDraw(canvas, art_scene, finished.append, SLICE_MS, CHUNK_SIZE, clock=item_clock(lambda: len(canvas)))
+    per_slice = math.ceil(SLICE_MS / CHUNK_SIZE) * CHUNK_SIZE # The clock is only checked between chunks
+    drawer.start()
+    assert len(canvas) == drawer.drawn == per_slice and drawer.running and not drawer.done
+    assert canvas.run_pending() == 1
+    assert drawer.drawn == 2 * per_slice
+    while canvas.run_pending():
+        assert drawer.drawn <= drawer.total
+    assert drawer.done and not drawer.running
+    assert drawer.drawn == drawer.total == len(art_scene)
+    # Every slice but the last draws per_slice items (one that ends exactly on the last item finds nothing left in the next)
+    assert drawer.slices == drawer.total // per_slice + 1
+    assert drawer.seconds == pytest.approx(drawer.total / 1000)
+    assert len(finished) == 1
+
+
+def test_progressive_result_matches_drawing_in_one_go(art_scene):
+    canvas = OffscreenCanvas()
+    finished = []
+    ProgressiveDraw(canvas, art_scene, finished.append, SLICE_MS, CHUNK_SIZE, clock=item_clock(lambda: len(canvas))).start()
+    while canvas.run_pending():
+        pass
+    direct, shape_ids = drawn_directly(art_scene)
+    assert finished == [shape_ids]
+    assert list(canvas.items()) == list(direct.items()) # Same items, IDs and stacking order (connections lowered)
+
+
+def test_a_slice_long_enough_for_everything_finishes_at_once(art_scene):
+    canvas = OffscreenCanvas()
+    finished = []
+    drawer = ProgressiveDraw(canvas, art_scene, finished.append, slice_ms=1e6, chunk_size=CHUNK_SIZE)
+    drawer.start()
+    assert drawer.done and drawer.slices == 1 and len(finished) == 1
+    assert canvas.run_pending() == 0
+
+
+def test_cancel_stops_between_slices(art_scene):
+    canvas = OffscreenCanvas()
+    finished = []
+    drawer = ProgressiveDraw(canvas, art_scene, finished.append, SLICE_MS, CHUNK_SIZE, clock=item_clock(lambda: len(canvas)))
+    drawer.start()
+    drawn = drawer.drawn
+    drawer.cancel()
+    assert not drawer.running and canvas.run_pending() == 0
+    assert drawer.drawn == drawn < drawer.total and finished == []
+    assert "in 1 slices" in drawer.format()
+
+
+class IdleStubCanvas(StubCanvas):
+    """A stub Tk canvas with an after_idle queue, so the batched path can be driven slice by slice."""
+
+    def __init__(self):
+        super().__init__()
+        self.idle = []
+
+    def after_idle(self, func):
+        self.idle.append(func)
+        return f"after#{len(self.idle)}"
+
+    def run_pending(self):
+        pending, self.idle = self.idle, []
+        for func in pending:
+            func()
+        return len(pending)
+
+
+def test_live_canvases_get_one_batch_per_chunk(art_scene):
+    stub = IdleStubCanvas()
+    finished = []
+    drawer = ProgressiveDraw(stub, art_scene, finished.append, SLICE_MS, CHUNK_SIZE, clock=item_clock(lambda: len(stub.created())))
+    drawer.start()
+    assert len(stub.created()) == drawer.drawn < drawer.total
+    while stub.run_pending():
+        pass
+    direct, shape_ids = drawn_directly(art_scene)
+    assert finished == [shape_ids]
+    assert {item_id: kind for item_id, kind, _, _ in stub.created()} == {item_id: direct.type(item_id) for item_id in direct.find_all()}
+    assert stub.order() == list(direct.find_all())
+    # One create call per chunk, plus one lower call for each chunk holding connections
+    connection_chunks = len({(drawer.total - 1 - i) // CHUNK_SIZE for i in range(len(art_scene.connections))})
+    assert drawer.batch.calls == math.ceil(drawer.total / CHUNK_SIZE) + connection_chunks
@@ -0,0 +1,111 @@
+# test_raster_renderer.py
+import math
+import pytest
+import raster_renderer
+
+GREY = (190, 190, 190)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+BLACK = (0, 0, 0)
+
+
+@pytest.fixture
+def canvas():
+    return raster_renderer.RasterCanvas(60, 50)
+
+
+def pixel(pixels, x, y):
+    return tuple(int(c) for c in pixels[y, x])
+
+
+def test_empty_canvas_is_the_background(canvas):
+    pixels = canvas.render()
+    assert pixels.shape == (50, 60, 3) and pixels.dtype.name == "uint8"
+    assert (pixels == GREY).all()
+    assert (raster_renderer.RasterCanvas(4, 4, background="#102030").render() == (16, 32, 48)).all()
+
+
+def test_rectangle_fill_and_outline(canvas):
+    canvas.create_rectangle(10, 10, 20, 20, fill="#ff0000", outline="#0000ff", width=2)
+    pixels = canvas.render()
+    assert pixel(pixels, 15, 15) == RED
+    # The outline is centred on the edges: pixels 9 and 10 at the top, 19 and 20 on the right
+    assert pixel(pixels, 15, 9) == BLUE and pixel(pixels, 15, 10) == BLUE
+    assert pixel(pixels, 19, 15) == BLUE and pixel(pixels, 20, 15) == BLUE
+    assert pixel(pixels, 15, 8) == GREY and pixel(pixels, 21, 15) == GREY
+    assert pixel(pixels, 18, 15) == RED
+
+
+def test_rectangle_defaults_to_a_black_outline_and_no_fill(canvas):
+    canvas.create_rectangle(10, 10, 30, 30)
+    pixels = canvas.render()
+    assert pixel(pixels, 20, 9) == BLACK # A 1 pixel outline covers the row whose centre is nearest the edge
+    assert pixel(pixels, 20, 20) == GREY
+
+
+def test_oval_leaves_the_corners_of_its_box(canvas):
+    canvas.create_oval(10, 10, 40, 40, fill="#ff0000", outline="")
+    pixels = canvas.render()
+    assert pixel(pixels, 25, 25) == RED
+    assert pixel(pixels, 25, 10) == RED # Top of the circle
+    assert pixel(pixels, 11, 11) == GREY
+
+
+def test_polygon_uses_the_even_odd_rule(canvas):
+    # A pentagram: its points are filled, the pentagon in the middle is covered twice and left empty
+    cx, cy, radius = 30, 25, 20
+    points = []
+    for k in range(5):
+        angle = -math.pi / 2 + k * 4 * math.pi / 5
+        points += [cx + radius * math.cos(angle), cy + radius * math.sin(angle)]
+    canvas.create_polygon(points, fill="#0000ff")
+    pixels = canvas.render()
+    assert pixel(pixels, cx, cy) == GREY
+    assert pixel(pixels, cx, cy - radius + 4) == BLUE # Inside the top point
+    assert pixel(pixels, 1, 1) == GREY
+
+
+def test_line_width_and_butt_caps(canvas):
+    canvas.create_line(10, 30, 40, 30, fill="#ff0000", width=3)
+    pixels = canvas.render()
+    assert all(pixel(pixels, 25, y) == RED for y in (29, 30))
+    assert pixel(pixels, 25, 26) == GREY and pixel(pixels, 25, 33) == GREY
+    assert pixel(pixels, 8, 30) == GREY and pixel(pixels, 42, 30) == GREY
+
+
+def test_later_items_are_drawn_on_top_and_tag_lower_reorders(canvas):
+    bottom = canvas.create_rectangle(0, 0, 30, 30, fill="#ff0000", outline="")
+    top = canvas.create_rectangle(10, 10, 40, 40, fill="#0000ff", outline="")
+    assert pixel(canvas.render(), 20, 20) == BLUE
+    canvas.tag_lower(top)
+    assert pixel(canvas.render(), 20, 20) == RED
+    assert pixel(canvas.render(), 35, 35) == BLUE
+    canvas.delete(bottom)
+    assert pixel(canvas.render(), 20, 20) == BLUE
+
+
+def test_moved_and_recoloured_items_render_where_they_are_now(canvas):
+    item = canvas.create_rectangle(0, 0, 10, 10, fill="#ff0000", outline="")
+    canvas.move(item, 30, 20)
+    canvas.itemconfig(item, fill="#0000ff")
+    pixels = canvas.render()
+    assert pixel(pixels, 5, 5) == GREY
+    assert pixel(pixels, 35, 25) == BLUE
+
+
+def test_items_partly_off_the_canvas_are_clipped(canvas):
+    canvas.create_rectangle(-20, -20, 5, 5, fill="#ff0000", outline="")
+    canvas.create_oval(50, 40, 90, 80, fill="#0000ff", outline="")
+    canvas.create_polygon(-100, -100, -50, -100, -50, -50, fill="#00ff00")
+    pixels = canvas.render()
+    assert pixel(pixels, 0, 0) == RED and pixel(pixels, 6, 6) == GREY
+    assert pixel(pixels, 59, 49) == BLUE
+
+
+def test_snapshot_canvas_copies_items_and_renders_the_same(canvas):
+    canvas.create_rectangle(5, 5, 25, 25, fill="#ff0000", outline="#0000ff", width=2)
+    canvas.create_oval(20, 10, 50, 40, fill="grey50", outline="black")
+    canvas.create_line(0, 49, 59, 0, fill="white", width=1)
+    copy = raster_renderer.snapshot_canvas(canvas, canvas.width, canvas.height)
+    assert len(copy) == 3
+    assert (copy.render() == canvas.render()).all()
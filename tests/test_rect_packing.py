@@ -0,0 +1,78 @@
+# test_rect_packing.py
+import random
+from collections import Counter
+import pytest
+import rect_packing
+
+AREA = (0, 0, 300, 200)
+GAP = 2
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "lists"])
+def packer(request, monkeypatch):
+    if request.param and not rect_packing._HAS_NUMPY:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(rect_packing, "_HAS_NUMPY", request.param)
+    return rect_packing.FreeRectPacker(random.Random(3), area=AREA, gap=GAP)
+
+
+def open_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def fill(packer, rng, count=60):
+    """Finds and occupies up to count random boxes; returns the used boxes, each grown by the gap."""
+    used = []
+    for _ in range(count):
+        found = packer.find(rng.randint(5, 60), rng.randint(5, 60), Counter())
+        if found:
+            x1, y1, width, height = found
+            packer.occupy((x1, y1, x1 + width, y1 + height))
+            used.append((x1 - GAP, y1 - GAP, x1 + width + GAP, y1 + height + GAP))
+    return used
+
+
+def fits_anywhere(width, height, used):
+    """Brute force: a box that fits can slide left and up until it meets the area or a used box."""
+    xs = [AREA[0]] + [box[2] for box in used]
+    ys = [AREA[1]] + [box[3] for box in used]
+    for x in xs:
+        for y in ys:
+            box = (x, y, x + width, y + height)
+            if box[2] <= AREA[2] and box[3] <= AREA[3] and not any(open_overlap(box, u) for u in used):
+                return True
+    return False
+
+
+def test_free_space_never_overlaps_used_space(packer):
+    used = fill(packer, random.Random(5))
+    assert used
+    for free in packer.free:
+        assert AREA[0] <= free[0] and AREA[1] <= free[1] and free[2] <= AREA[2] and free[3] <= AREA[3]
+        assert not any(open_overlap(free, box) for box in used)
+
+
+def test_placed_boxes_stay_inside_the_area_and_apart(packer):
+    used = fill(packer, random.Random(6))
+    for i, a in enumerate(used):
+        assert a[0] + GAP >= AREA[0] and a[1] + GAP >= AREA[1] and a[2] - GAP <= AREA[2] and a[3] - GAP <= AREA[3]
+        inner = (a[0] + GAP, a[1] + GAP, a[2] - GAP, a[3] - GAP)
+        assert not any(open_overlap(inner, b) for b in used[i + 1:])
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_find_fails_only_when_nothing_fits(packer, seed):
+    rng = random.Random(seed)
+    used = fill(packer, rng, count=40)
+    for width, height in [(rng.randint(1, 120), rng.randint(1, 120)) for _ in range(40)]:
+        stats = Counter()
+        assert (packer.find(width, height, stats) is not None) == fits_anywhere(width, height, used)
+
+
+def test_find_shrinks_to_the_minimum_size_when_the_full_size_fits_nowhere(packer):
+    packer.occupy((0, 0, 300, 150))
+    stats = Counter()
+    assert packer.find(100, 100, stats) is None
+    x1, y1, width, height = packer.find(100, 100, stats, min_width=10, min_height=10)
+    assert width == 100 and 10 <= height < 100 and y1 >= 150 + GAP
+    assert stats['shrunk'] == 1 and stats['rejections'] == 1
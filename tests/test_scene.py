@@ -0,0 +1,130 @@
+# test_scene.py
+import itertools
+import pytest
+import config
+import instrumentation
+import scene
+import shapes_3d
+import raster_renderer
+
+# Far more shapes than fit, so every placement path runs until the canvas is saturated
+CROWDED = {key: 200 for key in ("NUM_RANDOM_RECTANGLES", "NUM_RANDOM_CIRCLES", "NUM_RANDOM_POLYGONS",
+                                "NUM_RANDOM_CUBES", "NUM_RANDOM_PYRAMIDS", "NUM_RANDOM_PRISMS")}
+
+
+def overlapping_pairs(art_scene):
+    """The (type, type) pairs of placed shapes whose bounding boxes intersect (touching edges do not count)."""
+    pairs = []
+    for a, b in itertools.combinations(art_scene.shapes, 2):
+        if a.bounds[0] < b.bounds[2] and b.bounds[0] < a.bounds[2] and a.bounds[1] < b.bounds[3] and b.bounds[1] < a.bounds[3]:
+            pairs.append((a.type, b.type))
+    return pairs
+
+
+def outside_inner(art_scene):
+    return [shape.type for shape in art_scene.shapes
+            if shape.bounds[0] < config.INNER_X_MIN or shape.bounds[1] < config.INNER_Y_MIN or
+               shape.bounds[2] > config.INNER_X_MAX or shape.bounds[3] > config.INNER_Y_MAX]
+
+
+def test_pyramid_bounds_match_drawn_faces():
+    for args in ((100, 80, 15, 0.8), (300.5, 200.25, 45, 1.5), (50, 60, 27, 1.1)):
+        _, bounds = shapes_3d.isometric_pyramid_faces(*args, (16, 32, 48))
+        assert shapes_3d.isometric_pyramid_bounds(*args) == bounds
+
+
+def test_scene_colours_are_rgb_tuples():
+    art_scene = scene.build_scene({}, verbose=False, rng=3)
+    for item in scene.stacking_order(art_scene):
+        for colour in (item.fill, item.outline):
+            assert colour is None or (isinstance(colour, tuple) and len(colour) == 3 and all(0 <= c <= 255 for c in colour))
+    assert all(isinstance(shape.fill, tuple) for shape in art_scene.shapes)
+
+
+def test_rendering_from_the_scene_matches_drawing_through_the_canvas_api():
+    art_scene = scene.build_scene({}, verbose=False, rng=4)
+    raster = raster_renderer.RasterCanvas(art_scene.width, art_scene.height)
+    scene.draw_scene(raster, art_scene)
+    assert (raster_renderer.render_scene(art_scene) == raster.render()).all()
+
+
+@pytest.mark.parametrize("seed", [7, 8])
+def test_poisson_shapes_do_not_overlap(seed):
+    art_scene = scene.build_scene(dict(CROWDED, PLACEMENT_MODE="poisson"), verbose=False, rng=seed)
+    assert overlapping_pairs(art_scene) == []
+    assert outside_inner(art_scene) == []
+
+
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_random_shapes_do_not_overlap(vectorised):
+    art_scene = scene.build_scene(dict(CROWDED, VECTORISED_PLACEMENT=vectorised), verbose=False, rng=7)
+    assert overlapping_pairs(art_scene) == []
+    assert outside_inner(art_scene) == []
+
+
+@pytest.mark.parametrize("counts", [CROWDED, dict(NUM_RANDOM_RECTANGLES=10, NUM_RANDOM_PYRAMIDS=200)])
+def test_packing_shapes_do_not_overlap(counts):
+    art_scene = scene.build_scene(dict(counts, PLACEMENT_MODE="packing"), verbose=False, rng=7)
+    assert overlapping_pairs(art_scene) == []
+    assert outside_inner(art_scene) == []
+
+
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_adaptive_budget_reports_the_shapes_it_skips(vectorised, capsys):
+    report = instrumentation.GenerationReport(profile=False)
+    art_scene = scene.build_scene(dict(CROWDED, ADAPTIVE_PLACEMENT_BUDGET=True, VECTORISED_PLACEMENT=vectorised),
+                                  rng=7, report=report)
+    skipped = {name: counters['skipped'] for name, counters in report.counters.items() if counters['skipped']}
+    assert skipped
+    for name, counters in report.counters.items():
+        assert counters['placed'] + counters['skipped'] <= counters['requested']
+    assert "the canvas is saturated" in capsys.readouterr().out
+    assert overlapping_pairs(art_scene) == []
+
+
+@pytest.mark.parametrize("seed", [7, 8, 9])
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_adaptive_budget_never_stops_a_canvas_with_room(seed, vectorised):
+    # Every shape fits, so the budget must neither skip any nor change where they go
+    counts = {key: 8 for key in CROWDED}
+    report = instrumentation.GenerationReport(profile=False)
+    with_budget = scene.build_scene(dict(counts, ADAPTIVE_PLACEMENT_BUDGET=True, VECTORISED_PLACEMENT=vectorised),
+                                    verbose=False, rng=seed, report=report)
+    without = scene.build_scene(dict(counts, ADAPTIVE_PLACEMENT_BUDGET=False, VECTORISED_PLACEMENT=vectorised),
+                                verbose=False, rng=seed)
+    assert len(with_budget.shapes) == 6 * 8
+    assert not any(counters['skipped'] for counters in report.counters.values())
+    assert [shape.bounds for shape in with_budget.shapes] == [shape.bounds for shape in without.shapes]
+
+
+def test_adaptive_budget_is_off_by_default():
+    assert config.ADAPTIVE_PLACEMENT_BUDGET is False
+
+
+class CancelInsidePhase(instrumentation.GenerationReport):
+    """Cancels itself at the second cancellation check made after phase `name` has started."""
+
+    def __init__(self, name):
+        super().__init__(profile=False)
+        self.name = name
+        self.checks = 0
+
+    def check_cancelled(self):
+        if self.name in self.phases:
+            self.checks += 1
+            if self.checks == 2:
+                self.cancel()
+        super().check_cancelled()
+
+
+@pytest.mark.parametrize("name, counts", [
+    ("dots", {"NUM_RANDOM_DOTS": 50}),
+    ("lines", {"NUM_RANDOM_LINES": 50}),
+    ("connections", {"NUM_RANDOM_RECTANGLES": 10, "NUM_ANIMATED_SHAPES": 0, "NUM_CONNECTIONS": 50}),
+])
+def test_long_decoration_loops_check_for_cancellation(monkeypatch, name, counts):
+    monkeypatch.setattr(config, "CANCEL_CHECK_INTERVAL", 10)
+    report = CancelInsidePhase(name)
+    with pytest.raises(instrumentation.GenerationCancelled):
+        scene.build_scene(counts, verbose=False, rng=3, report=report)
+    assert report.checks == 2 and report.counters[name]['items'] == 0
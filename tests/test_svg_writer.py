@@ -0,0 +1,88 @@
+# test_svg_writer.py
+import io
+import xml.etree.ElementTree as ET
+import pytest
+import scene
+import svg_writer
+
+SVG = '{http://www.w3.org/2000/svg}'
+TAGS = {'rectangle': 'rect', 'oval': 'ellipse', 'polygon': 'polygon', 'line': 'polyline'}
+
+
+def element(item):
+    """Parses the single element item_to_svg writes for item."""
+    text = svg_writer.item_to_svg(item)
+    assert text.endswith('/>\n') and text.count('\n') == 1
+    return ET.fromstring(text)
+
+
+def test_rectangle_is_normalised_to_a_positive_size():
+    rect = element(scene.SceneItem('rectangle', [30, 40.5, 10, 20], fill=(255, 0, 16), outline=(0, 0, 0), width=2))
+    assert rect.tag == 'rect'
+    assert rect.attrib == {'x': '10', 'y': '20', 'width': '20', 'height': '20.5',
+                           'fill': '#ff0010', 'stroke': '#000000', 'stroke-width': '2'}
+
+
+def test_oval_is_an_ellipse_in_its_box():
+    oval = element(scene.SceneItem('oval', [10, 20, 40, 30], fill=(1, 2, 3), outline=None))
+    assert oval.tag == 'ellipse'
+    assert oval.attrib == {'cx': '25', 'cy': '25', 'rx': '15', 'ry': '5', 'fill': '#010203', 'stroke': 'none'}
+
+
+def test_polygon_uses_the_even_odd_fill_rule():
+    polygon = element(scene.SceneItem('polygon', [0, 0, 10.25, 0, 5, 8.333333], fill=(0, 128, 0), outline=(255, 255, 255)))
+    assert polygon.tag == 'polygon'
+    assert polygon.get('points') == '0,0 10.25,0 5,8.33'
+    assert polygon.get('fill-rule') == 'evenodd'
+    assert (polygon.get('fill'), polygon.get('stroke'), polygon.get('stroke-width')) == ('#008000', '#ffffff', '1')
+
+
+def test_line_is_stroked_with_its_fill_colour():
+    line = element(scene.SceneItem('line', [0, 0, 5, 5, 10, 0], fill=(200, 100, 50), width=3))
+    assert line.tag == 'polyline'
+    assert line.attrib == {'points': '0,0 5,5 10,0', 'fill': 'none', 'stroke': '#c86432', 'stroke-width': '3'}
+
+
+def test_missing_paint_and_zero_width_outlines_are_not_drawn():
+    assert element(scene.SceneItem('rectangle', [0, 0, 1, 1])).attrib['fill'] == 'none'
+    no_width = element(scene.SceneItem('oval', [0, 0, 1, 1], fill=(0, 0, 0), outline=(9, 9, 9), width=0))
+    assert no_width.get('stroke') == 'none' and 'stroke-width' not in no_width.attrib
+    assert element(scene.SceneItem('rectangle', [-0.001, 0, 1, 1])).get('x') == '0'
+
+
+def test_unknown_item_kinds_are_rejected():
+    with pytest.raises(ValueError):
+        svg_writer.item_to_svg(scene.SceneItem('arc', [0, 0, 1, 1]))
+
+
+def test_document_holds_every_scene_item_in_stacking_order():
+    art_scene = scene.build_scene({}, verbose=False, rng=5)
+    out = io.StringIO()
+    svg_writer.write_svg(out, art_scene)
+    root = ET.fromstring(out.getvalue().split('\n', 1)[1])
+    assert root.tag == SVG + 'svg'
+    assert (root.get('width'), root.get('height')) == (str(art_scene.width), str(art_scene.height))
+    background = root[0]
+    assert background.tag == SVG + 'rect' and background.get('fill') == '#bebebe'
+    groups = root[1:]
+    assert [g.get('id') for g in groups] == ['connections', 'faint-background', 'split-background', 'border',
+                                             'shapes', 'dots', 'lines']
+    written = [child for g in groups for child in g]
+    items = list(scene.stacking_order(art_scene))
+    assert len(written) == len(items) == len(art_scene)
+    for child, item in zip(written, items):
+        assert child.tag == SVG + TAGS[item.kind]
+        assert child.attrib == element(item).attrib
+    # Every kind of item and every shape type is covered by the default scene
+    assert {item.kind for item in items} == set(TAGS)
+    assert {shape.type for shape in art_scene.shapes} >= {'rectangle', 'oval', 'polygon', 'isometric_cube',
+                                                             'isometric_pyramid', 'isometric_prism'}
+
+
+def test_save_svg_writes_the_document(tmp_path):
+    art_scene = scene.build_scene({}, verbose=False, rng=6)
+    out = io.StringIO()
+    svg_writer.write_svg(out, art_scene)
+    path = tmp_path / "art.svg"
+    svg_writer.save_svg(str(path), art_scene)
+    assert path.read_text(encoding='utf-8') == out.getvalue()
@@ -0,0 +1,119 @@
+# test_tk_batch.py
+import math
+import tkinter
+import pytest
+import scene
+import tk_batch
+from offscreen_canvas import OffscreenCanvas
+
+# Stands in for a canvas widget inside a display-less Tcl interpreter: records what each create
+# call was given and keeps the stacking order, like the widget command of a real tk.Canvas
+_STUB_CANVAS = '''
+set created {}
+set order {}
+set next_id 0
+proc .stub {command args} {
+    global created order next_id
+    switch -- $command {
+        create {
+            incr next_id
+            lappend created [list $next_id {*}$args]
+            lappend order $next_id
+            return $next_id
+        }
+        lower {
+            set id [lindex $args 0]
+            set index [lsearch -exact $order $id]
+            set order [linsert [lreplace $order $index $index] 0 $id]
+        }
+    }
+}
+'''
+
+
+class StubCanvas:
+    """The parts of a tk.Canvas TkBatch uses: its interpreter in .tk and its Tcl path from str()."""
+
+    def __init__(self):
+        self.tk = tkinter.Tcl().tk
+        self.tk.eval(_STUB_CANVAS)
+
+    def __str__(self):
+        return '.stub'
+
+    def created(self):
+        """(id, kind, coords, options) for each create call, with options as a dict."""
+        items = []
+        for record in self.tk.splitlist(self.tk.eval('set created')):
+            fields = self.tk.splitlist(record)
+            item_id, kind, rest = int(fields[0]), fields[1], list(fields[2:])
+            option_count = 4 if kind == 'line' else 6 # -fill (-outline) -width, after the coordinates
+            options = dict(zip(rest[-option_count::2], rest[-option_count + 1::2]))
+            items.append((item_id, kind, [float(v) for v in rest[:-option_count]], options))
+        return items
+
+    def order(self):
+        return [int(v) for v in self.tk.splitlist(self.tk.eval('set order'))]
+
+
+def same(options, offscreen_options):
+    return (options['-fill'] == offscreen_options['fill'] and
+            options.get('-outline', '') == offscreen_options.get('outline', '') and
+            math.isclose(float(options['-width']), offscreen_options['width']))
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 10000])
+def test_batched_drawing_matches_drawing_item_by_item(batch_size):
+    art_scene = scene.build_scene({}, verbose=False, rng=12)
+    stub = StubCanvas()
+    shape_ids = tk_batch.draw_scene(stub, art_scene, batch_size)
+
+    offscreen = OffscreenCanvas()
+    assert shape_ids == scene.draw_scene(offscreen, art_scene)
+    expected = {item_id: (kind, coords, options) for item_id, kind, coords, options in offscreen.items()}
+    created = stub.created()
+    assert len(created) == len(art_scene)
+    for item_id, kind, coords, options in created:
+        expected_kind, expected_coords, expected_options = expected[item_id]
+        assert kind == expected_kind
+        assert coords == pytest.approx(expected_coords)
+        assert same(options, expected_options)
+    assert stub.order() == list(offscreen.find_all())
+
+
+def test_one_tcl_call_per_batch():
+    art_scene = scene.build_scene({}, verbose=False, rng=13)
+    stub = StubCanvas()
+    batch = tk_batch.TkBatch(stub, batch_size=50)
+    positions = [batch.add(item) for item in scene.stacking_order(art_scene)]
+    assert positions == list(range(len(art_scene)))
+    assert batch.calls == len(art_scene) // 50 # Full batches are created as soon as they fill up
+    ids = batch.flush()
+    assert batch.calls == math.ceil(len(art_scene) / 50)
+    assert ids == [item_id for item_id, *_ in stub.created()]
+    assert batch.flush() is ids and batch.calls == math.ceil(len(art_scene) / 50) # Nothing left to send
+
+
+def test_lower_puts_items_underneath_in_turn():
+    stub = StubCanvas()
+    batch = tk_batch.TkBatch(stub)
+    for i in range(4):
+        batch.add(scene.SceneItem('rectangle', [i, i, i + 1, i + 1], fill=(i, 0, 0)))
+    ids = batch.flush()
+    batch.lower([1, 3])
+    batch.lower([])
+    assert stub.order() == [ids[3], ids[1], ids[0], ids[2]]
+    assert batch.calls == 2
+
+
+def test_scene_draw_scene_batches_on_canvases_with_an_interpreter(monkeypatch):
+    art_scene = scene.build_scene({}, verbose=False, rng=14)
+    monkeypatch.setattr(scene.config, "BATCH_TK_DRAWING", True)
+    stub = StubCanvas()
+    scene.draw_scene(stub, art_scene)
+    assert len(stub.created()) == len(art_scene)
+
+
+def test_item_data_rejects_unknown_kinds():
+    with pytest.raises(ValueError):
+        tk_batch.item_data(scene.SceneItem('arc', [0, 0, 1, 1]))
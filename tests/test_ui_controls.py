@@ -0,0 +1,114 @@
+# test_ui_controls.py
+import tkinter as tk
+import pytest
+import ui_controls
+
+DEBOUNCE_MS = 150
+SETTLE_MS = 600
+
+
+class FakeTimer:
+    """Stands in for the panel's after/after_cancel: callbacks run when advance() reaches their time."""
+
+    def __init__(self):
+        self.now = 0
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        after_id = f"after#{self.next_id}"
+        self.pending[after_id] = (self.now + ms, func)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None) # Tk ignores IDs that have already run
+
+    def advance(self, ms):
+        end = self.now + ms
+        while True:
+            due = [(when, after_id) for after_id, (when, _) in self.pending.items() if when <= end]
+            if not due:
+                break
+            when, after_id = min(due)
+            self.now = when
+            self.pending.pop(after_id)[1]()
+        self.now = end
+
+
+@pytest.fixture
+def panel(monkeypatch):
+    """
+    A ControlPanel on a display-less Tcl interpreter: its variables and traces are real, its widgets
+    are not built and its timers run on a FakeTimer.
+    """
+    monkeypatch.setattr(tk, "_default_root", tk.Tcl())
+    monkeypatch.setattr(tk.Frame, "__init__", lambda self, master=None, **kwargs: None)
+    monkeypatch.setattr(ui_controls.ControlPanel, "config", lambda self, **kwargs: None)
+    monkeypatch.setattr(ui_controls.ControlPanel, "create_widgets", lambda self: None)
+    control_panel = ui_controls.ControlPanel()
+    control_panel.timer = FakeTimer()
+    control_panel.after = control_panel.timer.after
+    control_panel.after_cancel = control_panel.timer.after_cancel
+    control_panel.previews = []
+    control_panel.commits = []
+    control_panel.enable_live_preview(control_panel.previews.append, control_panel.commits.append, DEBOUNCE_MS, SETTLE_MS)
+    control_panel.live_preview.set(True)
+    return control_panel
+
+
+def drag(panel, steps, step_ms=10):
+    """Raises NUM_RANDOM_DOTS by each of steps in turn (from its committed value), step_ms apart, like a slider being dragged."""
+    start = panel.num_dots.get()
+    for step in steps:
+        panel.num_dots.set(start + step)
+        panel.timer.advance(step_ms)
+    return start
+
+
+def test_nothing_is_sent_while_live_preview_is_off(panel):
+    panel.live_preview.set(False)
+    drag(panel, range(1, 41))
+    panel._on_slider_release()
+    panel.timer.advance(SETTLE_MS)
+    assert panel.previews == [] and panel.commits == [] and panel.timer.pending == {}
+
+
+def test_dragging_previews_at_most_once_per_debounce_interval_with_the_latest_values(panel):
+    start = drag(panel, range(1, 41)) # 400 ms of changes
+    # The first write starts the timer; each preview shows the value reached when it fires
+    assert [preview["NUM_RANDOM_DOTS"] - start for preview in panel.previews] == [15, 30]
+    assert panel.commits == []
+
+
+def test_release_commits_at_once_and_cancels_the_pending_preview(panel):
+    start = drag(panel, range(1, 21))
+    assert len(panel.previews) == 1
+    panel._on_slider_release()
+    assert [commit["NUM_RANDOM_DOTS"] - start for commit in panel.commits] == [20]
+    assert panel.timer.pending == {}
+    panel.timer.advance(SETTLE_MS * 2)
+    assert len(panel.previews) == 1 and len(panel.commits) == 1
+
+
+def test_changes_without_a_release_commit_once_they_settle(panel):
+    panel.num_lines.set(panel.num_lines.get() + 1) # e.g. from the keyboard
+    panel.timer.advance(SETTLE_MS - 1)
+    assert len(panel.previews) == 1 and panel.commits == []
+    panel.num_lines.set(panel.num_lines.get() + 1) # Another change restarts the settle timer
+    panel.timer.advance(SETTLE_MS - 1)
+    assert panel.commits == []
+    panel.timer.advance(1)
+    assert panel.commits == [panel.get_values()]
+    assert len(panel.previews) == 2
+
+
+def test_values_already_shown_are_not_sent_again(panel):
+    panel.num_dots.set(panel.num_dots.get()) # Writes the value already shown
+    panel.timer.advance(SETTLE_MS)
+    assert panel.previews == [] and panel.commits == []
+    drag(panel, [1] * 40) # The same new value for 400 ms: the second preview timer finds nothing new
+    assert len(panel.previews) == 1
+    panel._on_slider_release()
+    panel._on_slider_release()
+    assert len(panel.commits) == 1
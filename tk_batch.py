@@ -0,0 +1,106 @@
+# tk_batch.py
+"""
+Batched item creation on a live tk.Canvas.
+
+Every canvas.create_* call is a separate round trip from Python into the Tcl
+interpreter (tkinter's option handling, argument conversion, result wrapping),
+which dominates drawing time for scenes with thousands of dots, lines and faces.
+TkBatch instead queues the items as plain (kind, coords, options) data and hands
+a whole chunk of them to a small Tcl procedure in one tk.call; the procedure runs
+the canvas "create" commands inside Tcl and returns the new item IDs in order.
+Passing the data as one Tcl list object also avoids formatting and re-parsing
+the coordinates as script text.
+"""
+import config
+import colour_utils
+
+# Defined in the canvas's interpreter before the first batch: creates every item in a flat
+# {kind coords options kind coords options ...} list and returns their IDs
+_CREATE_ITEMS_PROC = '''
+proc ::random_art_create_items {canvas items} {
+    set ids {}
+    foreach {kind coords options} $items {
+        lappend ids [$canvas create $kind {*}$coords {*}$options]
+    }
+    return $ids
+}
+'''
+
+
+def item_data(item):
+    """The (kind, coords, options) a scene.SceneItem is created with, matching scene.draw_item."""
+    fill = colour_utils.tk_colour(item.fill)
+    if item.kind in ('rectangle', 'oval', 'polygon'):
+        return item.kind, item.coords, ('-fill', fill, '-outline', colour_utils.tk_colour(item.outline), '-width', item.width)
+    if item.kind == 'line':
+        return 'line', item.coords, ('-fill', fill, '-width', item.width)
+    raise ValueError(f"Unknown scene item kind '{item.kind}'.")
+
+
+class TkBatch:
+    """
+    Queues scene items for a tk.Canvas and creates them batch_size at a time, one
+    tk.call per batch. add() returns the item's position; its canvas ID is
+    ids[position] once the batch holding it has been flushed.
+    """
+
+    def __init__(self, canvas_obj, batch_size=config.TK_BATCH_SIZE):
+        self.canvas = canvas_obj
+        self.path = str(canvas_obj) # Tcl name of the canvas widget, e.g. ".!canvas"
+        self.batch_size = batch_size
+        self.ids = []
+        self.calls = 0
+        self._pending = []
+        canvas_obj.tk.eval(_CREATE_ITEMS_PROC)
+
+    def add(self, item):
+        self._pending.extend(item_data(item))
+        position = len(self.ids) + len(self._pending) // 3 - 1
+        if len(self._pending) >= 3 * self.batch_size:
+            self.flush()
+        return position
+
+    def flush(self):
+        """Creates every queued item. Returns the list of all IDs created so far."""
+        if self._pending:
+            tk_app = self.canvas.tk
+            result = tk_app.call('::random_art_create_items', self.path, tuple(self._pending))
+            self.ids.extend(int(item_id) for item_id in tk_app.splitlist(result))
+            self.calls += 1
+            self._pending = []
+        return self.ids
+
+    def lower(self, positions):
+        """Lowers the (flushed) items at positions to the bottom of the stacking order, one after the other."""
+        if positions:
+            self.canvas.tk.eval('\n'.join(f'{self.path} lower {self.ids[position]}' for position in positions))
+            self.calls += 1
+
+
+def draw_scene(canvas_obj, art_scene, batch_size=config.TK_BATCH_SIZE):
+    """
+    Batched equivalent of scene.draw_scene for a tk.Canvas: same items, same stacking order, same return
+    value (a list parallel to art_scene.shapes of each 2D shape's canvas ID, None for 3D shapes).
+    """
+    batch = TkBatch(canvas_obj, batch_size)
+    for item in art_scene.faint_background:
+        batch.add(item)
+    for item in art_scene.split_background:
+        batch.add(item)
+    if art_scene.border:
+        batch.add(art_scene.border)
+
+    shape_positions = []
+    for shape in art_scene.shapes:
+        positions = [batch.add(item) for item in shape.items]
+        shape_positions.append(positions[0] if shape.animatable else None)
+
+    for item in art_scene.dots:
+        batch.add(item)
+    for item in art_scene.lines:
+        batch.add(item)
+    connection_positions = [batch.add(item) for item in art_scene.connections]
+
+    ids = batch.flush()
+    batch.lower(connection_positions)
+    return [None if position is None else ids[position] for position in shape_positions]
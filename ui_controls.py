@@ -24,6 +24,7 @@ class ControlPanel(tk.Frame):
         self.num_connections = tk.IntVar(value=config.NUM_CONNECTIONS)
         self.num_animated = tk.IntVar(value=config.NUM_ANIMATED_SHAPES)
         self.animation_speed = tk.DoubleVar(value=config.MOVEMENT_SPEED)
+        self.live_preview = tk.BooleanVar(value=config.LIVE_PREVIEW)
 
         # Store variables in a dictionary for easier access
         self.vars = {
@@ -40,6 +41,15 @@ class ControlPanel(tk.Frame):
             "MOVEMENT_SPEED": self.animation_speed,
         }
 
+        # --- Live Preview State (see enable_live_preview) ---
+        self.sliders = []
+        self._on_preview = None
+        self._on_commit = None
+        self._preview_after_id = None
+        self._commit_after_id = None
+        self._last_previewed = None
+        self._last_committed = None
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -76,11 +86,15 @@ class ControlPanel(tk.Frame):
         # --- Animation ---
         tk.Label(self, text="Animation:", font=('Arial', 10, 'bold')).grid(row=row_num, column=0, columnspan=2, sticky='w', padx=5, pady=(10,2))
         row_num += 1
-        self._add_slider("Animated Shapes:", self.num_animated, 0, 10, row_num)
+        self._add_slider("Animated Shapes:", self.num_animated, 0, 60, row_num)
         row_num += 1
         self._add_slider("Anim Speed:", self.animation_speed, 0.1, 5.0, row_num, resolution=0.1)
         row_num += 1
 
+        # --- Live Preview ---
+        tk.Checkbutton(self, text="Live preview", variable=self.live_preview).grid(row=row_num, column=0, columnspan=2, sticky='w', padx=5, pady=(10,2))
+        row_num += 1
+
 
     def _add_slider(self, label_text, variable, from_, to, row, resolution=1):
         """Helper to add a label and a scale (slider)."""
@@ -100,6 +114,8 @@ class ControlPanel(tk.Frame):
         # or rely on the user knowing the range. For simplicity, we omit the value label here.
         # If using tk.Scale, you can add resolution and showvalue=True/False
         slider.grid(row=row, column=1, sticky='ew', padx=5, pady=2)
+        slider.bind("<ButtonRelease-1>", self._on_slider_release)
+        self.sliders.append(slider)
 
         # Add a label to display the current value (optional but helpful)
         value_label = tk.Label(self, textvariable=variable, width=4)
@@ -111,6 +127,55 @@ class ControlPanel(tk.Frame):
         # Ensure integer values for counts
         return {key: var.get() for key, var in self.vars.items()}
 
+    # --- Live Preview ---
+    def enable_live_preview(self, on_preview, on_commit, debounce_ms=config.LIVE_PREVIEW_DEBOUNCE_MS,
+                            settle_ms=config.LIVE_PREVIEW_SETTLE_MS):
+        """
+        While "Live preview" is ticked, reacts to the sliders without waiting for Regenerate:
+        on_preview(values) runs at most once every debounce_ms while a slider is moving (with the latest
+        values), and on_commit(values) runs when the slider is released, or once nothing has changed for
+        settle_ms (e.g. after keyboard changes). Values that are already shown are not sent again.
+        """
+        self._on_preview = on_preview
+        self._on_commit = on_commit
+        self.debounce_ms = debounce_ms
+        self.settle_ms = settle_ms
+        self._last_committed = self.get_values()
+        for var in self.vars.values():
+            var.trace_add('write', self._on_var_write)
+
+    def _on_var_write(self, *args):
+        if not self.live_preview.get() or self._on_preview is None:
+            return
+        # Dragging writes many times per value (ttk.Scale sends fractions); the first write starts the timer
+        if self._preview_after_id is None:
+            self._preview_after_id = self.after(self.debounce_ms, self._send_preview)
+        if self._commit_after_id is not None:
+            self.after_cancel(self._commit_after_id)
+        self._commit_after_id = self.after(self.settle_ms, self._send_commit)
+
+    def _on_slider_release(self, event=None):
+        if self.live_preview.get() and self._on_commit is not None:
+            self._send_commit()
+
+    def _send_preview(self):
+        self._preview_after_id = None
+        values = self.get_values()
+        if values != self._last_previewed and values != self._last_committed:
+            self._last_previewed = values
+            self._on_preview(values)
+
+    def _send_commit(self):
+        for after_id in (self._preview_after_id, self._commit_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._preview_after_id = self._commit_after_id = None
+        values = self.get_values()
+        if values != self._last_committed:
+            self._last_committed = values
+            self._last_previewed = None
+            self._on_commit(values)
+
 # --- Example Usage (for testing ui_controls.py directly) ---
 if __name__ == "__main__":
     root = tk.Tk()